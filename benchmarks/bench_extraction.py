@@ -0,0 +1,63 @@
+"""
+Microbenchmark for HTML extraction engines.
+
+Parses the saved Indeed/LinkedIn fixtures with each engine and reports pages
+parsed per second.
+
+    python -m benchmarks.bench_extraction --seconds 2
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict
+from src.scrapers.extraction import ENGINES
+from src.scrapers.job_scraper import IndeedScraper, LinkedInScraper
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'html'
+
+PAGES = [
+    ('indeed', 'listing', IndeedScraper, 'indeed_search.html'),
+    ('indeed', 'detail', IndeedScraper, 'indeed_job.html'),
+    ('linkedin', 'listing', LinkedInScraper, 'linkedin_search.html'),
+    ('linkedin', 'detail', LinkedInScraper, 'linkedin_job.html'),
+]
+
+def pages_per_second(parse: Callable[[], object], seconds: float) -> float:
+    """Run parse repeatedly for about `seconds` and return the rate."""
+    parse()  # Warm up selector and parser caches
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        parse()
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+def run(seconds: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for site, page_type, scraper_class, fixture in PAGES:
+        html = (FIXTURES / fixture).read_text(encoding='utf-8')
+        rates = {}
+        for engine in ENGINES:
+            scraper = scraper_class(extraction_engine=engine)
+            if page_type == 'listing':
+                rates[engine] = pages_per_second(lambda: scraper._parse_listing_page(html), seconds)
+            else:
+                rates[engine] = pages_per_second(lambda: scraper._parse_detail_page(html, fixture), seconds)
+        results[f'{site} {page_type}'] = rates
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML extraction engine microbenchmark')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Time spent per engine and page')
+    args = parser.parse_args()
+
+    results = run(args.seconds)
+    print(f"{'page':<20}" + ''.join(f"{engine + ' pages/s':>16}" for engine in ENGINES) + f"{'speedup':>10}")
+    for page, rates in results.items():
+        speedup = rates['lxml'] / rates['bs4']
+        print(f"{page:<20}" + ''.join(f"{rates[engine]:>16.1f}" for engine in ENGINES) + f"{speedup:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Offline benchmark for the scrape pipeline.
+
+Serves a response archive from a local replay server and crawls it at several
+concurrency settings, reporting pages/sec, jobs/sec and p50/p99 request
+latency. By default the archive is synthesized from the saved pages in
+tests/fixtures/html; a recorded archive can be replayed instead with
+--archive and --start-url.
+
+    python -m benchmarks.bench_scraper --pages 5 --concurrency 1 2 4 8 --latency 0.05
+    python -m benchmarks.bench_scraper --error-rate 0.05 --throttle-every 50 --throttle-burst 3
+    python -m benchmarks.bench_scraper --archive data/replay/responses.jsonl \\
+        --start-url "https://www.indeed.com/jobs?q=python&l=Remote"
+"""
+import argparse
+import html
+import json
+import logging
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin, urlsplit
+from src.scrapers.job_scraper import IndeedScraper, LinkedInScraper
+from src.utils.rate_limiter import RateLimiter
+from src.utils.replay import ReplayServer, ResponseArchive
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'html'
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+SCRAPERS = {
+    'www.indeed.com': IndeedScraper,
+    'www.linkedin.com': LinkedInScraper,
+}
+
+# How each fixture site pages through results and links to job details
+SITES = {
+    'indeed': {
+        'search': 'https://www.indeed.com/jobs?q=python&l=Remote',
+        'listing': 'indeed_search.html',
+        'detail': 'indeed_job.html',
+        'page_size': 10,
+        'next_label': 'aria-label="Next Page"',
+        'job_id': (r'jk=([0-9a-f]{16})', lambda job_id, offset: f'jk={int(job_id, 16) + offset:016x}'),
+        'detail_link': r'href="(/rc/clk\?[^"]+)"',
+    },
+    'linkedin': {
+        'search': 'https://www.linkedin.com/jobs/search/?keywords=python&location=Remote',
+        'listing': 'linkedin_search.html',
+        'detail': 'linkedin_job.html',
+        'page_size': 25,
+        'next_label': 'aria-label="Next"',
+        'job_id': (r'jobs/view/(\d+)/', lambda job_id, offset: f'jobs/view/{int(job_id) + offset}/'),
+        'detail_link': r'href="(https://www\.linkedin\.com/jobs/view/[^"]+)"',
+    },
+}
+
+def synthesize_archive(path: str, pages: int) -> Tuple[ResponseArchive, List[str]]:
+    """
+    Build an archive of `pages` results pages per fixture site, each with unique
+    job ids and a detail page for every card.
+
+    Returns:
+        Tuple: (archive, start URL per site)
+    """
+    archive = ResponseArchive(path)
+    start_urls = []
+    for site in SITES.values():
+        listing = (FIXTURES / site['listing']).read_text(encoding='utf-8')
+        detail = (FIXTURES / site['detail']).read_bytes()
+        pattern, renumber = site['job_id']
+        page_size = site['page_size']
+        start_urls.append(site['search'])
+
+        for page in range(pages):
+            offset = page * 1000
+            body = re.sub(pattern, lambda m: renumber(m.group(1), offset), listing)
+            body = body.replace(f'start={page_size}', f'start={(page + 1) * page_size}')
+            if page == pages - 1:
+                body = body.replace(site['next_label'], 'aria-label="Last Page"')
+            url = site['search'] + (f'&start={page * page_size}' if page else '')
+            archive.add(url, 200, HTML, body.encode('utf-8'))
+
+            for link in re.findall(site['detail_link'], body):
+                archive.add(urljoin(site['search'], html.unescape(link)), 200, HTML, detail)
+    return archive, start_urls
+
+def run_once(server: ReplayServer, start_url: str, pages: int, concurrency: int) -> Dict:
+    host = urlsplit(start_url).netloc.lower()
+    scraper = SCRAPERS[host](base_url=server.url_for(f'https://{host}'), concurrency=concurrency)
+    # A private limiter so every run starts cold; limits are opened up so the
+    # pipeline rather than politeness pacing is what gets measured
+    scraper.rate_limiter = RateLimiter()
+    server.configure_rate_limiter(
+        scraper.rate_limiter, rate=10000.0, max_rate=10000.0, burst=max(2, concurrency * 2),
+        concurrency=concurrency, max_concurrency=concurrency, backoff=0.1, max_backoff=1.0,
+    )
+
+    served_before = server.served
+    start = time.perf_counter()
+    jobs = scraper.scrape_job_listings(server.url_for(start_url), max_pages=pages)
+    elapsed = time.perf_counter() - start
+
+    fetched = server.served - served_before
+    limiter = scraper.rate_limiter.for_url(server.url_for(start_url))
+    return {
+        'site': host,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'pages': fetched,
+        'jobs': len(jobs),
+        'pages_per_second': round(fetched / elapsed, 2),
+        'jobs_per_second': round(len(jobs) / elapsed, 2),
+        'latency_p50_ms': round((limiter.latency_percentile(50) or 0.0) * 1000, 1),
+        'latency_p99_ms': round((limiter.latency_percentile(99) or 0.0) * 1000, 1),
+        'throttled': limiter.throttled,
+    }
+
+def run(archive: ResponseArchive, start_urls: List[str], pages: int, concurrency_levels: List[int],
+        **server_options) -> List[Dict]:
+    results = []
+    with ReplayServer(archive, **server_options) as server:
+        for start_url in start_urls:
+            for concurrency in concurrency_levels:
+                results.append(run_once(server, start_url, pages, concurrency))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline scrape pipeline benchmark')
+    parser.add_argument('--pages', type=int, default=5, help='Listing pages crawled per site')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Concurrency settings to compare')
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency per response, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Extra random latency of up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of responses that are 503s')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Send a burst of 403s every N requests')
+    parser.add_argument('--throttle-burst', type=int, default=1, help='Length of each 403 burst')
+    parser.add_argument('--archive', help='Replay a recorded archive instead of the synthesized fixtures')
+    parser.add_argument('--start-url', action='append', help='Search URL to crawl in the recorded archive')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.archive:
+            if not args.start_url:
+                parser.error('--archive needs at least one --start-url')
+            archive, start_urls = ResponseArchive(args.archive), args.start_url
+        else:
+            archive, start_urls = synthesize_archive(str(Path(tmp) / 'responses.jsonl'), args.pages)
+
+        results = run(
+            archive, start_urls, args.pages, args.concurrency,
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+            throttle_every=args.throttle_every, throttle_burst=args.throttle_burst, seed=0,
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'site':<18}{'conc':>5}{'pages':>7}{'jobs':>6}{'pages/s':>10}{'jobs/s':>9}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'403s':>6}")
+    for result in results:
+        print(f"{result['site']:<18}{result['concurrency']:>5}{result['pages']:>7}{result['jobs']:>6}"
+              f"{result['pages_per_second']:>10.1f}{result['jobs_per_second']:>9.1f}"
+              f"{result['latency_p50_ms']:>9.1f}{result['latency_p99_ms']:>9.1f}{result['throttled']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark for sentiment analysis configurations.
+
+Scores a labelled job-description corpus at several sizes with every
+SentimentAnalyzer configuration: each backend subset, run one description at
+a time (single), through analyze_many (batched) and on a worker pool (pool).
+Reports docs/sec, peak memory, and label agreement with the full three-engine
+baseline and with the corpus labels. Each configuration runs in a fresh
+process, so model loading and peak memory aren't shared between them. The
+corpus is synthesized from labelled sentence templates by default; saved jobs
+can be used instead with --corpus.
+
+Results are written to data/benchmarks/sentiment_<timestamp>.json so runs can
+be compared over time.
+
+    python -m benchmarks.bench_sentiment --sizes 1000 10000 100000
+    python -m benchmarks.bench_sentiment --sizes 1000 --modes batched --backends vader textblob,vader
+    python -m benchmarks.bench_sentiment --corpus data/jobs_indeed_python.jsonl --sizes 5000
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import time
+from datetime import datetime
+from itertools import combinations, cycle, islice
+from queue import Empty
+from typing import Dict, List, Optional, Tuple
+from src.utils.helpers import save_to_json
+from src.utils.sentiment_analyzer import PROFILES, SentimentAnalyzer
+from src.utils.sentiment_pool import peak_rss_mb
+
+MODES = ('single', 'batched', 'pool')
+BASELINE = ('full', 'batched')
+
+# Sentence templates by the label they give a description
+TEMPLATES = {
+    'positive': [
+        'You will join a {good} team that values {thing}.',
+        'We offer {good} benefits and a {good} culture.',
+        'Our {thing} is {good} and growing fast.',
+        'Enjoy {good} flexibility and support for your {thing}.',
+    ],
+    'negative': [
+        'Expect {bad} hours and {bad} deadlines.',
+        'The {thing} is {bad} and the pressure is {bad}.',
+        'Overtime is mandatory and {thing} is often {bad}.',
+        'This role deals with {bad} legacy systems and {bad} processes.',
+    ],
+    'neutral': [
+        'The role requires {years} years of experience with {tool}.',
+        'You will work on {thing} using {tool}.',
+        'The position is based in {place} and reports to the {role}.',
+        'Responsibilities include maintaining {tool} services.',
+    ],
+}
+WORDS = {
+    'good': ['great', 'excellent', 'amazing', 'supportive', 'friendly', 'generous', 'wonderful'],
+    'bad': ['stressful', 'terrible', 'chaotic', 'exhausting', 'poor', 'awful', 'frustrating'],
+    'thing': ['collaboration', 'learning', 'the product', 'the platform', 'career growth', 'the workload'],
+    'tool': ['Python', 'SQL', 'Kubernetes', 'Spark', 'React', 'Terraform'],
+    'place': ['Berlin', 'Austin', 'London', 'Toronto', 'the main office'],
+    'role': ['engineering manager', 'head of data', 'CTO', 'team lead'],
+    'years': ['2', '3', '5', '7'],
+}
+
+def generate_corpus(size: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Synthesize `size` labelled descriptions. Each mixes neutral requirement
+    sentences with sentences of its label's tone.
+
+    Returns:
+        List[Tuple[str, str]]: (description, label) pairs
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        label = rng.choice(list(TEMPLATES))
+        sentences = [rng.choice(TEMPLATES['neutral']) for _ in range(rng.randint(3, 8))]
+        if label != 'neutral':
+            sentences += [rng.choice(TEMPLATES[label]) for _ in range(rng.randint(2, 4))]
+        rng.shuffle(sentences)
+        text = ' '.join(sentences)
+        corpus.append((text.format(**{key: rng.choice(words) for key, words in WORDS.items()}), label))
+    return corpus
+
+def load_corpus(path: str, size: int) -> List[Tuple[str, Optional[str]]]:
+    """
+    Read descriptions from saved jobs (.jsonl, .json or .csv), repeated as needed
+    to reach `size`. A job's 'label' field, if present, is its expected label.
+    """
+    from src.main import load_jobs
+    fmt = path.rsplit('.', 1)[-1].lower()
+    if fmt == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            jobs = json.load(f)
+    else:
+        jobs = load_jobs(path, fmt)
+    corpus = [(job['description'], job.get('label') or None) for job in jobs if job.get('description')]
+    if not corpus:
+        raise ValueError(f"No descriptions in {path}")
+    return list(islice(cycle(corpus), size))
+
+def configurations(backend_sets: List[Tuple[str, ...]], modes: List[str]) -> List[Tuple[Tuple[str, ...], str]]:
+    """Every (backends, mode) pair, the baseline first."""
+    baseline = (PROFILES[BASELINE[0]], BASELINE[1])
+    configs = [(backends, mode) for backends in backend_sets for mode in modes]
+    return [baseline] + [config for config in configs if config != baseline]
+
+def _run_config(descriptions: List[str], backends: Tuple[str, ...], mode: str, workers: int, queue) -> None:
+    """Score the corpus with one configuration; runs in its own process."""
+    try:
+        queue.put(_measure(descriptions, backends, mode, workers))
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def _measure(descriptions: List[str], backends: Tuple[str, ...], mode: str, workers: int) -> Dict:
+    start = time.perf_counter()
+    analyzer = SentimentAnalyzer(backends, workers=workers if mode == 'pool' else 1)
+    analyzer.prewarm()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if mode == 'single':
+        results = [analyzer.analyze_job_description(description) for description in descriptions]
+    else:
+        results = list(analyzer.analyze_many(descriptions))
+    seconds = time.perf_counter() - start
+
+    worker_rss = [stats['peak_rss_mb'] for stats in analyzer.pool.stats().values()] if analyzer.pool else []
+    analyzer.close()
+    return {
+        'labels': [result['overall_sentiment'] for result in results],
+        'load_seconds': load_seconds,
+        'seconds': seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'worker_peak_rss_mb': max(filter(None, worker_rss), default=None),
+    }
+
+def run_config(descriptions: List[str], backends: Tuple[str, ...], mode: str, workers: int,
+               poll_seconds: float = 1.0) -> Dict:
+    """
+    Measure one configuration in a fresh process.
+
+    Returns:
+        Dict: The measurements, or just an 'error' if the configuration failed or its process died
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_config, args=(descriptions, backends, mode, workers, queue))
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=poll_seconds)
+            break
+        except Empty:
+            if process.is_alive():
+                continue
+            # A result put just before exiting may still be in the pipe
+            try:
+                result = queue.get(timeout=poll_seconds)
+            except Empty:
+                result = {'error': f"benchmark process exited with code {process.exitcode}"}
+            break
+    process.join()
+    return result
+
+def agreement(labels: List[str], expected: List[Optional[str]]) -> Optional[float]:
+    """Share of labels matching the expected ones, over the descriptions that have one."""
+    pairs = [(label, want) for label, want in zip(labels, expected) if want is not None]
+    if not pairs:
+        return None
+    return round(sum(label == want for label, want in pairs) / len(pairs), 4)
+
+def run(sizes: List[int], backend_sets: List[Tuple[str, ...]], modes: List[str], workers: int,
+        corpus_path: Optional[str] = None, seed: int = 0) -> List[Dict]:
+    results = []
+    for size in sizes:
+        corpus = load_corpus(corpus_path, size) if corpus_path else generate_corpus(size, seed)
+        descriptions = [description for description, _ in corpus]
+        expected = [label for _, label in corpus]
+        baseline = None
+
+        for backends, mode in configurations(backend_sets, modes):
+            measured = run_config(descriptions, backends, mode, workers)
+            config = {
+                'size': size,
+                'backends': ','.join(backends),
+                'mode': mode,
+                'workers': workers if mode == 'pool' else 1,
+            }
+            if 'error' in measured:
+                results.append({**config, 'error': measured['error']})
+                continue
+            if (backends, mode) == (PROFILES[BASELINE[0]], BASELINE[1]):
+                baseline = measured['labels']
+            results.append({
+                **config,
+                'load_seconds': round(measured['load_seconds'], 3),
+                'seconds': round(measured['seconds'], 3),
+                'docs_per_second': round(size / measured['seconds'], 1) if measured['seconds'] else 0.0,
+                'peak_rss_mb': measured['peak_rss_mb'],
+                'worker_peak_rss_mb': measured['worker_peak_rss_mb'],
+                # None when the baseline configuration failed
+                'baseline_agreement': agreement(measured['labels'], baseline) if baseline is not None else None,
+                'label_accuracy': agreement(measured['labels'], expected),
+            })
+    return results
+
+def backend_subsets() -> List[Tuple[str, ...]]:
+    """Every non-empty subset of the full profile's engines."""
+    engines = PROFILES['full']
+    return [subset for n in range(1, len(engines) + 1) for subset in combinations(engines, n)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentiment analysis configuration benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Corpus sizes to benchmark')
+    parser.add_argument('--backends', nargs='+',
+                        help='Comma-separated engine sets to compare (default: every subset of the full profile)')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='Ways of running the analyzer')
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1), help='Worker processes in pool mode')
+    parser.add_argument('--corpus', help='Saved jobs to benchmark on instead of the synthesized corpus')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthesized corpus')
+    parser.add_argument('--output', help='Where to write the JSON report '
+                                         '(default: data/benchmarks/sentiment_<timestamp>.json)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    backend_sets = ([tuple(PROFILES.get(spec, spec.split(','))) for spec in args.backends]
+                    if args.backends else backend_subsets())
+    results = run(args.sizes, backend_sets, args.modes, args.workers, args.corpus, args.seed)
+
+    output = args.output or f"data/benchmarks/sentiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    save_to_json({
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'corpus': args.corpus or f'synthetic (seed {args.seed})',
+        'baseline': '/'.join(BASELINE),
+        'results': results,
+    }, output)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'size':>7}  {'backends':<22}{'mode':<9}{'docs/s':>10}{'RSS MB':>9}{'agree':>8}{'accuracy':>10}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['size']:>7}  {result['backends']:<22}{result['mode']:<9}  failed: {result['error']}")
+            continue
+        agree, accuracy = (float('nan') if result[key] is None else result[key]
+                           for key in ('baseline_agreement', 'label_accuracy'))
+        print(f"{result['size']:>7}  {result['backends']:<22}{result['mode']:<9}{result['docs_per_second']:>10.1f}"
+              f"{result['peak_rss_mb'] or 0:>9.1f}{agree:>8.3f}{accuracy:>10.3f}")
+    print(f"Report written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import logging
 import argparse
 from pathlib import Path
 from src.scrapers.job_scraper import IndeedScraper
+from src.utils.company_index import CompanySentimentIndex
 from src.utils.visualization import JobVisualizer
 from src.utils.sentiment_analyzer import SentimentAnalyzer
 
@@ -47,11 +48,11 @@ def generate_sentiment_visualizations(visualizer, job_postings, output_dir: Path
             save_path=str(output_dir / f"wordcloud_{sentiment}.png")
         )
     
-    # 3. Sentiment by company
-    companies = set(job['company'] for job in job_postings)
-    for company in companies:
-        company_jobs = [job for job in job_postings if job['company'] == company]
-        company_analysis = sentiment_analyzer.analyze_company_sentiment(company_jobs)
+    # 3. Sentiment by company, grouped in one pass over the analyzed postings
+    company_index = CompanySentimentIndex()
+    company_index.update(job_postings)
+    for company in company_index.companies():
+        company_analysis = company_index.get(company)
         visualizer.plot_company_sentiment(
             company_analysis,
             save_path=str(output_dir / f"company_sentiment_{company}.png")
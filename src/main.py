@@ -1,8 +1,24 @@
 import argparse
+import csv
+import json
 import logging
-from src.scrapers.job_scraper import IndeedScraper, LinkedInScraper
-from src.utils.helpers import save_to_json, save_to_csv
-from src.utils.visualization import JobVisualizer
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+from src.scrapers.job_scraper import IndeedScraper, JobScraper, LinkedInScraper
+from src.scrapers.batch import BatchScheduler, load_searches, summarize
+from src.utils.heavy_hitters import JobSketches
+from src.utils.helpers import open_sink, read_jsonl, save_to_json, save_to_csv
+from src.utils.http_cache import ResponseCache
+from src.utils.salary import SALARY_COLUMNS, add_salaries
+from src.utils.sections import DEFAULT_TOKEN_BUDGET, SectionFilter
+from src.utils.seen_index import SeenIndex
+from src.utils.sentiment_cache import SentimentCache
+from src.utils.term_index import TermFrequencyIndex
+from src.utils.frontier import CrawlFrontier
+from src.utils.transport import get_transport
+from src.utils.visualization import JobVisualizer, plot_fields
 from datetime import datetime
 
 # Configure logging
@@ -12,46 +28,348 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def scrape_jobs(site: str, query: str, location: str, max_pages: int, output_format: str) -> None:
-    """Scrape jobs from the specified site."""
+SCRAPERS = {
+    'indeed': IndeedScraper,
+    'linkedin': LinkedInScraper,
+}
+
+# CSV columns for streamed output, whose header is written before any job is complete
+JOB_FIELDS = ['title', 'company', 'location', 'description', 'posted_date', 'job_type', 'salary',
+              *SALARY_COLUMNS, 'url', 'scraped_date', 'seen_before']
+
+def search_url(site: str, query: str, location: str) -> str:
+    """Build the first results page URL for a search."""
     if site.lower() == 'indeed':
-        scraper = IndeedScraper()
-        url = f"https://www.indeed.com/jobs?q={query}&l={location}"
+        return f"https://www.indeed.com/jobs?q={query}&l={location}"
     elif site.lower() == 'linkedin':
-        scraper = LinkedInScraper()
-        url = f"https://www.linkedin.com/jobs/search/?keywords={query}&location={location}"
-    else:
+        return f"https://www.linkedin.com/jobs/search/?keywords={query}&location={location}"
+    raise ValueError(f"Unsupported site: {site}")
+
+def scraper_options(concurrency: int = 1, use_cache: bool = True, extraction_engine: str = 'lxml',
+                    incremental: bool = False, refresh_after_hours: Optional[float] = None,
+                    sentiment_backends: Optional[str] = None, analysis_workers: int = 1,
+                    section_filter: Optional[SectionFilter] = None) -> Dict:
+    """Shared resources and settings passed to every scraper."""
+    options = {
+        'concurrency': concurrency,
+        'cache': ResponseCache() if use_cache else None,
+        'extraction_engine': extraction_engine,
+        'sentiment_backends': sentiment_backends,
+        'sentiment_cache': SentimentCache() if use_cache and sentiment_backends else None,
+        'analysis_workers': analysis_workers,
+        'section_filter': section_filter,
+    }
+    if incremental:
+        refresh_after = refresh_after_hours * 3600 if refresh_after_hours is not None else None
+        options['seen_index'] = SeenIndex(refresh_after=refresh_after)
+    return options
+
+def filename_part(text: str) -> str:
+    """Text made safe for use in a file name: runs of characters other than letters, digits, + and - become a dash."""
+    return re.sub(r'[^\w+-]+', '-', text).strip('-') or 'any'
+
+def build_scraper(site: str, options: Dict) -> JobScraper:
+    if site.lower() not in SCRAPERS:
         raise ValueError(f"Unsupported site: {site}")
+    # Each scraper checkpoints its own crawls, in a file per site so batch lanes never share one
+    return SCRAPERS[site.lower()](frontier=CrawlFrontier(f"data/frontier_{site.lower()}.sqlite"), **options)
+
+def save_jobs(jobs: List[Dict], filename: str, output_format: str) -> None:
+    if output_format.lower() == 'json':
+        save_to_json(jobs, f"{filename}.json")
+    elif output_format.lower() == 'jsonl':
+        with open_sink(f"{filename}.jsonl", 'jsonl') as sink:
+            for job in jobs:
+                sink.write(job)
+    else:
+        save_to_csv(jobs, f"{filename}.csv")
+
+def load_jobs(path: str, output_format: str) -> List[Dict]:
+    """Read streamed output back into a list of jobs."""
+    if output_format.lower() == 'jsonl':
+        return list(read_jsonl(path))
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def iter_saved_jobs(paths: List[str]) -> Iterator[Dict]:
+    """Stream jobs from saved files, one at a time for .jsonl and .csv; .json files are read whole."""
+    for path in paths:
+        fmt = path.rsplit('.', 1)[-1].lower()
+        if fmt == 'json':
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from json.load(f)
+        elif fmt == 'jsonl':
+            yield from read_jsonl(path)
+        else:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                yield from csv.DictReader(f)
+
+def scrape_jobs(site: str, query: str, location: str, max_pages: int, output_format: str,
+                concurrency: int = 1, use_cache: bool = True, extraction_engine: str = 'lxml',
+                incremental: bool = False, refresh_after_hours: Optional[float] = None,
+                resume: bool = False, sentiment_backends: Optional[str] = None,
+                analysis_workers: int = 1, section_filter: Optional[SectionFilter] = None) -> None:
+    """
+    Scrape jobs from the specified site.
     
-    logger.info(f"Scraping jobs from {site} for query: {query}, location: {location}")
-    jobs = scraper.scrape_job_listings(url, max_pages=max_pages)
+    With sentiment_backends (a profile such as 'fast', or engine names), each
+    job is annotated with 'sentiment_analysis' before it is saved, on
+    analysis_workers processes when more than one. A section_filter limits the
+    analysis to each description's non-boilerplate sections, up to its token budget.
+    """
+    url = search_url(site, query, location)
+    scraper = build_scraper(site, scraper_options(concurrency, use_cache, extraction_engine,
+                                                  incremental, refresh_after_hours, sentiment_backends,
+                                                  analysis_workers, section_filter))
+    if sentiment_backends:
+        # Load the models, and fork any analysis workers, before the crawl starts its threads
+        scraper.sentiment_analyzer.prewarm()
     
-    # Save results
+    logger.info(f"Scraping jobs from {site} for query: {query}, location: {location}")
     filename = f"data/jobs_{site}_{query}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    stream = add_salaries(scraper.iter_job_listings(url, max_pages=max_pages, resume=resume))
+    fields = JOB_FIELDS
+    if sentiment_backends:
+        stream = scraper.analyze_jobs(stream)
+        fields = JOB_FIELDS + ['sentiment_analysis']
+    
+    # Word clouds are drawn from term counts kept across runs
+    term_index = TermFrequencyIndex()
     if output_format.lower() == 'json':
-        save_to_json(jobs, f"{filename}.json")
+        jobs = list(stream)
+        save_jobs(jobs, filename, output_format)
+        term_index.update(jobs)
     else:
-        save_to_csv(jobs, f"{filename}.csv")
+        # Stream each job to disk as it completes rather than holding the crawl in memory;
+        # the plots only keep a few short fields, descriptions being counted by the term index
+        jobs = []
+        with open_sink(f"{filename}.{output_format.lower()}", output_format, fields) as sink:
+            for job in stream:
+                sink.write(job)
+                term_index.add(job)
+                jobs.append(plot_fields(job))
+    
+    scraper.sentiment_analyzer.close()
+    if scraper.sentiment_analyzer.cache is not None:
+        scraper.sentiment_analyzer.cache.log_stats()
+        scraper.sentiment_analyzer.cache.close()
     
     # Generate visualizations
-    visualizer = JobVisualizer()
+    visualizer = JobVisualizer(use_cache=use_cache, term_index=term_index)
     visualizer.generate_all_visualizations(jobs)
+    term_index.close()
 
-def main():
-    parser = argparse.ArgumentParser(description='Job Scraper')
+def run_batch(searches_path: str, max_pages: int, output_format: str, concurrency: int = 1,
+              use_cache: bool = True, extraction_engine: str = 'lxml', incremental: bool = False,
+              refresh_after_hours: Optional[float] = None, resume: bool = False,
+              sentiment_backends: Optional[str] = None, analysis_workers: int = 1,
+              section_filter: Optional[SectionFilter] = None) -> Dict:
+    """
+    Run every search in a batch file in this process.
+    
+    Writes one output per search as it finishes, a combined output tagged with
+    each job's search, and a JSON report of per-search timings and throughput.
+    With sentiment_backends, jobs are annotated as in scrape_jobs; each lane's
+    models are loaded once and reused by all of its searches.
+    
+    Returns:
+        Dict: The batch report
+    """
+    searches = load_searches(searches_path, default_max_pages=max_pages)
+    options = scraper_options(concurrency, use_cache, extraction_engine, incremental, refresh_after_hours,
+                              sentiment_backends, analysis_workers, section_filter)
+    scrapers = {site: build_scraper(site, options) for site in dict.fromkeys(search['site'] for search in searches)}
+    if sentiment_backends:
+        # Load the models, and fork any analysis workers, before the lanes start their threads
+        for scraper in scrapers.values():
+            scraper.sentiment_analyzer.prewarm()
+    scheduler = BatchScheduler(scrapers.__getitem__, search_url, analyze=bool(sentiment_backends))
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    def save_search(result: Dict) -> None:
+        search = result['search']
+        name = '_'.join(filename_part(search[key]) for key in ('site', 'query', 'location'))
+        save_jobs(list(add_salaries(result['jobs'])), f"data/jobs_{name}_{timestamp}", output_format)
+        logger.info(f"Batch: {search['site']} '{search['query']}' in {search['location']}: "
+                    f"{len(result['jobs'])} jobs in {result['seconds']:.1f}s")
+    
+    logger.info(f"Running batch of {len(searches)} searches from {searches_path}")
+    start = time.perf_counter()
+    results = scheduler.run(searches, resume=resume, on_result=save_search)
+    report = summarize(results, time.perf_counter() - start)
+    
+    combined = [
+        {**job, 'search': {key: result['search'][key] for key in ('site', 'query', 'location')}}
+        for result in results for job in result['jobs']
+    ]
+    save_jobs(combined, f"data/batch_{timestamp}", output_format)
+    save_to_json(report, f"data/batch_{timestamp}_report.json")
+    
+    for scraper in scrapers.values():
+        scraper.sentiment_analyzer.close()
+    if options['sentiment_cache'] is not None:
+        options['sentiment_cache'].log_stats()
+        options['sentiment_cache'].close()
+    logger.info(f"Batch finished: {report['total_jobs']} jobs from {report['total_searches']} searches "
+                f"in {report['elapsed_seconds']}s ({report['jobs_per_second']} jobs/s), "
+                f"{report['failed_searches']} failed")
+    
+    term_index = TermFrequencyIndex()
+    term_index.update(combined)
+    JobVisualizer(use_cache=use_cache, term_index=term_index).generate_all_visualizations(combined)
+    term_index.close()
+    return report
+
+def add_scraper_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--max-pages', type=int, default=5, help='Maximum number of pages to scrape')
+    parser.add_argument('--output-format', choices=['jsonl', 'csv', 'json'], default='jsonl',
+                        help='Output format; jsonl and csv are written as jobs complete, json once the crawl ends')
+    parser.add_argument('--concurrency', type=int, default=1, help='Number of job detail pages to fetch concurrently')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk HTTP response cache')
+    parser.add_argument('--extraction-engine', choices=['lxml', 'bs4'], default='lxml',
+                        help='HTML extraction engine: compiled XPath over lxml, or BeautifulSoup')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip detail pages of jobs already fetched on earlier runs')
+    parser.add_argument('--refresh-after', type=float, default=None, metavar='HOURS',
+                        help='With --incremental, refetch known jobs older than this many hours')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted crawl of the same search from its last checkpoint')
+
+def add_sentiment_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--sentiment', metavar='BACKENDS',
+                        help='Annotate jobs with sentiment using a profile (full, fast) or a comma-separated '
+                             'list of engines (textblob, vader, spacy)')
+    parser.add_argument('--analysis-workers', type=int, default=1, metavar='N',
+                        help='With --sentiment, score descriptions on N worker processes')
+    parser.add_argument('--boilerplate', metavar='PATH',
+                        help='With --sentiment, skip description sections learned as boilerplate '
+                             '(see "main.py boilerplate")')
+    parser.add_argument('--token-budget', type=int, metavar='N',
+                        help='With --sentiment, analyze at most N words of each description')
+
+def batch_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py batch', description='Run many job searches in one process')
+    parser.add_argument('searches', help='JSON or CSV file of searches (site, query, location, max_pages)')
+    add_sentiment_arguments(parser)
+    add_scraper_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    try:
+        run_batch(args.searches, args.max_pages, args.output_format, concurrency=args.concurrency,
+                  use_cache=not args.no_cache, extraction_engine=args.extraction_engine,
+                  incremental=args.incremental, refresh_after_hours=args.refresh_after, resume=args.resume,
+                  sentiment_backends=args.sentiment, analysis_workers=args.analysis_workers,
+                  section_filter=load_section_filter(args.boilerplate, args.token_budget))
+    except Exception as e:
+        logger.error(f"Error running batch: {str(e)}")
+        raise
+
+def boilerplate_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py boilerplate',
+                                     description='Learn boilerplate sections from stored job descriptions')
+    parser.add_argument('files', nargs='+', help='Saved job files (.jsonl, .csv or .json)')
+    parser.add_argument('--output', default='data/boilerplate.json', help='Where to save the learned filter')
+    parser.add_argument('--min-share', type=float, default=0.05,
+                        help='Share of descriptions a section must appear in to count as boilerplate')
+    parser.add_argument('--min-documents', type=int, default=5,
+                        help='Fewest descriptions a section must appear in to count as boilerplate')
+    parser.add_argument('--token-budget', type=int, default=DEFAULT_TOKEN_BUDGET,
+                        help='Words of each description analyzed when the filter is used')
+    args = parser.parse_args(argv)
+    
+    descriptions = (job.get('description') for job in iter_saved_jobs(args.files))
+    section_filter = SectionFilter.learn(descriptions, min_share=args.min_share,
+                                         min_documents=args.min_documents, max_tokens=args.token_budget)
+    section_filter.save(args.output)
+    logger.info(f"Saved {len(section_filter.fingerprints)} boilerplate fingerprints to {args.output}")
+
+def sketch_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='main.py sketch',
+                                     description='Rank companies, locations and job types across saved jobs '
+                                                 'in one pass with fixed memory')
+    parser.add_argument('files', nargs='*', help='Saved job files (.jsonl, .csv or .json)')
+    parser.add_argument('--merge', nargs='+', default=[], metavar='SKETCH',
+                        help='Sketch files from other runs or shards to merge in')
+    parser.add_argument('--output', default='data/job_sketches.json', help='Where to save the sketches')
+    parser.add_argument('--capacity', type=int, default=1000,
+                        help='Values tracked per field; more is more accurate')
+    parser.add_argument('--top', type=int, default=10, metavar='K', help='Values listed per field')
+    parser.add_argument('--plot', action='store_true', help='Plot the rankings')
+    args = parser.parse_args(argv)
+    if not args.files and not args.merge:
+        parser.error('give saved job files, sketches to --merge, or both')
+    
+    sketches = JobSketches(args.capacity)
+    read = sketches.update(iter_saved_jobs(args.files))
+    sketches = JobSketches.merge_all([sketches] + [JobSketches.load(path) for path in args.merge])
+    sketches.save(args.output)
+    logger.info(f"Sketched {read} jobs, merged {len(args.merge)} sketches, saved to {args.output}")
+    
+    for field in sketches.sketches:
+        print(f"Top {field} values:")
+        for entry in sketches.top(field, args.top):
+            bound = f" (at least {entry['lower']})" if entry['error'] else ''
+            mark = '' if entry['guaranteed'] else ' ?'
+            print(f"  {entry['count']:>8}{bound}  {entry['item']}{mark}")
+    if args.plot:
+        JobVisualizer().plot_from_sketches(sketches, k=args.top)
+
+def load_section_filter(boilerplate: Optional[str], token_budget: Optional[int]) -> Optional[SectionFilter]:
+    """The section filter for --boilerplate/--token-budget, or None when neither is given."""
+    if boilerplate:
+        overrides = {'max_tokens': token_budget} if token_budget is not None else {}
+        return SectionFilter.load(boilerplate, **overrides)
+    if token_budget is not None:
+        return SectionFilter(max_tokens=token_budget)
+    return None
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'batch':
+        return batch_main(argv[1:])
+    if argv and argv[0] == 'boilerplate':
+        return boilerplate_main(argv[1:])
+    if argv and argv[0] == 'sketch':
+        return sketch_main(argv[1:])
+    
+    parser = argparse.ArgumentParser(description='Job Scraper',
+                                     epilog='Run "main.py batch <file>" to run many searches in one process, '
+                                            '"main.py boilerplate <files>" to learn boilerplate from saved jobs, or '
+                                            '"main.py sketch <files>" to rank companies and locations across them.')
     parser.add_argument('site', choices=['indeed', 'linkedin'], help='Job site to scrape')
     parser.add_argument('query', help='Job search query')
     parser.add_argument('--location', default='Remote', help='Job location')
-    parser.add_argument('--max-pages', type=int, default=5, help='Maximum number of pages to scrape')
-    parser.add_argument('--output-format', choices=['json', 'csv'], default='json', help='Output format')
+    add_sentiment_arguments(parser)
+    parser.add_argument('--record', metavar='ARCHIVE',
+                        help='Record every response to this JSONL archive for offline replay')
+    add_scraper_arguments(parser)
+    
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    recorder = None
+    if args.record:
+        if args.concurrency > 1:
+            # Only the pooled requests session is recorded, not the aiohttp pipeline
+            logger.warning("Recording fetches pages serially, ignoring --concurrency")
+            args.concurrency = 1
+        from src.utils.replay import Recorder, ResponseArchive
+        recorder = Recorder(ResponseArchive(args.record))
+        recorder.attach(get_transport().session)
     
     try:
-        scrape_jobs(args.site, args.query, args.location, args.max_pages, args.output_format)
+        scrape_jobs(args.site, args.query, args.location, args.max_pages, args.output_format,
+                    concurrency=args.concurrency, use_cache=not args.no_cache and not args.record,
+                    extraction_engine=args.extraction_engine, incremental=args.incremental,
+                    refresh_after_hours=args.refresh_after, resume=args.resume,
+                    sentiment_backends=args.sentiment, analysis_workers=args.analysis_workers,
+                    section_filter=load_section_filter(args.boilerplate, args.token_budget))
     except Exception as e:
         logger.error(f"Error scraping jobs: {str(e)}")
         raise
+    finally:
+        if recorder:
+            recorder.archive.save()
+            logger.info(f"Recorded {recorder.recorded} responses to {recorder.archive.path}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
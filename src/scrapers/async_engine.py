@@ -0,0 +1,236 @@
+import asyncio
+import aiohttp
+import inspect
+import logging
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.utils.rate_limiter import THROTTLE_STATUS_CODES, RateLimiter, get_rate_limiter
+from src.utils.http_cache import ResponseCache
+from src.utils.transport import Transport, get_transport
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class AsyncFetcher:
+    """Fetch many pages concurrently with a bounded number of requests in flight."""
+
+    def __init__(self, headers_factory: Callable[[], Dict[str, str]], concurrency: int = 5,
+                 timeout: int = 30, max_retries: int = 3, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None, transport: Optional[Transport] = None):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.headers_factory = headers_factory
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.cache = cache
+        # Requests and new connections of each session are added to this transport's statistics
+        self.transport = transport or get_transport()
+
+    async def _fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                     url: str, url_class: str = 'detail') -> Optional[str]:
+        """Fetch a single URL, retrying while the host is throttling us."""
+        # Cache reads and writes are blocking SQLite calls, so they run off the event loop
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.cache.lookup, url, url_class) if self.cache else None
+        if cached and self.cache.is_fresh(cached, url_class):
+            return cached.to_response().text
+
+        for attempt in range(self.max_retries):
+            async with semaphore:
+                limiter = await self.rate_limiter.acquire_async(url)
+                headers = self.headers_factory()
+                if cached:
+                    headers.update(cached.conditional_headers())
+                start = time.perf_counter()
+                response = None
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        text = None
+                        if response.status == 200:
+                            body = await response.read()
+                            text = await response.text()
+                            if self.cache:
+                                await loop.run_in_executor(None, self.cache.store, url, response.headers, body)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    response = None
+                    logger.error(f"Request failed on attempt {attempt + 1}: {str(e)}")
+                    continue
+                finally:
+                    # Release the host's slot however the request ended, cancellation included
+                    if response is None:
+                        limiter.release(None)
+                    else:
+                        limiter.release_response(response.status, response.headers,
+                                                 elapsed=time.perf_counter() - start)
+
+            if response.status == 304 and cached:
+                revalidated = await loop.run_in_executor(None, self.cache.mark_revalidated, cached, response.headers)
+                return revalidated.to_response().text
+            elif response.status == 200:
+                return text
+            elif response.status in THROTTLE_STATUS_CODES:
+                logger.warning(f"Rate limited on attempt {attempt + 1} for URL: {url}")
+            else:
+                logger.error(f"Error {response.status} for URL: {url}")
+                return None
+
+        return None
+
+    def _session(self, counts: SimpleNamespace) -> aiohttp.ClientSession:
+        """A session for one crawl, counting its requests and new connections per host into counts."""
+        async def on_request_start(session, context, params) -> None:
+            context.host = params.url.host
+            counts.requests[context.host] += 1
+
+        async def on_connection_create_end(session, context, params) -> None:
+            counts.connections[getattr(context, 'host', '')] += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        # One extra connection for the listing stage of a crawl
+        connector = aiohttp.TCPConnector(limit=self.concurrency + 1)
+        return aiohttp.ClientSession(timeout=timeout, connector=connector, trace_configs=[trace])
+
+    @staticmethod
+    def _new_counts() -> SimpleNamespace:
+        return SimpleNamespace(requests=Counter(), connections=Counter())
+
+    def _record(self, counts: SimpleNamespace) -> None:
+        for host, requests in counts.requests.items():
+            self.transport.record_async(host, requests, counts.connections[host])
+
+    async def fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """Fetch all URLs concurrently, returning page bodies in input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        counts = self._new_counts()
+        try:
+            async with self._session(counts) as session:
+                return await asyncio.gather(*(self._fetch(session, semaphore, url) for url in urls))
+        finally:
+            self._record(counts)
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """Synchronous entry point for callers outside an event loop."""
+        if not urls:
+            return []
+        return asyncio.run(self.fetch_all(urls))
+
+    async def crawl(self, start_url: Optional[str], max_pages: int,
+                    parse_listing: Callable[[str], Tuple[List[Dict], Optional[str]]],
+                    parse_detail: Callable[[str, str], Dict],
+                    on_page: Optional[Callable[[List[Dict], Optional[str]], List[Dict]]] = None,
+                    on_detail: Optional[Callable[[Dict], None]] = None,
+                    on_job: Optional[Callable[[Dict], None]] = None,
+                    pending: Iterable[Dict] = (), pages_scraped: int = 0,
+                    queue_size: Optional[int] = None) -> List[Dict]:
+        """
+        Crawl listing pages and their detail pages as a two-stage pipeline.
+
+        A single producer walks listing pages and queues job cards; `concurrency`
+        consumers fetch and parse detail pages. The queue is bounded, so the
+        producer pauses when detail fetching falls behind.
+
+        Args:
+            start_url (Optional[str]): First listing page, None to only drain `pending`
+            max_pages (int): Maximum number of listing pages to walk, counting `pages_scraped`
+            parse_listing (Callable): Listing HTML -> (job cards, next page URL)
+            parse_detail (Callable): (detail HTML, job URL) -> job details
+            on_page (Optional[Callable]): (job cards, next page URL) -> the cards whose detail
+                pages should be fetched; defaults to every card with a URL
+            on_detail (Optional[Callable]): Called with each job once its detail fetch was attempted
+            on_job (Optional[Callable]): Called with each job card as soon as it is complete: after
+                its detail fetch, or straight away if its detail page is skipped. When given, cards
+                are handed over instead of collected and the returned list is empty. If it returns
+                an awaitable, that is awaited first, so a handler that waits holds back the crawl.
+            pending (Iterable[Dict]): Cards from an earlier run still awaiting detail pages
+            pages_scraped (int): Listing pages already walked by an earlier run
+            queue_size (Optional[int]): Job cards buffered between stages, defaults to 4x concurrency
+
+        Returns:
+            List[Dict]: Job cards from the listing pages walked, in listing order, updated with their details
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or self.concurrency * 4)
+        loop = asyncio.get_running_loop()
+        detail_semaphore = asyncio.Semaphore(self.concurrency)
+        listing_semaphore = asyncio.Semaphore(1)
+        all_jobs: List[Dict] = []
+        counts = self._new_counts()
+
+        async def hand_over(job: Dict) -> None:
+            result = on_job(job)
+            if inspect.isawaitable(result):
+                await result
+
+        async with self._session(counts) as session:
+            async def produce() -> None:
+                current_url = start_url
+                pages = pages_scraped
+                try:
+                    for job in pending:
+                        await queue.put(job)
+
+                    while current_url and pages < max_pages:
+                        logger.info(f"Scraping page {pages + 1}: {current_url}")
+                        html = await self._fetch(session, listing_semaphore, current_url, 'listing')
+                        if not html:
+                            break
+                        # Parse off the event loop so detail fetches keep flowing
+                        jobs, current_url = await loop.run_in_executor(None, parse_listing, html)
+                        selected = on_page(jobs, current_url) if on_page else jobs
+                        selected = [job for job in selected if job.get('url')]
+                        if on_job:
+                            selected_ids = {id(job) for job in selected}
+                            for job in jobs:
+                                if id(job) not in selected_ids:
+                                    await hand_over(job)
+                        else:
+                            all_jobs.extend(jobs)
+                        for job in selected:
+                            await queue.put(job)
+                        pages += 1
+                except asyncio.CancelledError:
+                    # The consumers are cancelled too; nobody is left to take sentinels
+                    raise
+                except BaseException:
+                    for _ in range(self.concurrency):
+                        await queue.put(None)
+                    raise
+                else:
+                    for _ in range(self.concurrency):
+                        await queue.put(None)
+
+            async def consume() -> None:
+                while True:
+                    job = await queue.get()
+                    if job is None:
+                        return
+                    html = await self._fetch(session, detail_semaphore, job['url'], 'detail')
+                    if html:
+                        job.update(await loop.run_in_executor(None, parse_detail, html, job['url']))
+                    if on_detail:
+                        on_detail(job)
+                    if on_job:
+                        await hand_over(job)
+
+            try:
+                await asyncio.gather(produce(), *(consume() for _ in range(self.concurrency)))
+            finally:
+                self._record(counts)
+
+        return all_jobs
+
+    def run_crawl(self, start_url: Optional[str], max_pages: int,
+                  parse_listing: Callable[[str], Tuple[List[Dict], Optional[str]]],
+                  parse_detail: Callable[[str, str], Dict], **kwargs) -> List[Dict]:
+        """Synchronous entry point for crawl()."""
+        return asyncio.run(self.crawl(start_url, max_pages, parse_listing, parse_detail, **kwargs))
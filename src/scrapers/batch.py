@@ -0,0 +1,133 @@
+import csv
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+from src.scrapers.job_scraper import JobScraper
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def load_searches(path: str, default_max_pages: int = 5) -> List[Dict]:
+    """
+    Load batch searches from a JSON list or a CSV file with site,query,location,max_pages columns.
+
+    Returns:
+        List[Dict]: Searches with 'site', 'query', 'location' and 'max_pages'
+    """
+    filepath = Path(path)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if filepath.suffix.lower() == '.csv':
+            rows = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+
+    searches = []
+    for row in rows:
+        if not row.get('site') or not row.get('query'):
+            raise ValueError(f"Batch search needs a site and a query: {row}")
+        searches.append({
+            'site': row['site'].strip().lower(),
+            'query': row['query'].strip(),
+            'location': (row.get('location') or 'Remote').strip(),
+            'max_pages': int(row.get('max_pages') or default_max_pages),
+        })
+    return searches
+
+class BatchScheduler:
+    """
+    Run many searches in one process, one lane per host.
+
+    Searches against the same host run one after another on a single warm
+    scraper, so the shared rate limiter sees a single steady client per host;
+    different hosts run in parallel. Sessions, caches and models are built
+    once and reused by every search.
+    """
+
+    def __init__(self, scraper_factory: Callable[[str], JobScraper],
+                 search_url: Callable[[str, str, str], str], analyze: bool = False):
+        self.scraper_factory = scraper_factory
+        self.search_url = search_url
+        # Annotate each search's jobs with the lane scraper's sentiment analyzer
+        self.analyze = analyze
+
+    def _run_lane(self, site: str, searches: List[Dict], resume: bool,
+                  on_result: Callable[[Dict], None]) -> List[Dict]:
+        scraper = self.scraper_factory(site)
+        results = []
+        for search in searches:
+            url = self.search_url(search['site'], search['query'], search['location'])
+            logger.info(f"Batch: scraping {site} for query: {search['query']}, location: {search['location']}")
+            start = time.perf_counter()
+            result = {'search': search, 'jobs': [], 'error': None}
+            try:
+                jobs = scraper.iter_job_listings(url, max_pages=search['max_pages'], resume=resume)
+                result['jobs'] = list(scraper.analyze_jobs(jobs) if self.analyze else jobs)
+            except Exception as e:
+                logger.error(f"Batch search {search} failed: {str(e)}")
+                result['error'] = str(e)
+            result['seconds'] = time.perf_counter() - start
+            on_result(result)
+            results.append(result)
+        return results
+
+    def run(self, searches: List[Dict], resume: bool = False,
+            on_result: Callable[[Dict], None] = lambda result: None) -> List[Dict]:
+        """
+        Run all searches and return one result per search, in input order.
+
+        Each result has the search, its jobs, the seconds it took and any error.
+        on_result is called from the lane's thread as each search finishes.
+        """
+        lanes: Dict[str, List[Dict]] = OrderedDict()
+        for search in searches:
+            host = urlparse(self.search_url(search['site'], search['query'], search['location'])).netloc
+            lanes.setdefault(host, []).append(search)
+
+        lock = threading.Lock()
+
+        def report(result: Dict) -> None:
+            with lock:
+                on_result(result)
+
+        by_search: Dict[int, Dict] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(lanes))) as executor:
+            futures = [
+                executor.submit(self._run_lane, lane[0]['site'], lane, resume, report)
+                for lane in lanes.values()
+            ]
+            for future in futures:
+                for result in future.result():
+                    by_search[id(result['search'])] = result
+
+        return [by_search[id(search)] for search in searches]
+
+def summarize(results: List[Dict], elapsed: float) -> Dict:
+    """Per-search timings and overall throughput for a batch run."""
+    total_jobs = sum(len(result['jobs']) for result in results)
+    return {
+        'searches': [
+            {
+                **result['search'],
+                'jobs': len(result['jobs']),
+                'seconds': round(result['seconds'], 2),
+                'jobs_per_second': round(len(result['jobs']) / result['seconds'], 3) if result['seconds'] else 0.0,
+                'error': result['error'],
+            }
+            for result in results
+        ],
+        'total_searches': len(results),
+        'failed_searches': sum(1 for result in results if result['error']),
+        'total_jobs': total_jobs,
+        'elapsed_seconds': round(elapsed, 2),
+        'jobs_per_second': round(total_jobs / elapsed, 3) if elapsed else 0.0,
+    }
@@ -1,9 +1,9 @@
 import requests
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
 import time
 from typing import Dict, List, Optional
 import logging
+from src.utils.transport import get_transport, random_user_agent
 
 # Configure logging
 logging.basicConfig(
@@ -15,13 +15,12 @@ logger = logging.getLogger(__name__)
 class ExampleScraper:
     def __init__(self, base_url: str):
         self.base_url = base_url
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.transport = get_transport()
         
     def _get_headers(self) -> Dict[str, str]:
         """Generate random headers for each request."""
         return {
-            'User-Agent': self.ua.random,
+            'User-Agent': random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         }
@@ -29,7 +28,7 @@ class ExampleScraper:
     def _make_request(self, url: str) -> Optional[requests.Response]:
         """Make a request with error handling and rate limiting."""
         try:
-            response = self.session.get(
+            response = self.transport.get(
                 url,
                 headers=self._get_headers(),
                 timeout=10
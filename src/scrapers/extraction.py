@@ -0,0 +1,50 @@
+from typing import Dict, List, Optional, Union
+from lxml import etree, html as lxml_html
+
+# Extraction engines accepted by JobScraper: compiled XPath over lxml, or the
+# original BeautifulSoup hooks.
+ENGINES = ('lxml', 'bs4')
+
+def has_class(name: str) -> str:
+    """XPath predicate matching one token of a multi-valued class attribute, like class_= in BeautifulSoup."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def compile_xpath(expression: str) -> etree.XPath:
+    # smart_strings=False returns plain str for attribute/text results instead of
+    # objects that keep the whole tree alive
+    return etree.XPath(expression, smart_strings=False)
+
+def parse_html(markup: Union[str, bytes]) -> lxml_html.HtmlElement:
+    """Parse a page straight into an lxml tree, skipping BeautifulSoup's tree building."""
+    return lxml_html.document_fromstring(markup)
+
+def first_text(xpath: etree.XPath, node) -> str:
+    """Stripped text of the first match, or '' if nothing matches."""
+    matches = xpath(node)
+    if not matches:
+        return ''
+    match = matches[0]
+    return (match if isinstance(match, str) else match.text_content()).strip()
+
+def all_text(xpath: etree.XPath, node) -> List[str]:
+    return [(match if isinstance(match, str) else match.text_content()).strip() for match in xpath(node)]
+
+def first_value(xpath: etree.XPath, node) -> Optional[str]:
+    """First attribute or string result of an XPath, unstripped."""
+    matches = xpath(node)
+    return matches[0] if matches else None
+
+class ListingSelectors:
+    """Compiled selectors for job cards on a search results page."""
+
+    def __init__(self, card: str, url: str, fields: Dict[str, str], next_page: str):
+        self.card = compile_xpath(card)
+        self.url = compile_xpath(url)
+        self.fields = {name: compile_xpath(expression) for name, expression in fields.items()}
+        self.next_page = compile_xpath(next_page)
+
+class DetailSelectors:
+    """Compiled selectors for the fields of a job detail page."""
+
+    def __init__(self, fields: Dict[str, str]):
+        self.fields = {name: compile_xpath(expression) for name, expression in fields.items()}
@@ -1,14 +1,28 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 import requests
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 from urllib.parse import urljoin
 from datetime import datetime
+from src.utils.company_index import CompanySentimentIndex
+from src.utils.sections import SectionFilter
 from src.utils.sentiment_analyzer import SentimentAnalyzer
+from src.utils.sentiment_cache import SentimentCache
+from src.utils.rate_limiter import THROTTLE_STATUS_CODES, get_rate_limiter
+from src.utils.transport import ACCEPT_ENCODING, get_transport, random_user_agent
+from src.utils.http_cache import ResponseCache
+from src.utils.seen_index import SeenIndex
+from src.utils.frontier import CrawlFrontier
+from src.scrapers.async_engine import AsyncFetcher
+from src.scrapers.extraction import (
+    ENGINES, DetailSelectors, ListingSelectors, all_text, compile_xpath, first_text, first_value, has_class, parse_html
+)
 from src.utils.helpers import clean_text
-import random
 
 # Configure logging
 logging.basicConfig(
@@ -19,12 +33,11 @@ logger = logging.getLogger(__name__)
 
 class BaseScraper:
     def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.transport = get_transport()
     
     def _get_headers(self) -> Dict[str, str]:
         return {
-            'User-Agent': self.ua.random,
+            'User-Agent': random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Connection': 'keep-alive',
@@ -32,7 +45,7 @@ class BaseScraper:
     
     def _make_request(self, url: str) -> BeautifulSoup:
         try:
-            response = self.session.get(url, headers=self._get_headers())
+            response = self.transport.get(url, headers=self._get_headers())
             response.raise_for_status()
             return BeautifulSoup(response.text, 'lxml')
         except Exception as e:
@@ -40,60 +53,107 @@ class BaseScraper:
             raise
 
 class JobScraper:
-    def __init__(self, base_url: str):
+    # Compiled XPath selectors for the lxml fast path; sites without them use the BeautifulSoup hooks
+    listing_selectors: Optional[ListingSelectors] = None
+    detail_selectors: Optional[DetailSelectors] = None
+    
+    def __init__(self, base_url: str, concurrency: int = 1, cache: Optional[ResponseCache] = None,
+                 extraction_engine: str = 'lxml', seen_index: Optional[SeenIndex] = None,
+                 frontier: Optional[CrawlFrontier] = None, sentiment_backends: Optional[str] = None,
+                 sentiment_cache: Optional[SentimentCache] = None, analysis_workers: int = 1,
+                 section_filter: Optional[SectionFilter] = None):
+        if extraction_engine not in ENGINES:
+            raise ValueError(f"Unsupported extraction engine: {extraction_engine}")
         self.base_url = base_url
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.concurrency = concurrency
+        self.cache = cache
+        self.extraction_engine = extraction_engine
+        self.seen_index = seen_index
+        self.frontier = frontier
+        self.rate_limiter = get_rate_limiter()
+        self.transport = get_transport()
+        self.sentiment_analyzer = SentimentAnalyzer(sentiment_backends, cache=sentiment_cache,
+                                                    workers=analysis_workers, sections=section_filter)
+        # Every analyzed job, grouped by company
+        self.company_index = CompanySentimentIndex()
+        # Start URLs whose search iter_jobs has crawled to the end, found postings or not
+        self._crawled_searches: set = set()
         
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for HTTP requests."""
-        ua = UserAgent()
         return {
-            'User-Agent': ua.random,
+            'User-Agent': random_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0',
             'TE': 'Trailers'
         }
     
-    def _make_request(self, url: str) -> Optional[requests.Response]:
-        """Make an HTTP request with retries and delays."""
+    def _make_request(self, url: str, url_class: str = 'detail') -> Optional[requests.Response]:
+        """
+        Make an HTTP request paced by the shared per-host rate limiter, with retries.
+        
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with ETag/If-Modified-Since.
+        
+        Args:
+            url (str): URL to fetch
+            url_class (str): 'listing' or 'detail', selects the cache TTL
+        """
+        cached = self.cache.lookup(url, url_class) if self.cache else None
+        if cached and self.cache.is_fresh(cached, url_class):
+            return cached.to_response()
+        
         max_retries = 3
-        retry_delay = 5
         
         for attempt in range(max_retries):
+            limiter = self.rate_limiter.acquire(url)
             try:
                 headers = self._get_headers()
-                response = requests.get(url, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    time.sleep(random.uniform(2, 5))  # Random delay between requests
-                    return response
-                elif response.status_code == 403:
-                    logger.warning(f"Rate limited on attempt {attempt + 1}, waiting {retry_delay} seconds")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    logger.error(f"Error {response.status_code} for URL: {url}")
-                    return None
-                
+                if cached:
+                    headers.update(cached.conditional_headers())
+                response = self.transport.get(url, headers=headers)
             except requests.RequestException as e:
+                limiter.release(None)
                 logger.error(f"Request failed on attempt {attempt + 1}: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    return None
+                continue
+            
+            limiter.release_response(response.status_code, response.headers,
+                                     elapsed=response.elapsed.total_seconds())
+            if response.status_code == 304 and cached:
+                return self.cache.mark_revalidated(cached, response.headers).to_response()
+            elif response.status_code == 200:
+                if self.cache:
+                    self.cache.store(url, response.headers, response.content)
+                return response
+            elif response.status_code in THROTTLE_STATUS_CODES:
+                logger.warning(f"Rate limited on attempt {attempt + 1} for URL: {url}")
+            else:
+                logger.error(f"Error {response.status_code} for URL: {url}")
+                return None
         
         return None
     
     def _extract_job_details(self, soup: BeautifulSoup, job_url: str) -> Dict:
         """Extract job details from a job listing page."""
         # This is a template method that should be overridden for specific job sites
+        return self._new_job_details(job_url)
+    
+    def _extract_job_listings(self, soup: BeautifulSoup) -> List[Dict]:
+        """Extract job listings from a search results page."""
+        # This is a template method that should be overridden for specific job sites
+        return []
+    
+    def _get_next_page_url(self, soup: BeautifulSoup) -> Optional[str]:
+        """Find the URL for the next page of results."""
+        # This is a template method that should be overridden for specific job sites
+        return None
+    
+    def _new_job_details(self, job_url: str) -> Dict:
+        """Empty job details, the starting point of every extraction engine."""
         return {
             'title': '',
             'company': '',
@@ -106,44 +166,234 @@ class JobScraper:
             'scraped_date': datetime.now().isoformat()
         }
     
-    def _extract_job_listings(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract job listings from a search results page."""
-        # This is a template method that should be overridden for specific job sites
-        return []
+    def _extract_job_listings_lxml(self, tree) -> List[Dict]:
+        """Extract job cards with the site's compiled listing selectors."""
+        selectors = self.listing_selectors
+        jobs = []
+        
+        for card in selectors.card(tree):
+            href = first_value(selectors.url, card)
+            if href is None:
+                continue
+            job = {name: first_text(xpath, card) for name, xpath in selectors.fields.items()}
+            job['url'] = urljoin(self.base_url, href)
+            jobs.append(job)
+        
+        return jobs
     
-    def _get_next_page_url(self, soup: BeautifulSoup) -> Optional[str]:
-        """Find the URL for the next page of results."""
-        # This is a template method that should be overridden for specific job sites
-        return None
+    def _get_next_page_url_lxml(self, tree) -> Optional[str]:
+        href = first_value(self.listing_selectors.next_page, tree)
+        return urljoin(self.base_url, href) if href else None
     
-    def scrape_job_listings(self, start_url: str, max_pages: int = 5) -> List[Dict]:
-        """Scrape job listings from multiple pages."""
-        all_jobs = []
-        current_url = start_url
-        pages_scraped = 0
-        
-        while current_url and pages_scraped < max_pages:
-            logger.info(f"Scraping page {pages_scraped + 1}: {current_url}")
-            response = self._make_request(current_url)
-            if not response:
-                break
-            
-            soup = BeautifulSoup(response.text, 'lxml')
-            jobs = self._extract_job_listings(soup)
-            
-            # Scrape individual job details
-            for job in jobs:
-                job_url = job.get('url')
-                if job_url:
-                    job_details = self.scrape_job_details(job_url)
-                    if job_details:
-                        job.update(job_details)
+    def _extract_job_details_lxml(self, tree, job_url: str) -> Dict:
+        """Extract job details with the site's compiled detail selectors."""
+        job_details = self._new_job_details(job_url)
+        for name, xpath in self.detail_selectors.fields.items():
+            value = first_text(xpath, tree)
+            if value:
+                job_details[name] = value
+        return job_details
+    
+    def _parse_listing_page(self, html: str) -> Tuple[List[Dict], Optional[str]]:
+        """Parse a search results page into its job cards and the next page URL."""
+        if self.extraction_engine == 'lxml' and self.listing_selectors:
+            try:
+                tree = parse_html(html)
+                return self._extract_job_listings_lxml(tree), self._get_next_page_url_lxml(tree)
+            except Exception as e:
+                logger.warning(f"Fast listing extraction failed, falling back to BeautifulSoup: {str(e)}")
+        
+        soup = BeautifulSoup(html, 'lxml')
+        return self._extract_job_listings(soup), self._get_next_page_url(soup)
+    
+    def _parse_detail_page(self, html: str, job_url: str) -> Dict:
+        """Parse a job detail page."""
+        if self.extraction_engine == 'lxml' and self.detail_selectors:
+            try:
+                return self._extract_job_details_lxml(parse_html(html), job_url)
+            except Exception as e:
+                logger.warning(f"Fast detail extraction failed, falling back to BeautifulSoup: {str(e)}")
+        
+        soup = BeautifulSoup(html, 'lxml')
+        return self._extract_job_details(soup, job_url)
+    
+    def _select_jobs_for_details(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Pick the jobs on a listing page whose detail pages need fetching.
+        
+        With a seen index, postings fetched on an earlier run (and not yet due
+        for refresh) keep only their listing card fields and are flagged
+        'seen_before'.
+        """
+        jobs = [job for job in jobs if job.get('url')]
+        if not self.seen_index:
+            return jobs
+        
+        due = self.seen_index.due(job['url'] for job in jobs)
+        selected = []
+        for job in jobs:
+            if job['url'] in due:
+                selected.append(job)
+            else:
+                job['seen_before'] = True
+        return selected
+    
+    def _parse_and_record_detail_page(self, html: str, job_url: str) -> Dict:
+        job_details = self._parse_detail_page(html, job_url)
+        if self.seen_index:
+            self.seen_index.mark_fetched(job_url)
+        return job_details
+    
+    def _handle_listing_page(self, jobs: List[Dict], next_url: Optional[str]) -> List[Dict]:
+        """Select the cards that need detail pages and checkpoint the listing page."""
+        selected = self._select_jobs_for_details(jobs)
+        if self.frontier:
+            self.frontier.checkpoint_page(jobs, selected, next_url)
+        return selected
+    
+    def _handle_job_details(self, job: Dict) -> None:
+        """Called once a job's detail fetch has been attempted."""
+        if self.frontier:
+            self.frontier.complete(job)
+    
+    def _scrape_details_into(self, job: Dict) -> None:
+        job_details = self.scrape_job_details(job['url'])
+        if job_details:
+            job.update(job_details)
+        self._handle_job_details(job)
+    
+    def scrape_job_listings(self, start_url: str, max_pages: int = 5, resume: bool = False) -> List[Dict]:
+        """
+        Scrape job listings from multiple pages.
+        
+        Args:
+            start_url (str): First page of search results
+            max_pages (int): Maximum number of listing pages to scrape
+            resume (bool): With a frontier, continue an interrupted crawl of start_url
+                from its last checkpoint instead of starting over
+        """
+        return list(self.iter_job_listings(start_url, max_pages=max_pages, resume=resume))
+    
+    def iter_job_listings(self, start_url: str, max_pages: int = 5, resume: bool = False) -> Iterator[Dict]:
+        """
+        Scrape job listings from multiple pages, yielding each job as soon as it is complete.
+        
+        Jobs come in the order they finish: listing order when fetching serially,
+        completion order when concurrency > 1. On resume, jobs completed by the
+        earlier run come first. Nothing is buffered beyond the pipeline's own
+        queues, so memory stays flat however long the crawl.
+        
+        Args:
+            start_url (str): First page of search results
+            max_pages (int): Maximum number of listing pages to scrape
+            resume (bool): With a frontier, continue an interrupted crawl of start_url
+                from its last checkpoint instead of starting over
+        """
+        if self.frontier:
+            done_jobs, pending, current_url, pages_scraped = self.frontier.start(start_url, start_url, resume)
+            pending_ids = {id(job) for job in pending}
+            yield from (job for job in done_jobs if id(job) not in pending_ids)
+        else:
+            pending, current_url, pages_scraped = [], start_url, 0
+        
+        if self.concurrency > 1:
+            yield from self._iter_job_listings_pipelined(current_url, max_pages, pending, pages_scraped)
+        else:
+            # Finish detail pages left over from an interrupted crawl
+            for job in pending:
+                self._scrape_details_into(job)
+                yield job
             
-            all_jobs.extend(jobs)
-            current_url = self._get_next_page_url(soup)
-            pages_scraped += 1
+            while current_url and pages_scraped < max_pages:
+                logger.info(f"Scraping page {pages_scraped + 1}: {current_url}")
+                response = self._make_request(current_url, url_class='listing')
+                if not response:
+                    break
+                
+                jobs, next_url = self._parse_listing_page(response.text)
+                
+                # Scrape individual job details
+                selected_ids = {id(job) for job in self._handle_listing_page(jobs, next_url)}
+                for job in jobs:
+                    if id(job) in selected_ids:
+                        self._scrape_details_into(job)
+                    yield job
+                
+                current_url = next_url
+                pages_scraped += 1
+        
+        if self.frontier:
+            self.frontier.finish()
+        self.rate_limiter.log_stats()
+        self.transport.log_stats()
+        if self.cache:
+            self.cache.flush()
+            self.cache.log_stats()
+        if self.seen_index:
+            self.seen_index.flush()
+            self.seen_index.log_stats()
+    
+    def _iter_job_listings_pipelined(self, start_url: Optional[str], max_pages: int,
+                                     pending: List[Dict], pages_scraped: int) -> Iterator[Dict]:
+        """
+        Walk listing pages and fetch detail pages concurrently in one pipeline.
+        
+        The next results page is fetched while the current page's details are
+        still in flight, with a bounded queue between the two stages. The
+        pipeline runs on its own event loop in a background thread and hands
+        each finished job to this generator through another bounded queue, so
+        the crawl stalls while the consumer lags; closing the generator early
+        cancels the crawl.
+        """
+        fetcher = AsyncFetcher(self._get_headers, concurrency=self.concurrency, transport=self.transport,
+                               rate_limiter=self.rate_limiter, cache=self.cache)
+        completed: queue.Queue = queue.Queue(maxsize=self.concurrency * 4)
+        finished = object()
+        loop = asyncio.new_event_loop()
+        # Blocking puts wait on their own thread, leaving the loop and its parse threads free
+        hand_off = ThreadPoolExecutor(max_workers=1, thread_name_prefix='crawl-hand-off')
+        
+        async def on_job(job: Dict) -> None:
+            await loop.run_in_executor(hand_off, completed.put, job)
+        
+        task = loop.create_task(fetcher.crawl(
+            start_url, max_pages, self._parse_listing_page, self._parse_and_record_detail_page,
+            on_page=self._handle_listing_page, on_detail=self._handle_job_details, on_job=on_job,
+            pending=pending, pages_scraped=pages_scraped
+        ))
+        
+        def run() -> None:
+            try:
+                loop.run_until_complete(task)
+            except BaseException as e:
+                completed.put(e)
+            finally:
+                loop.run_until_complete(loop.shutdown_default_executor())
+                loop.close()
+                hand_off.shutdown()
+                completed.put(finished)
         
-        return all_jobs
+        thread = threading.Thread(target=run, name='crawl-pipeline', daemon=True)
+        thread.start()
+        done = False
+        try:
+            while not done:
+                item = completed.get()
+                done = item is finished or isinstance(item, BaseException)
+                if isinstance(item, BaseException):
+                    raise item
+                if not done:
+                    yield item
+        finally:
+            if not done:
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass  # The crawl finished and closed its loop in the meantime
+                # Unblock any pending hand-off so the crawl thread can wind down
+                while completed.get() is not finished:
+                    pass
+            thread.join()
     
     def scrape_job_details(self, job_url: str) -> Optional[Dict]:
         """Scrape detailed information from a single job listing."""
@@ -151,8 +401,7 @@ class JobScraper:
         if not response:
             return None
         
-        soup = BeautifulSoup(response.text, 'lxml')
-        return self._extract_job_details(soup, job_url)
+        return self._parse_and_record_detail_page(response.text, job_url)
 
     def scrape_jobs(self, max_pages: int = 5) -> List[Dict]:
         """
@@ -164,40 +413,95 @@ class JobScraper:
         Returns:
             List[Dict]: List of job postings with sentiment analysis
         """
-        job_postings = []
-        job_listings = self.scrape_job_listings(self.base_url)
+        return list(self.iter_jobs(max_pages))
+    
+    def iter_jobs(self, max_pages: int = 5, batch_size: int = 64) -> Iterator[Dict]:
+        """
+        Scrape job postings from the website, yielding each one with its
+        sentiment analysis as soon as its batch is analyzed.
         
-        for job in job_listings:
-            job_data = {
+        Args:
+            max_pages (int): Maximum number of pages to scrape
+            batch_size (int): Jobs analyzed together in one sentiment pipeline pass
+        """
+        listings = self.iter_job_listings(self.base_url, max_pages=max_pages)
+        for job in self.analyze_jobs(listings, batch_size=batch_size):
+            yield {
                 'title': job.get('title', ''),
                 'company': job.get('company', ''),
                 'location': job.get('location', ''),
                 'description': job.get('description', ''),
                 'url': job.get('url', ''),
-                'sentiment_analysis': self.sentiment_analyzer.analyze_job_description(
-                    job.get('description', '')
-                )
+                'sentiment_analysis': job['sentiment_analysis']
             }
-            job_postings.append(job_data)
+        self._crawled_searches.add(self.base_url)
+    
+    def analyze_jobs(self, jobs: Iterable[Dict], batch_size: int = 64) -> Iterator[Dict]:
+        """
+        Add 'sentiment_analysis' to each job from a stream, analyzing them in batches.
+        Each analyzed job is also added to company_index.
+        
+        The jobs stream through a single analyze_many pass, which reads ahead
+        by a batch (or, with analysis workers, a few chunks per worker) and
+        yields each job once its analysis is back.
+        
+        Args:
+            jobs (Iterable[Dict]): Jobs, e.g. from iter_job_listings
+            batch_size (int): Jobs analyzed together in one sentiment pipeline pass
+        """
+        pending: deque = deque()
+        
+        def descriptions() -> Iterator[str]:
+            for job in jobs:
+                pending.append(job)
+                yield job.get('description', '')
         
-        return job_postings
+        for analysis in self.sentiment_analyzer.analyze_many(descriptions(), batch_size=batch_size):
+            job = pending.popleft()
+            job['sentiment_analysis'] = analysis
+            self.company_index.add(job)
+            yield job
 
     def get_company_sentiment_analysis(self, company_name: str) -> Dict:
         """
         Get sentiment analysis for all job postings from a specific company.
         
+        Answered from company_index. The site's search is crawled to fill the
+        index only if it hasn't been crawled yet; later calls for any company
+        are lookups, even when the crawl found no postings.
+        
         Args:
             company_name (str): Name of the company to analyze
             
         Returns:
             Dict: Company-level sentiment analysis
         """
-        company_jobs = [job for job in self.scrape_jobs() if job['company'].lower() == company_name.lower()]
-        return self.sentiment_analyzer.analyze_company_sentiment(company_jobs)
+        if self.base_url not in self._crawled_searches:
+            for _ in self.iter_jobs():
+                pass
+        return self.company_index.get(company_name) or self.sentiment_analyzer.analyze_company_sentiment([])
 
 class IndeedScraper(JobScraper):
-    def __init__(self):
-        super().__init__("https://www.indeed.com")
+    listing_selectors = ListingSelectors(
+        card=f"//div[{has_class('job_seen_beacon')}]",
+        url=f"(.//h2[{has_class('jobTitle')}])[1]/descendant::a[1]/@href",
+        fields={
+            'title': f".//h2[{has_class('jobTitle')}]",
+            'company': f".//span[{has_class('companyName')}]",
+            'location': f".//div[{has_class('companyLocation')}]",
+        },
+        next_page="//a[@aria-label='Next Page']/@href",
+    )
+    detail_selectors = DetailSelectors({
+        'title': f"//h1[{has_class('jobsearch-JobInfoHeader-title')}]",
+        'company': f"//div[{has_class('jobsearch-CompanyInfoContainer')}]",
+        'location': f"//div[{has_class('jobsearch-JobInfoHeader-subtitle')}]",
+        'description': "//div[@id='jobDescriptionText']",
+    })
+    salary_selector = compile_xpath(f"//div[{has_class('jobsearch-JobMetadataHeader-item')}]")
+    
+    def __init__(self, base_url: str = "https://www.indeed.com", **kwargs):
+        super().__init__(base_url, **kwargs)
 
     def _extract_job_listings(self, soup: BeautifulSoup) -> List[Dict]:
         """Extract job listings from Indeed search results."""
@@ -222,17 +526,7 @@ class IndeedScraper(JobScraper):
     
     def _extract_job_details(self, soup: BeautifulSoup, job_url: str) -> Dict:
         """Extract job details from an Indeed job listing."""
-        job_details = {
-            'title': '',
-            'company': '',
-            'location': '',
-            'description': '',
-            'posted_date': '',
-            'job_type': '',
-            'salary': '',
-            'url': job_url,
-            'scraped_date': datetime.now().isoformat()
-        }
+        job_details = self._new_job_details(job_url)
         
         # Extract job title
         title_elem = soup.find('h1', class_='jobsearch-JobInfoHeader-title')
@@ -261,6 +555,13 @@ class IndeedScraper(JobScraper):
         
         return job_details
     
+    def _extract_job_details_lxml(self, tree, job_url: str) -> Dict:
+        job_details = super()._extract_job_details_lxml(tree, job_url)
+        salary = first_text(self.salary_selector, tree)
+        if 'salary' in salary.lower():
+            job_details['salary'] = salary
+        return job_details
+    
     def _get_next_page_url(self, soup: BeautifulSoup) -> Optional[str]:
         """Find the URL for the next page of Indeed results."""
         next_link = soup.find('a', {'aria-label': 'Next Page'})
@@ -269,8 +570,26 @@ class IndeedScraper(JobScraper):
         return None
 
 class LinkedInScraper(JobScraper):
-    def __init__(self):
-        super().__init__("https://www.linkedin.com")
+    listing_selectors = ListingSelectors(
+        card=f"//div[{has_class('base-card')}]",
+        url=f"(.//h3[{has_class('base-search-card__title')}])[1]/descendant::a[1]/@href",
+        fields={
+            'title': f".//h3[{has_class('base-search-card__title')}]",
+            'company': f".//h4[{has_class('base-search-card__subtitle')}]",
+            'location': f".//span[{has_class('job-search-card__location')}]",
+        },
+        next_page="//button[@aria-label='Next']/@href",
+    )
+    detail_selectors = DetailSelectors({
+        'title': f"//h1[{has_class('top-card-layout__title')}]",
+        'company': f"//a[{has_class('topcard__org-name-link')}]",
+        'location': f"//span[{has_class('topcard__flavor--bullet')}]",
+        'description': f"//div[{has_class('show-more-less-html__markup')}]",
+    })
+    criteria_selector = compile_xpath(f"//span[{has_class('description__job-criteria-text')}]")
+    
+    def __init__(self, base_url: str = "https://www.linkedin.com", **kwargs):
+        super().__init__(base_url, **kwargs)
 
     def _extract_job_listings(self, soup: BeautifulSoup) -> List[Dict]:
         """Extract job listings from LinkedIn search results."""
@@ -295,17 +614,7 @@ class LinkedInScraper(JobScraper):
     
     def _extract_job_details(self, soup: BeautifulSoup, job_url: str) -> Dict:
         """Extract job details from a LinkedIn job listing."""
-        job_details = {
-            'title': '',
-            'company': '',
-            'location': '',
-            'description': '',
-            'posted_date': '',
-            'job_type': '',
-            'salary': '',
-            'url': job_url,
-            'scraped_date': datetime.now().isoformat()
-        }
+        job_details = self._new_job_details(job_url)
         
         # Extract job title
         title_elem = soup.find('h1', class_='top-card-layout__title')
@@ -335,6 +644,14 @@ class LinkedInScraper(JobScraper):
         
         return job_details
     
+    def _extract_job_details_lxml(self, tree, job_url: str) -> Dict:
+        job_details = super()._extract_job_details_lxml(tree, job_url)
+        metadata = all_text(self.criteria_selector, tree)
+        if len(metadata) >= 2:
+            job_details['job_type'] = metadata[0]
+            job_details['posted_date'] = metadata[1]
+        return job_details
+    
     def _get_next_page_url(self, soup: BeautifulSoup) -> Optional[str]:
         """Find the URL for the next page of LinkedIn results."""
         next_link = soup.find('button', {'aria-label': 'Next'})
@@ -0,0 +1,75 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.utils.helpers import canonicalize_url
+from src.utils.sentiment_analyzer import CompanySentiment
+
+# Legal-form suffixes that don't distinguish one employer from another
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+                    'plc', 'gmbh', 'ag', 'sa', 'lp', 'llp'}
+
+def normalize_company(name: str) -> str:
+    """Canonical company name for grouping: case, punctuation and legal suffixes ignored."""
+    words = re.sub(r'[^\w\s]', ' ', (name or '').casefold()).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+class CompanySentimentIndex:
+    """
+    Analyzed postings grouped by normalized company name.
+
+    Each company keeps running totals (CompanySentiment), so a new posting
+    updates its company in O(1) and a company lookup never rescans postings.
+    Postings are keyed by canonical URL; seeing one again replaces its earlier
+    analysis rather than counting it twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._companies: Dict[str, CompanySentiment] = {}
+        self._names: Dict[str, str] = {}
+        # Posting key -> (normalized company, analysis), to retract on re-index
+        self._postings: Dict[str, Tuple[str, Dict]] = {}
+
+    def _posting_key(self, job: Dict) -> str:
+        url = job.get('url')
+        if url:
+            return canonicalize_url(url)
+        return f"{normalize_company(job.get('company', ''))}\0{job.get('title', '')}\0{job.get('description', '')}"
+
+    def add(self, job: Dict) -> None:
+        """Index a job that has a 'sentiment_analysis'; jobs without one are ignored."""
+        analysis = job.get('sentiment_analysis')
+        if not analysis:
+            return
+        company = normalize_company(job.get('company', ''))
+        key = self._posting_key(job)
+        with self._lock:
+            previous = self._postings.get(key)
+            if previous is not None:
+                self._companies[previous[0]].remove(previous[1])
+            self._postings[key] = (company, analysis)
+            self._companies.setdefault(company, CompanySentiment()).add(analysis)
+            self._names.setdefault(company, job.get('company', ''))
+
+    def update(self, jobs: Iterable[Dict]) -> None:
+        for job in jobs:
+            self.add(job)
+
+    def get(self, company_name: str) -> Optional[Dict]:
+        """The company's sentiment summary, or None if none of its postings are indexed."""
+        with self._lock:
+            company = self._companies.get(normalize_company(company_name))
+            return company.summary() if company is not None and company.count else None
+
+    def companies(self) -> List[str]:
+        """Indexed companies, by the name first seen for each."""
+        with self._lock:
+            return [self._names[key] for key, company in self._companies.items() if company.count]
+
+    def __contains__(self, company_name: str) -> bool:
+        return self.get(company_name) is not None
+
+    def __len__(self) -> int:
+        return len(self._postings)
@@ -0,0 +1,150 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CrawlFrontier:
+    """
+    SQLite-backed crawl checkpoint: the next listing page, job cards awaiting
+    detail pages, and completed job records.
+
+    Each listing page is checkpointed in one transaction together with its job
+    cards. Detail completions are buffered and written in batches, so a crash
+    loses at most batch_size detail fetches, which are redone on resume.
+    """
+
+    def __init__(self, path: str = "data/frontier.sqlite", batch_size: int = 25, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._completed: Dict[str, str] = {}
+        self.crawl_id: Optional[str] = None
+        self._positions = 0
+        # Wait for another process's checkpoint to commit instead of failing with "database is locked"
+        self._conn = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS crawls (
+                crawl_id TEXT PRIMARY KEY,
+                next_url TEXT,
+                pages_scraped INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                crawl_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                url TEXT,
+                data TEXT NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (crawl_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (crawl_id, url);
+            """
+        )
+        self._conn.commit()
+
+    def start(self, crawl_id: str, start_url: str,
+              resume: bool = False) -> Tuple[List[Dict], List[Dict], Optional[str], int]:
+        """
+        Begin a crawl, or pick up an interrupted one.
+
+        Args:
+            crawl_id (str): Stable identifier for the crawl, e.g. its start URL
+            start_url (str): First listing page for a fresh crawl
+            resume (bool): Continue from the last checkpoint if the crawl was left unfinished
+
+        Returns:
+            Tuple: (jobs so far in listing order, jobs still awaiting detail pages,
+            next listing page URL, listing pages already scraped)
+        """
+        self.crawl_id = crawl_id
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_url, pages_scraped, status FROM crawls WHERE crawl_id = ?", (crawl_id,)
+            ).fetchone()
+
+            if resume and row and row[2] == 'running':
+                next_url, pages_scraped = row[0], row[1]
+                rows = self._conn.execute(
+                    "SELECT data, status FROM jobs WHERE crawl_id = ? ORDER BY position", (crawl_id,)
+                ).fetchall()
+                jobs = [json.loads(data) for data, _ in rows]
+                pending = [job for job, (_, status) in zip(jobs, rows) if status == 'pending']
+                self._positions = len(jobs)
+                logger.info(
+                    f"Resuming crawl after {pages_scraped} pages: {len(jobs)} jobs checkpointed, "
+                    f"{len(pending)} awaiting details"
+                )
+                return jobs, pending, next_url, pages_scraped
+
+            if resume:
+                logger.info("No unfinished crawl to resume, starting fresh")
+            self._conn.execute("DELETE FROM jobs WHERE crawl_id = ?", (crawl_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawls (crawl_id, next_url, pages_scraped, status, updated_at) "
+                "VALUES (?, ?, 0, 'running', ?)",
+                (crawl_id, start_url, time.time())
+            )
+            self._conn.commit()
+            self._positions = 0
+            return [], [], start_url, 0
+
+    def checkpoint_page(self, jobs: List[Dict], pending: List[Dict], next_url: Optional[str]) -> None:
+        """Record a parsed listing page: its job cards, which still need details, and where to go next."""
+        pending_ids = {id(job) for job in pending}
+        rows = []
+        for job in jobs:
+            status = 'pending' if id(job) in pending_ids else 'done'
+            rows.append((self.crawl_id, self._positions, job.get('url'), json.dumps(job), status))
+            self._positions += 1
+
+        with self._lock:
+            self._flush()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs (crawl_id, position, url, data, status) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "UPDATE crawls SET next_url = ?, pages_scraped = pages_scraped + 1, updated_at = ? "
+                "WHERE crawl_id = ?",
+                (next_url, time.time(), self.crawl_id)
+            )
+            self._conn.commit()
+
+    def complete(self, job: Dict) -> None:
+        """Mark a job's detail fetch as done; written with the next batch."""
+        with self._lock:
+            self._completed[job['url']] = json.dumps(job)
+            if len(self._completed) >= self.batch_size:
+                self._flush()
+                self._conn.commit()
+
+    def _flush(self) -> None:
+        if not self._completed:
+            return
+        self._conn.executemany(
+            "UPDATE jobs SET data = ?, status = 'done' WHERE crawl_id = ? AND url = ?",
+            [(data, self.crawl_id, url) for url, data in self._completed.items()]
+        )
+        self._completed.clear()
+
+    def finish(self) -> None:
+        """Mark the crawl complete so a later --resume starts fresh."""
+        with self._lock:
+            self._flush()
+            self._conn.execute(
+                "UPDATE crawls SET status = 'done', updated_at = ? WHERE crawl_id = ?", (time.time(), self.crawl_id)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,178 @@
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Job fields whose most frequent values are tracked
+SKETCH_FIELDS = ('company', 'location', 'job_type')
+
+class SpaceSaving:
+    """
+    Approximate counts of the most frequent items in a stream (Space-Saving).
+
+    At most `capacity` items are tracked. When a new item arrives and the
+    summary is full, the least counted item is replaced and the newcomer
+    inherits its count as an overestimate, recorded as the newcomer's error.
+    Every tracked count is within [count - error, count] of the true count, no
+    count is overestimated by more than total / capacity, and every item more
+    frequent than that is tracked. Summaries of different streams can be
+    merged into a summary of their union with the same guarantees.
+
+    Args:
+        capacity (int): Items tracked; memory stays fixed at this many counters
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        # (count, item) entries; an entry whose count is stale is refreshed when it reaches the top
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, weight: int = 1) -> None:
+        self.total += weight
+        if item in self._counts:
+            self._counts[item] += weight
+            return
+        error = self._evict() if len(self._counts) >= self.capacity else 0
+        self._counts[item] = error + weight
+        self._errors[item] = error
+        heapq.heappush(self._heap, (error + weight, item))
+
+    def _evict(self) -> int:
+        """Drop the least counted item, returning its count."""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self._counts[item]
+            if current == count:
+                del self._counts[item]
+                del self._errors[item]
+                return count
+            heapq.heappush(self._heap, (current, item))
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def min_count(self) -> int:
+        """Upper bound on the true count of any item not tracked; 0 until the summary fills."""
+        return min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+
+    def count(self, item: str) -> Tuple[int, int]:
+        """Estimated count of an item and its maximum overestimate."""
+        if item in self._counts:
+            return self._counts[item], self._errors[item]
+        return self.min_count(), self.min_count()
+
+    def top(self, k: int = 10) -> List[Dict]:
+        """
+        The k items with the highest estimated counts.
+
+        Returns:
+            List[Dict]: item, count (estimate), error (maximum overestimate),
+            lower (count - error, a guaranteed lower bound) and guaranteed (True
+            when the item is certainly among the true top k)
+        """
+        ranked = sorted(self._counts.items(), key=lambda entry: (-entry[1], entry[0]))
+        # No item outside the first k can truly exceed the next estimate, or an untracked item's bound
+        runner_up = max(ranked[k][1] if len(ranked) > k else 0, self.min_count())
+        return [
+            {'item': item, 'count': count, 'error': self._errors[item], 'lower': count - self._errors[item],
+             'guaranteed': count - self._errors[item] >= runner_up}
+            for item, count in ranked[:k]
+        ]
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """A summary of both streams, keeping the larger capacity."""
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        merged.total = self.total + other.total
+        floor, other_floor = self.min_count(), other.min_count()
+        combined = {}
+        for item in self._counts.keys() | other._counts.keys():
+            count = self._counts.get(item, floor) + other._counts.get(item, other_floor)
+            error = self._errors.get(item, floor) + other._errors.get(item, other_floor)
+            combined[item] = (count, error)
+        kept = sorted(combined.items(), key=lambda entry: -entry[1][0])[:merged.capacity]
+        merged._set(kept)
+        return merged
+
+    def _set(self, entries: List[Tuple[str, Tuple[int, int]]]) -> None:
+        self._counts = {item: count for item, (count, _) in entries}
+        self._errors = {item: error for item, (_, error) in entries}
+        self._heap = [(count, item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def to_dict(self) -> Dict:
+        return {'capacity': self.capacity, 'total': self.total,
+                'counts': {item: [count, self._errors[item]] for item, count in self._counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SpaceSaving':
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        summary._set([(item, (count, error)) for item, (count, error) in data['counts'].items()])
+        return summary
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+class JobSketches:
+    """
+    Space-Saving summaries of the company, location and job type of a stream of
+    jobs, built in one pass with fixed memory and mergeable across runs and shards.
+
+    Args:
+        capacity (int): Values tracked per field
+        fields (Iterable[str]): Job fields summarized
+    """
+
+    def __init__(self, capacity: int = 1000, fields: Iterable[str] = SKETCH_FIELDS):
+        self.sketches = {field: SpaceSaving(capacity) for field in fields}
+
+    def add(self, job: Dict) -> None:
+        for field, sketch in self.sketches.items():
+            value = job.get(field)
+            if isinstance(value, str) and value.strip():
+                sketch.add(value.strip())
+
+    def update(self, jobs: Iterable[Dict]) -> int:
+        """Add every job from a stream; returns how many were read."""
+        count = 0
+        for job in jobs:
+            self.add(job)
+            count += 1
+        return count
+
+    def top(self, field: str, k: int = 10) -> List[Dict]:
+        """Top k values of a field with error bounds; see SpaceSaving.top."""
+        return self.sketches[field].top(k)
+
+    def merge(self, other: 'JobSketches') -> 'JobSketches':
+        merged = JobSketches(fields=())
+        for field in self.sketches.keys() | other.sketches.keys():
+            ours, theirs = self.sketches.get(field), other.sketches.get(field)
+            merged.sketches[field] = ours.merge(theirs) if ours is not None and theirs is not None \
+                else (ours if ours is not None else theirs)
+        return merged
+
+    def save(self, path: str = "data/job_sketches.json") -> None:
+        filepath = Path(path)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({field: sketch.to_dict() for field, sketch in self.sketches.items()}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str = "data/job_sketches.json") -> 'JobSketches':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        sketches = cls(fields=())
+        sketches.sketches = {field: SpaceSaving.from_dict(summary) for field, summary in data.items()}
+        return sketches
+
+    @classmethod
+    def merge_all(cls, sketches: Iterable['JobSketches']) -> Optional['JobSketches']:
+        merged = None
+        for sketch in sketches:
+            merged = sketch if merged is None else merged.merge(sketch)
+        return merged
@@ -1,12 +1,32 @@
+import csv
+import importlib
 import json
-import pandas as pd
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 import logging
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
+class LazyModule:
+    """Stand-in for a heavy module that imports it on first attribute access."""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+def lazy_import(name: str) -> LazyModule:
+    """Defer importing a module until it is used, keeping startup fast."""
+    return LazyModule(name)
+
+pd = lazy_import('pandas')
+
 def save_to_json(data: List[Dict], filename: str) -> None:
     """Save data to a JSON file."""
     try:
@@ -35,6 +55,75 @@ def save_to_csv(data: List[Dict], filename: str) -> None:
         logger.error(f"Error saving CSV file: {str(e)}")
         raise
 
+class JSONLSink:
+    """
+    Streaming JSON Lines writer: appends one record per line and flushes after
+    each, so readers can consume a file while it is still being written.
+    """
+    
+    def __init__(self, filename: str):
+        self.filepath = Path(filename)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.filepath, 'a', encoding='utf-8')
+        self.count = 0
+    
+    def write(self, record: Dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.count += 1
+    
+    def close(self) -> None:
+        self._file.close()
+        logger.info(f"Streamed {self.count} records to {self.filepath}")
+    
+    def __enter__(self) -> 'JSONLSink':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class CSVSink(JSONLSink):
+    """
+    Streaming CSV writer with the same interface as JSONLSink.
+    
+    Columns are fixed by `fieldnames`, or by the first record written; keys a
+    later record adds are dropped and missing ones left empty. Nested values
+    are written as JSON.
+    """
+    
+    def __init__(self, filename: str, fieldnames: Optional[List[str]] = None):
+        super().__init__(filename)
+        self.fieldnames = fieldnames
+        self._writer: Optional[csv.DictWriter] = None
+    
+    def write(self, record: Dict) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames or list(record),
+                                          restval='', extrasaction='ignore')
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+        self._writer.writerow({
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+        self._file.flush()
+        self.count += 1
+
+def open_sink(filename: str, output_format: str, fieldnames: Optional[List[str]] = None) -> JSONLSink:
+    """Open a streaming sink for 'jsonl' or 'csv' output."""
+    if output_format.lower() == 'jsonl':
+        return JSONLSink(filename)
+    elif output_format.lower() == 'csv':
+        return CSVSink(filename, fieldnames)
+    raise ValueError(f"Unsupported streaming format: {output_format}")
+
+def read_jsonl(filename: str) -> Iterator[Dict]:
+    """Read records back from a JSON Lines file one at a time."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
 def clean_text(text: str) -> str:
     """Clean and normalize text data."""
     if not isinstance(text, str):
@@ -43,4 +132,30 @@ def clean_text(text: str) -> str:
 
 def validate_url(url: str) -> bool:
     """Validate URL format."""
-    return url.startswith(('http://', 'https://')) 
\ No newline at end of file
+    return url.startswith(('http://', 'https://')) 
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings map to the same key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc[-3:]) == ('http', ':80') or (scheme, netloc[-4:]) == ('https', ':443'):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+# Query parameters that only track how a link was reached, not what it points to
+TRACKING_PARAMS = {
+    'from', 'vjs', 'tk', 'advn', 'adid', 'sjdu', 'refid', 'trackingid', 'trk', 'position', 'pagenum',
+    'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid',
+}
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL and strip tracking parameters so one posting has one URL."""
+    parts = urlsplit(normalize_url(url))
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme, parts.netloc, path, urlencode(query), ''))
@@ -0,0 +1,226 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from src.utils.helpers import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is served without revalidation, per URL class
+DEFAULT_TTLS = {
+    'listing': 15 * 60,
+    'detail': 24 * 60 * 60,
+}
+
+# Response headers worth keeping: enough to rebuild .text and revalidate
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+class CachedResponse:
+    """A response body and validators read back from the cache."""
+
+    def __init__(self, url: str, body: bytes, headers: Dict[str, str], stored_at: float):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.stored_at = stored_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a refetch into a cheap revalidation."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response so callers can't tell a hit from a fetch."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+class ResponseCache:
+    """
+    SQLite-backed HTTP response cache with per-class TTLs and size-bounded LRU eviction.
+
+    Reads don't write: access times are kept in memory and written in
+    batches of access_batch, before any eviction and on close.
+    """
+
+    def __init__(self, path: str = "data/http_cache.sqlite", ttls: Optional[Mapping[str, float]] = None,
+                 max_bytes: int = 256 * 1024 * 1024, access_batch: int = 256):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_bytes = max_bytes
+        self.access_batch = access_batch
+        self._lock = threading.Lock()
+        # Key -> last access time not yet written
+        self._pending_access: Dict[str, float] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def ttl_for(self, url_class: str) -> float:
+        return self.ttls.get(url_class, self.ttls['detail'])
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached entry for a URL, fresh or stale, or None."""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._pending_access[key] = time.time()
+            if len(self._pending_access) >= self.access_batch:
+                self._flush_access()
+                self._conn.commit()
+        return CachedResponse(row[0], row[2], json.loads(row[1]), row[3])
+
+    def _flush_access(self) -> None:
+        if self._pending_access:
+            self._conn.executemany("UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                                   ((accessed, key) for key, accessed in self._pending_access.items()))
+            self._pending_access.clear()
+
+    def flush(self) -> None:
+        """Write pending access times."""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+
+    def lookup(self, url: str, url_class: str = 'detail') -> Optional[CachedResponse]:
+        """
+        Find a cached response and record whether it can be served without a request.
+
+        Returns:
+            Optional[CachedResponse]: The entry, or None on a miss. Callers check
+            is_fresh() to decide between serving it and revalidating it.
+        """
+        entry = self.get(url)
+        if entry is not None and self.is_fresh(entry, url_class):
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def is_fresh(self, entry: CachedResponse, url_class: str) -> bool:
+        return entry.age() < self.ttl_for(url_class)
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> None:
+        """Store a successful response, evicting least recently used entries past max_bytes."""
+        cache_control = headers.get('Cache-Control', '') or ''
+        if 'no-store' in cache_control.lower():
+            return
+
+        kept_headers = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(kept_headers), body, len(body), now, now)
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._pending_access.pop(key, None)
+            self._evict()
+            self._conn.commit()
+
+    def mark_revalidated(self, entry: CachedResponse, headers: Mapping[str, str]) -> CachedResponse:
+        """Restart an entry's TTL after a 304 Not Modified, taking any updated validators."""
+        for name in STORED_HEADERS:
+            if headers.get(name):
+                entry.headers[name] = headers[name]
+        entry.stored_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+                (json.dumps(entry.headers), entry.stored_at, entry.stored_at, normalize_url(entry.url))
+            )
+            self._conn.commit()
+        self.revalidated += 1
+        return entry
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Evict down to 90% so a full cache doesn't evict on every store
+        target = self.max_bytes * 0.9
+        self._flush_access()
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'size_bytes': self._total_bytes,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f"Response cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['revalidated']} revalidated as unchanged), {stats['evictions']} evictions, "
+            f"{stats['size_bytes'] / (1024 * 1024):.1f} MiB"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
@@ -2,10 +2,12 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import json
+import math
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
 from datetime import datetime
+from src.utils.salary import parse_salaries
 
 # Configure logging
 logging.basicConfig(
@@ -35,7 +37,9 @@ class JobNotifier:
                 },
                 "keywords": [],
                 "locations": [],
-                "companies": []
+                "companies": [],
+                "min_salary": None,
+                "include_unknown_salary": True
             }
         
         with open(self.config_path, 'r') as f:
@@ -82,6 +86,32 @@ class JobNotifier:
         
         return False
     
+    def _meets_salary(self, jobs: List[Dict]) -> List[bool]:
+        """
+        Check each job against the configured minimum annual salary.
+        
+        A job passes if the top of its (annualized) salary range reaches
+        min_salary, read from its salary_max when it has one and parsed from
+        its salary otherwise. Jobs whose salary can't be parsed pass unless
+        include_unknown_salary is false.
+        """
+        min_salary = self.config.get('min_salary')
+        if not min_salary or not jobs:
+            return [True] * len(jobs)
+        
+        include_unknown = self.config.get('include_unknown_salary', True)
+        # Jobs annotated by add_salaries already carry salary_max; only the others are parsed
+        unparsed = [job.get('salary') for job in jobs if 'salary_max' not in job]
+        parsed = iter(parse_salaries(unparsed)['salary_max'] if unparsed else ())
+        meets = []
+        for job in jobs:
+            value = job['salary_max'] if 'salary_max' in job else next(parsed)
+            if value is None or value == '' or math.isnan(float(value)):
+                meets.append(include_unknown)
+            else:
+                meets.append(float(value) >= min_salary)
+        return meets
+    
     def _send_email(self, subject: str, body: str) -> None:
         """Send an email notification."""
         if not self.config['email']['enabled']:
@@ -114,6 +144,8 @@ class JobNotifier:
         """Check for new jobs that match the criteria and send notifications."""
         new_jobs = []
         
+        # Parse every salary in one pass rather than per job
+        jobs = [job for job, meets in zip(jobs, self._meets_salary(jobs)) if meets]
         for job in jobs:
             job_id = job.get('url', '')  # Use URL as unique identifier
             
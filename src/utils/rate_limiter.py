@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean the host wants us to slow down
+THROTTLE_STATUS_CODES = {403, 429}
+
+DEFAULT_LIMITS = {
+    'rate': 1.0,              # Initial requests per second
+    'min_rate': 0.05,         # Floor after repeated backoffs
+    'max_rate': 4.0,          # Ceiling while responses stay healthy
+    'rate_increase': 0.05,    # Additive increase per healthy response
+    'burst': 2,               # Token bucket capacity
+    'concurrency': 2,         # Initial requests in flight
+    'max_concurrency': 8,
+    'decrease_factor': 0.5,   # Multiplicative decrease on throttling
+    'backoff': 5.0,           # Host-wide pause after the first throttle, doubled per repeat
+    'max_backoff': 300.0,
+}
+
+# Per-site overrides, keyed by host
+SITE_LIMITS = {
+    'www.indeed.com': {
+        'rate': 0.5,
+        'max_rate': 2.0,
+        'concurrency': 2,
+        'max_concurrency': 6,
+    },
+    'www.linkedin.com': {
+        'rate': 0.3,
+        'max_rate': 1.0,
+        'burst': 1,
+        'concurrency': 1,
+        'max_concurrency': 3,
+    },
+}
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+class HostLimiter:
+    """Token bucket plus AIMD concurrency control for a single host."""
+
+    def __init__(self, host: str, limits: Optional[Mapping] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        config = dict(DEFAULT_LIMITS)
+        config.update(limits or {})
+        self.host = host
+        self.config = config
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        self.rate = float(config['rate'])
+        self.concurrency = float(config['concurrency'])
+        self.tokens = float(config['burst'])
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._backoff = float(config['backoff'])
+        self._last_refill = clock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        # Recent request latencies in seconds, for percentiles in stats()
+        self.latencies: deque = deque(maxlen=1024)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.tokens = min(float(self.config['burst']), self.tokens + elapsed * self.rate)
+
+    def try_acquire(self) -> float:
+        """
+        Try to take a request slot.
+
+        Returns:
+            float: 0 if the slot was taken, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.in_flight >= max(1, int(self.concurrency)):
+                # Wait roughly one request interval for a slot to free up
+                return 1.0 / self.rate
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            return 0.0
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait in the event loop until a request slot is available."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, status_code: Optional[int], retry_after: Optional[float] = None,
+                elapsed: Optional[float] = None) -> None:
+        """
+        Release a request slot and adapt limits to the outcome.
+
+        Args:
+            status_code (Optional[int]): HTTP status, or None if the request failed at the network level
+            retry_after (Optional[float]): Seconds requested by a Retry-After header
+            elapsed (Optional[float]): How long the request took, recorded for latency stats
+        """
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if elapsed is not None:
+                self.latencies.append(elapsed)
+            if status_code in THROTTLE_STATUS_CODES or retry_after is not None:
+                self._decrease(retry_after)
+            elif status_code is None:
+                self.errors += 1
+                self._decrease(None)
+            elif status_code < 400:
+                self._increase()
+
+    def release_response(self, status_code: int, headers: Mapping[str, str],
+                         elapsed: Optional[float] = None) -> None:
+        """Release a slot for a completed response, honouring Retry-After on error statuses."""
+        retry_after = parse_retry_after(headers.get('Retry-After')) if status_code >= 400 else None
+        self.release(status_code, retry_after, elapsed)
+
+    def _increase(self) -> None:
+        config = self.config
+        self.rate = min(float(config['max_rate']), self.rate + config['rate_increase'])
+        # One extra slot per window of healthy responses, as in TCP congestion avoidance
+        self.concurrency = min(float(config['max_concurrency']), self.concurrency + 1.0 / self.concurrency)
+        self._backoff = float(config['backoff'])
+
+    def _decrease(self, retry_after: Optional[float]) -> None:
+        config = self.config
+        self.throttled += 1
+        self.rate = max(float(config['min_rate']), self.rate * config['decrease_factor'])
+        self.concurrency = max(1.0, self.concurrency * config['decrease_factor'])
+        self.tokens = 0.0
+
+        pause = max(retry_after or 0.0, self._backoff)
+        self.blocked_until = max(self.blocked_until, self.clock() + pause)
+        self._backoff = min(float(config['max_backoff']), self._backoff * 2)
+        logger.warning(
+            f"Throttled by {self.host}, pausing {pause:.1f}s "
+            f"(rate now {self.rate:.2f} req/s, concurrency {int(self.concurrency)})"
+        )
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency percentile (0-100) over recent requests, in seconds."""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def stats(self) -> Dict:
+        """Current limits and counters for this host."""
+        p50 = self.latency_percentile(50)
+        p99 = self.latency_percentile(99)
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'concurrency': int(self.concurrency),
+                'in_flight': self.in_flight,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'latency_p50': round(p50, 4) if p50 is not None else None,
+                'latency_p99': round(p99, 4) if p99 is not None else None,
+            }
+
+class RateLimiter:
+    """Registry of per-host limiters shared by every scraper in the process."""
+
+    def __init__(self, site_limits: Optional[Mapping[str, Mapping]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.site_limits = {host: dict(limits) for host, limits in (site_limits or SITE_LIMITS).items()}
+        self.clock = clock
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure_host(self, host: str, **limits) -> None:
+        """Override limits for a host; applies to limiters created afterwards."""
+        with self._lock:
+            self.site_limits.setdefault(host, {}).update(limits)
+            self._hosts.pop(host, None)
+
+    def for_url(self, url: str) -> HostLimiter:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = HostLimiter(host, self.site_limits.get(host), clock=self.clock)
+                self._hosts[host] = limiter
+            return limiter
+
+    def acquire(self, url: str) -> HostLimiter:
+        limiter = self.for_url(url)
+        limiter.acquire()
+        return limiter
+
+    async def acquire_async(self, url: str) -> HostLimiter:
+        limiter = self.for_url(url)
+        await limiter.acquire_async()
+        return limiter
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: limiter.stats() for host, limiter in hosts.items()}
+
+    def log_stats(self) -> None:
+        for host, stats in self.stats().items():
+            logger.info(
+                f"Rate limiter {host}: {stats['rate']} req/s, concurrency {stats['concurrency']}, "
+                f"{stats['requests']} requests, {stats['throttled']} throttled, {stats['errors']} errors, "
+                f"latency p50 {stats['latency_p50']}s p99 {stats['latency_p99']}s"
+            )
+
+_shared_rate_limiter = RateLimiter()
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter so all scrapers share host state."""
+    return _shared_rate_limiter
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the look of the plots changes, so earlier renders aren't reused
+RENDER_VERSION = 1
+
+def _canonical(value):
+    """A JSON-serializable form of plot data, stable across runs."""
+    if hasattr(value, 'index') and hasattr(value, 'tolist'):
+        # pandas Series: keep the labels as well as the values
+        return {'index': _canonical(list(value.index)), 'values': _canonical(value.tolist())}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, 'item'):
+        # NumPy scalar
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+def render_key(render: Callable, args: Tuple, parameters: Optional[Dict] = None) -> str:
+    """
+    Hash of a plot's aggregated input together with how it is rendered: the
+    render function, its arguments, rendering parameters such as dpi, and
+    RENDER_VERSION.
+    """
+    payload = json.dumps(
+        [RENDER_VERSION, render.__qualname__, _canonical(args), _canonical(parameters or {})],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+class RenderCache:
+    """
+    Renders of each plot, keyed by a hash of the plot's input.
+
+    A plot whose input hasn't changed since one of its retained renders reuses
+    that file instead of being drawn again. manifest.json in the output
+    directory records, per plot, the current render, the retained renders,
+    cache hits and the render time they saved; <plot>_latest.png is kept
+    pointing at the current render. Each plot keeps its `keep` most recent
+    renders, and with max_age_days renders older than that are also removed;
+    the current render is never removed.
+
+    Args:
+        directory (str): Directory the plots are saved to
+        keep (int): Renders retained per plot
+        max_age_days (Optional[float]): Remove non-current renders older than this
+    """
+
+    def __init__(self, directory: str, keep: int = 3, max_age_days: Optional[float] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.directory / 'manifest.json'
+        self.keep = max(1, keep)
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.manifest = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {'plots': {}}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable render manifest {self.manifest_path}: {e}")
+            return {'plots': {}}
+        manifest.setdefault('plots', {})
+        return manifest
+
+    def _plot(self, plot: str) -> Dict:
+        return self.manifest['plots'].setdefault(
+            plot, {'current': None, 'latest': None, 'hits': 0, 'saved_seconds': 0.0, 'renders': []}
+        )
+
+    def lookup(self, plot: str, key: str) -> Optional[Path]:
+        """The retained render of `plot` for this key, made current, or None if it must be rendered."""
+        entry = self._plot(plot)
+        for render in entry['renders']:
+            path = self.directory / render['file']
+            if render['key'] == key and path.exists():
+                entry['hits'] += 1
+                entry['saved_seconds'] = round(entry['saved_seconds'] + render['render_seconds'], 3)
+                self.hits += 1
+                self.saved_seconds += render['render_seconds']
+                self._set_current(plot, entry, render)
+                return path
+        self.misses += 1
+        return None
+
+    def record(self, plot: str, key: str, path: Path, seconds: float) -> None:
+        """Record a new render of `plot` as its current one, and prune old renders."""
+        entry = self._plot(plot)
+        entry['renders'] = [render for render in entry['renders'] if render['key'] != key]
+        render = {'key': key, 'file': Path(path).name, 'created': time.time(), 'render_seconds': round(seconds, 3)}
+        entry['renders'].insert(0, render)
+        self._set_current(plot, entry, render)
+        self.prune(plot)
+
+    def _set_current(self, plot: str, entry: Dict, render: Dict) -> None:
+        entry['current'] = render['key']
+        entry['latest'] = render['file']
+        latest = self.directory / f"{plot}_latest.png"
+        if latest.is_symlink() or latest.exists():
+            latest.unlink()
+        try:
+            os.symlink(render['file'], latest)
+        except (OSError, NotImplementedError):
+            # No symlinks (e.g. Windows without privileges): keep a copy instead
+            shutil.copyfile(self.directory / render['file'], latest)
+
+    def prune(self, plot: str) -> List[str]:
+        """Drop renders of `plot` beyond the retention policy; returns the removed files."""
+        entry = self._plot(plot)
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days is not None else None
+        renders = sorted(entry['renders'], key=lambda render: render['created'], reverse=True)
+        kept, removed = [], []
+        for render in renders:
+            current = render['key'] == entry['current']
+            if current or (len(kept) < self.keep and (cutoff is None or render['created'] >= cutoff)):
+                kept.append(render)
+            else:
+                removed.append(render)
+
+        kept_files = {render['file'] for render in kept}
+        for render in removed:
+            if render['file'] not in kept_files:
+                (self.directory / render['file']).unlink(missing_ok=True)
+        entry['renders'] = kept
+        return [render['file'] for render in removed]
+
+    def save(self) -> None:
+        """Write the manifest, replacing the old one atomically."""
+        temporary = self.manifest_path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary, self.manifest_path)
+
+    def stats(self) -> Dict:
+        """This run's hits, misses and render seconds saved."""
+        return {'hits': self.hits, 'misses': self.misses, 'saved_seconds': round(self.saved_seconds, 3)}
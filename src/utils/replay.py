@@ -0,0 +1,271 @@
+import asyncio
+import base64
+import json
+import logging
+import random
+import threading
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+import requests
+from aiohttp import web
+from src.utils.helpers import normalize_url
+from src.utils.rate_limiter import RateLimiter, SITE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+# Hop-by-hop and encoding headers that no longer describe the decoded body we store
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+class ResponseArchive:
+    """
+    Recorded HTTP responses, one JSON object per line, keyed by normalized URL.
+
+    Bodies are stored decoded: as text when they are valid UTF-8, base64 otherwise.
+    """
+
+    def __init__(self, path: str = "data/replay/responses.jsonl"):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[normalize_url(entry['url'])] = entry
+
+    def add(self, url: str, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        """Record a response, replacing any earlier one for the same URL."""
+        entry = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+        }
+        try:
+            entry['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body_b64'] = base64.b64encode(body).decode('ascii')
+        with self._lock:
+            self._entries[normalize_url(url)] = entry
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(normalize_url(url))
+
+    @staticmethod
+    def body(entry: Dict) -> bytes:
+        if 'body_b64' in entry:
+            return base64.b64decode(entry['body_b64'])
+        return entry['body'].encode('utf-8')
+
+    def origins(self) -> Dict[str, str]:
+        """Map each recorded host to its scheme://host origin."""
+        with self._lock:
+            urls = [entry['url'] for entry in self._entries.values()]
+        origins = {}
+        for url in urls:
+            parts = urlsplit(url)
+            origins.setdefault(parts.netloc.lower(), f"{parts.scheme}://{parts.netloc.lower()}")
+        return origins
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            entries = list(self._entries.values())
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return self.get(url) is not None
+
+class Recorder:
+    """Capture every response a requests session receives into a ResponseArchive."""
+
+    def __init__(self, archive: ResponseArchive):
+        self.archive = archive
+        self.recorded = 0
+
+    def _hook(self, response: requests.Response, *args, **kwargs) -> None:
+        # Redirect hops arrive through the hook too, each under its own URL
+        self.archive.add(response.url, response.status_code, response.headers, response.content)
+        self.recorded += 1
+
+    def attach(self, session: requests.Session) -> None:
+        session.hooks['response'].append(self._hook)
+
+    def detach(self, session: requests.Session) -> None:
+        if self._hook in session.hooks['response']:
+            session.hooks['response'].remove(self._hook)
+
+class ReplayServer:
+    """
+    Local stand-in for the recorded sites, serving an archive over HTTP.
+
+    Each recorded host gets its own port on 127.0.0.1, and absolute links to any
+    recorded host are rewritten to the local stand-ins, so a scraper pointed at
+    url_for(start_url) crawls entirely offline. Latency, random server errors
+    and bursts of 403 responses can be injected to exercise retries and backoff.
+
+    Args:
+        archive (ResponseArchive): Responses to serve
+        latency (float): Seconds added to every response
+        jitter (float): Extra uniform random delay of up to this many seconds
+        error_rate (float): Share of requests answered with error_status
+        error_status (int): Status used for injected errors
+        throttle_every (int): Start a burst of 403s every this many requests (0 disables)
+        throttle_burst (int): Number of consecutive 403s in each burst
+        retry_after (Optional[int]): Retry-After seconds sent with each 403
+        seed (Optional[int]): Seed for latency jitter and error injection
+    """
+
+    def __init__(self, archive: ResponseArchive, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, throttle_every: int = 0,
+                 throttle_burst: int = 1, retry_after: Optional[int] = None, seed: Optional[int] = None):
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_every = throttle_every
+        self.throttle_burst = throttle_burst
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+
+        self.origins = archive.origins()
+        self.bases: Dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runners = []
+        self._ready = threading.Event()
+        # Raised by the server thread while starting, re-raised by start()
+        self._error: Optional[BaseException] = None
+
+        self.requests = 0
+        self.served = 0
+        self.errors = 0
+        self.throttled = 0
+        self.missing = 0
+
+    def _rewrite(self, text: str) -> str:
+        for host, origin in self.origins.items():
+            local = self.bases[host]
+            text = text.replace(origin, local).replace(f"http://{host}", local)
+        return text
+
+    def _fault(self) -> Optional[web.Response]:
+        """Decide whether this request gets an injected 403 or server error."""
+        count = self.requests
+        self.requests += 1
+        if self.throttle_every and count % self.throttle_every >= self.throttle_every - self.throttle_burst:
+            self.throttled += 1
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else None
+            return web.Response(status=403, text='Forbidden', headers=headers)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text='Service Unavailable')
+        return None
+
+    def _handler(self, host: str):
+        async def handle(request: web.Request) -> web.Response:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+
+            fault = self._fault()
+            if fault is not None:
+                return fault
+
+            entry = self.archive.get(self.origins[host] + request.path_qs)
+            if entry is None:
+                self.missing += 1
+                return web.Response(status=404, text='Not recorded')
+
+            self.served += 1
+            headers = dict(entry['headers'])
+            if 'Location' in headers:
+                headers['Location'] = self._rewrite(headers['Location'])
+            body = ResponseArchive.body(entry)
+            if 'body' in entry:
+                body = self._rewrite(entry['body']).encode('utf-8')
+                content_type = headers.get('Content-Type', 'text/html')
+                headers['Content-Type'] = content_type.split(';')[0] + '; charset=utf-8'
+            return web.Response(status=entry['status'], body=body, headers=headers)
+        return handle
+
+    async def _start_sites(self) -> None:
+        for host in self.origins:
+            app = web.Application()
+            app.router.add_route('GET', '/{tail:.*}', self._handler(host))
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            self.bases[host] = f"http://127.0.0.1:{port}"
+            self._runners.append(runner)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._start_sites())
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._ready.set()
+        if self._error is None:
+            self._loop.run_forever()
+        for runner in self._runners:
+            self._loop.run_until_complete(runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> Dict[str, str]:
+        """Start serving in a background thread; returns recorded host -> local base URL."""
+        self._thread = threading.Thread(target=self._run, name='replay-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._error
+        logger.info(f"Replay server serving {len(self.archive)} responses for {', '.join(self.bases)}")
+        return dict(self.bases)
+
+    def stop(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def url_for(self, url: str) -> str:
+        """Translate a recorded URL to the same path on its local stand-in."""
+        parts = urlsplit(url)
+        base = self.bases[parts.netloc.lower()]
+        return base + url[len(f"{parts.scheme}://{parts.netloc}"):]
+
+    def configure_rate_limiter(self, rate_limiter: RateLimiter, **overrides) -> None:
+        """Give each local stand-in its recorded site's limits, with any overrides applied."""
+        for host, base in self.bases.items():
+            limits = {**SITE_LIMITS.get(host, {}), **overrides}
+            rate_limiter.configure_host(urlsplit(base).netloc, **limits)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'requests': self.requests,
+            'served': self.served,
+            'errors': self.errors,
+            'throttled': self.throttled,
+            'missing': self.missing,
+        }
+
+    def __enter__(self) -> 'ReplayServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
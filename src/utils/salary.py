@@ -0,0 +1,119 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from src.utils.helpers import lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Numeric columns stored alongside each job's salary text; amounts are annual
+SALARY_COLUMNS = ('salary_min', 'salary_max', 'salary_mid', 'salary_currency', 'salary_period')
+
+# Pay periods and the number of them in a year
+PERIODS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+# Patterns are matched against lowercased text, which is faster than IGNORECASE
+
+# Amount, with an optional K/M suffix, optionally followed by the top of a range:
+# "$120,000 - $150,000", "50-60k", "£45K to £55K", "€1.2M"
+AMOUNT_PATTERN = re.compile(
+    r'(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_unit>[km])?\b'
+    r'(?:\s*(?:-|–|—|to)\s*[^\d\s]{0,3}\s*(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_unit>[km])?\b)?'
+)
+UNITS = {'k': 1e3, 'm': 1e6}
+
+CURRENCY_PATTERN = re.compile(r'([$£€¥₹])|\b(usd|eur|gbp|cad|aud|inr|chf|jpy)\b')
+CURRENCY_SYMBOLS = {'$': 'USD', '£': 'GBP', '€': 'EUR', '¥': 'JPY', '₹': 'INR'}
+
+PERIOD_PATTERN = re.compile(r'\b(hour|hr\b|day\b|daily|week|month|mo\b|year|annum|annual|yr\b)')
+PERIOD_WORDS = {'hour': 'hour', 'hr': 'hour', 'day': 'day', 'daily': 'day', 'week': 'week', 'month': 'month',
+                'mo': 'month', 'year': 'year', 'annum': 'year', 'annual': 'year', 'yr': 'year'}
+
+def _extract(pattern: re.Pattern, texts):
+    """Series.str.extract without its per-row overhead: the first match's groups, one row per text."""
+    empty = (None,) * pattern.groups
+    rows = [match.groups() if match else empty for match in map(pattern.search, texts)]
+    columns = list(pattern.groupindex) or list(range(pattern.groups))
+    return pd.DataFrame(rows, columns=columns, index=texts.index, dtype=object)
+
+def _amounts(numbers, units):
+    return pd.to_numeric(numbers.str.replace(',', '', regex=False), errors='coerce') * \
+        units.map(UNITS).fillna(1.0)
+
+def _parse_unique(texts):
+    """Parse distinct lowercased salary strings; see parse_salaries."""
+    amounts = _extract(AMOUNT_PATTERN, texts)
+    low = _amounts(amounts['low'], amounts['low_unit'])
+    high = _amounts(amounts['high'], amounts['high_unit'])
+
+    # "50-60k": a suffix on the top of the range applies to the bottom too
+    shared_unit = amounts['low_unit'].isna() & amounts['high_unit'].notna()
+    scaled = low * amounts['high_unit'].map(UNITS)
+    low = low.where(~(shared_unit & (scaled <= high)), scaled)
+    high = high.fillna(low)
+    low, high = np.fmin(low, high), np.fmax(low, high)
+
+    currency = _extract(CURRENCY_PATTERN, texts)
+    currency = currency[0].map(CURRENCY_SYMBOLS).fillna(currency[1].str.upper())
+    period = _extract(PERIOD_PATTERN, texts)[0].map(PERIOD_WORDS)
+    period = period.where(low.isna(), period.fillna('year'))
+    per_year = period.map(PERIODS)
+
+    return pd.DataFrame({
+        'salary_min': low * per_year,
+        'salary_max': high * per_year,
+        'salary_mid': (low + high) / 2 * per_year,
+        'salary_currency': currency.where(low.notna()),
+        'salary_period': period,
+    })
+
+def parse_salaries(salaries: Iterable[Optional[str]]):
+    """
+    Parse a column of salary strings into annual numeric columns.
+
+    Handles ranges ("$120,000 - $150,000", "50-60k"), K/M suffixes, currency
+    symbols and codes, and hourly, daily, weekly and monthly pay, which is
+    annualized (2080 hours, 260 days, 52 weeks, 12 months a year). Salaries
+    with no period are taken as annual. Currencies are identified, not
+    converted. Each distinct string is parsed once, with vectorized string
+    operations, so a large column of repeated values is cheap.
+
+    Args:
+        salaries (Iterable[Optional[str]]): Salary texts; empty or missing values parse to NaN
+
+    Returns:
+        pd.DataFrame: SALARY_COLUMNS, aligned with the input (keeping a Series' index)
+    """
+    texts = salaries if isinstance(salaries, pd.Series) else pd.Series(list(salaries), dtype=object)
+    codes, uniques = pd.factorize(texts.fillna('').astype(str))
+    parsed = _parse_unique(pd.Series([text.lower() for text in uniques], dtype=object)).take(codes)
+    parsed.index = texts.index
+    return parsed
+
+def _record(row: Dict) -> Dict:
+    """Plain Python values for a parsed row: floats rounded to cents, None for missing."""
+    return {
+        column: (None if pd.isna(value) else round(float(value), 2) if column in SALARY_COLUMNS[:3] else value)
+        for column, value in row.items()
+    }
+
+@lru_cache(maxsize=4096)
+def _parse_one(salary: Optional[str]) -> Tuple:
+    row = _record(parse_salaries([salary]).iloc[0].to_dict())
+    return tuple(row[column] for column in SALARY_COLUMNS)
+
+def parse_salary(salary: Optional[str]) -> Dict:
+    """Parse one salary string; see parse_salaries. Missing values are None. Recent strings are cached."""
+    return dict(zip(SALARY_COLUMNS, _parse_one(salary)))
+
+def add_salaries(jobs: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Add the parsed SALARY_COLUMNS to each job from a stream, passing it on
+    straight away so streaming consumers never wait for a batch to fill.
+
+    Args:
+        jobs (Iterable[Dict]): Jobs with a 'salary' text, e.g. from iter_job_listings
+    """
+    for job in jobs:
+        job.update(parse_salary(job.get('salary')))
+        yield job
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Words of description analyzed per posting when a budget is set
+DEFAULT_TOKEN_BUDGET = 512
+
+# Sentence ends, including list items run together by text extraction ("services.Responsibility 1")
+SECTION_BREAK = re.compile(r'(?<=[.!?])\s+|(?<=[a-z0-9][.!?])(?=[A-Z])|\n+')
+
+def split_sections(text: str) -> List[str]:
+    """Split a description into sentences and list items."""
+    return [section.strip() for section in SECTION_BREAK.split(text) if section.strip()]
+
+def fingerprint(section: str) -> str:
+    """Fingerprint of a section that ignores case, punctuation, numbers and spacing."""
+    normalized = ' '.join(re.sub(r'[^a-z]+', ' ', section.lower()).split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+class SectionFilter:
+    """
+    Cut a description down to the sections worth scoring.
+
+    Sections whose fingerprint is known boilerplate (EEO statements, legal
+    notices, "apply now" footers) are dropped, and the rest are kept in order
+    until the token budget is spent; the section that crosses the budget is
+    truncated.
+
+    Args:
+        fingerprints (Iterable[str]): Fingerprints of boilerplate sections
+        max_tokens (Optional[int]): Words kept per description; None keeps everything
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = (), max_tokens: Optional[int] = DEFAULT_TOKEN_BUDGET):
+        self.fingerprints: Set[str] = set(fingerprints)
+        self.max_tokens = max_tokens
+
+    def sections(self, description: str) -> List[str]:
+        kept = []
+        budget = self.max_tokens
+        for section in split_sections(description):
+            if fingerprint(section) in self.fingerprints:
+                continue
+            if budget is not None:
+                words = section.split()
+                if len(words) >= budget:
+                    if budget:
+                        kept.append(' '.join(words[:budget]))
+                    break
+                budget -= len(words)
+            kept.append(section)
+        return kept
+
+    def signature(self) -> str:
+        """Identifies the filter's settings, so results computed under other settings aren't reused."""
+        digest = hashlib.blake2b(''.join(sorted(self.fingerprints)).encode('ascii'), digest_size=8).hexdigest()
+        return f"{self.max_tokens}/{digest}"
+
+    @classmethod
+    def learn(cls, descriptions: Iterable[str], min_share: float = 0.05, min_documents: int = 5,
+              **kwargs) -> 'SectionFilter':
+        """
+        Learn boilerplate from a corpus: a section is boilerplate if it appears
+        in at least min_documents descriptions and at least min_share of them.
+
+        Args:
+            descriptions (Iterable[str]): Stored job descriptions
+            min_share (float): Share of descriptions a section must appear in
+            min_documents (int): Fewest descriptions a section must appear in
+            **kwargs: Passed to SectionFilter, e.g. max_tokens
+        """
+        counts: Counter = Counter()
+        documents = 0
+        for description in descriptions:
+            if not isinstance(description, str):
+                continue
+            documents += 1
+            counts.update({fingerprint(section) for section in split_sections(description)})
+
+        threshold = max(min_documents, min_share * documents)
+        fingerprints = {key for key, count in counts.items() if count >= threshold}
+        logger.info(f"Learned {len(fingerprints)} boilerplate sections from {documents} descriptions")
+        return cls(fingerprints, **kwargs)
+
+    def save(self, path: str = "data/boilerplate.json") -> None:
+        filepath = Path(path)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'max_tokens': self.max_tokens, 'fingerprints': sorted(self.fingerprints)}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = "data/boilerplate.json", **overrides) -> 'SectionFilter':
+        """Load a saved filter; keyword arguments, e.g. max_tokens, override the saved settings."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        options = {'max_tokens': data.get('max_tokens', DEFAULT_TOKEN_BUDGET), **overrides}
+        return cls(data.get('fingerprints', []), **options)
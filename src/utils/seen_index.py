@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from src.utils.helpers import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+def url_key(url: str) -> int:
+    """64-bit key for a canonical job URL, stored as a signed SQLite integer."""
+    digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class SeenIndex:
+    """
+    Persistent index of job URLs whose detail pages have already been fetched.
+
+    Each entry is a 64-bit hash of the canonical URL plus the fetch time, held in
+    an integer-keyed SQLite table, so lookups stay a single B-tree probe and the
+    file stays around 20 bytes per posting at millions of URLs.
+    """
+
+    def __init__(self, path: str = "data/seen_urls.sqlite", refresh_after: Optional[float] = None,
+                 batch_size: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh_after = refresh_after
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY, fetched_at INTEGER NOT NULL)")
+        self._conn.commit()
+
+        self.skipped = 0
+        self.due_count = 0
+
+    def _fetched_at(self, keys: List[int]) -> Dict[int, int]:
+        found = {key: self._pending[key] for key in keys if key in self._pending}
+        remaining = [key for key in keys if key not in found]
+        for start in range(0, len(remaining), _LOOKUP_CHUNK):
+            chunk = remaining[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, fetched_at FROM seen WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def due(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Select the URLs whose detail pages should be fetched.
+
+        Args:
+            urls (Iterable[str]): Job URLs from a listing page
+
+        Returns:
+            Set[str]: URLs never fetched before, or fetched longer than refresh_after seconds ago
+        """
+        urls = list(urls)
+        keys = [url_key(url) for url in urls]
+        with self._lock:
+            fetched = self._fetched_at(keys)
+
+        cutoff = time.time() - self.refresh_after if self.refresh_after is not None else None
+        due = set()
+        for url, key in zip(urls, keys):
+            fetched_at = fetched.get(key)
+            if fetched_at is None or (cutoff is not None and fetched_at < cutoff):
+                due.add(url)
+
+        self.due_count += len(due)
+        self.skipped += len(urls) - len(due)
+        return due
+
+    def mark_fetched(self, url: str, fetched_at: Optional[float] = None) -> None:
+        """Record a fetched detail page; writes are batched."""
+        with self._lock:
+            self._pending[url_key(url)] = int(fetched_at if fetched_at is not None else time.time())
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO seen (key, fetched_at) VALUES (?, ?)", self._pending.items()
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def log_stats(self) -> None:
+        logger.info(f"Seen index: {self.due_count} detail pages due, {self.skipped} skipped as already known")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
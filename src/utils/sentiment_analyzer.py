@@ -1,125 +1,532 @@
+import copy
 import logging
-from typing import Dict, List
-from textblob import TextBlob
-import spacy
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+import os
+import threading
+import warnings
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from src.utils.sections import SectionFilter
+from src.utils.sentiment_cache import SentimentCache
 
-# Download required NLTK data
-nltk.download('vader_lexicon')
-nltk.download('punkt')
+logger = logging.getLogger(__name__)
 
-# Load spaCy model
-nlp = spacy.load('en_core_web_sm')
+SPACY_MODEL = 'en_core_web_sm'
 
-class SentimentAnalyzer:
+# NLTK resources the analyzer reads, as nltk.data paths. They are looked up
+# locally and never downloaded implicitly.
+NLTK_RESOURCES = {
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+# Engine selections by name, for bulk runs that don't need every engine
+PROFILES = {
+    'full': ('textblob', 'vader', 'spacy'),
+    'fast': ('vader',),
+}
+
+# Backends used when none are requested, e.g. SENTIMENT_BACKENDS=fast
+DEFAULT_BACKENDS = os.environ.get('SENTIMENT_BACKENDS', 'full')
+
+_models: Dict[object, object] = {}
+_models_lock = threading.Lock()
+
+def check_nltk_resources() -> List[str]:
+    """Return the names of required NLTK resources missing from the local nltk_data paths."""
+    import nltk
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+def get_vader():
+    """Return the shared VADER analyzer, loading the lexicon on first use."""
+    with _models_lock:
+        if 'vader' not in _models:
+            missing = check_nltk_resources()
+            if missing:
+                raise LookupError(
+                    f"Missing NLTK resources: {', '.join(missing)}. "
+                    f"Install them with: python -m nltk.downloader {' '.join(missing)}"
+                )
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            _models['vader'] = SentimentIntensityAnalyzer()
+        return _models['vader']
+
+def _spacy_components(model: str) -> List[str]:
+    """Names of every pipeline component a packaged spaCy model ships with."""
+    import spacy
+    if not spacy.util.is_package(model):
+        return []  # Not installed: spacy.load reports it
+    path = spacy.util.get_package_path(model)
+    meta = spacy.util.get_model_meta(path)
+    return list(meta.get('components') or meta.get('pipeline') or [])
+
+def get_nlp(components: Iterable[str] = ()):
+    """
+    Return a shared spaCy pipeline with only the given components, loading it on first use.
+    
+    Everything else in the model (tagger, parser, NER, ...) is excluded at load
+    time, so it is neither deserialized nor run. With no components the
+    pipeline is just the tokenizer and vocabulary.
+    """
+    key = ('spacy', tuple(sorted(components)))
+    with _models_lock:
+        if key not in _models:
+            import spacy
+            exclude = [name for name in _spacy_components(SPACY_MODEL) if name not in key[1]]
+            _models[key] = spacy.load(SPACY_MODEL, exclude=exclude)
+        return _models[key]
+
+def get_textblob():
+    """Return the TextBlob class, importing textblob on first use."""
+    with _models_lock:
+        if 'textblob' not in _models:
+            from textblob import TextBlob
+            _models['textblob'] = TextBlob
+        return _models['textblob']
+
+# Registered engines by name
+BACKENDS: Dict[str, Type['SentimentBackend']] = {}
+
+def register_backend(backend: Type['SentimentBackend']) -> Type['SentimentBackend']:
+    """Make a backend selectable by name; usable as a class decorator."""
+    BACKENDS[backend.name] = backend
+    return backend
+
+class SentimentBackend:
+    """
+    One sentiment engine. Subclasses set `name` and the neutral values of the
+    result fields they add, and implement load(), score() and value().
+    """
+    name = ''
+    neutral: Dict = {}
+    
+    def load(self) -> None:
+        """Load the engine's model; called before the first score()."""
+    
+    def score(self, text: str) -> Dict:
+        """Score one text, returning this engine's result fields."""
+        raise NotImplementedError
+    
+    def score_many(self, texts: List[str]) -> List[Dict]:
+        """Score a batch of texts; engines with a bulk path override this."""
+        return [self.score(text) for text in texts]
+    
+    def value(self, fields: Dict) -> float:
+        """This engine's score in [-1, 1], read back from its result fields."""
+        raise NotImplementedError
+    
+    def version(self) -> str:
+        """Library and model versions behind this engine's scores; a change invalidates cached results."""
+        return ''
+
+@register_backend
+class TextBlobBackend(SentimentBackend):
+    name = 'textblob'
+    neutral = {'textblob_score': 0}
+    
+    def load(self) -> None:
+        self.TextBlob = get_textblob()
+    
+    def score(self, text: str) -> Dict:
+        return {'textblob_score': self.TextBlob(text).sentiment.polarity}
+    
+    def value(self, fields: Dict) -> float:
+        return fields['textblob_score']
+    
+    def version(self) -> str:
+        import textblob
+        return textblob.__version__
+
+@register_backend
+class VaderBackend(SentimentBackend):
+    name = 'vader'
+    neutral = {'vader_scores': {'neg': 0, 'neu': 0, 'pos': 0, 'compound': 0}}
+    
+    def load(self) -> None:
+        from src.utils.vader_batch import BatchVader
+        self.sia = get_vader()
+        self.batch = BatchVader(self.sia)
+    
+    def score(self, text: str) -> Dict:
+        return {'vader_scores': self.sia.polarity_scores(text)}
+    
+    def score_many(self, texts: List[str]) -> List[Dict]:
+        # Vectorized over the whole batch; matches polarity_scores (see vader_batch)
+        return [{'vader_scores': scores} for scores in self.batch.polarity_scores_many(texts)]
+    
+    def value(self, fields: Dict) -> float:
+        return fields['vader_scores']['compound']
+    
+    def version(self) -> str:
+        import nltk
+        return nltk.__version__
+
+@register_backend
+class SpacyBackend(SentimentBackend):
+    """
+    Average of token.sentiment. It is a lexical attribute, so the tokenizer is
+    the only component needed; en_core_web_sm leaves it at 0.
+    """
+    name = 'spacy'
+    neutral = {'spacy_score': 0}
+    components = ()
+    
+    def load(self) -> None:
+        self.nlp = get_nlp(self.components)
+    
+    def score(self, text: str) -> Dict:
+        return self.score_doc(self.nlp(text))
+    
+    def score_many(self, texts: List[str]) -> List[Dict]:
+        return [self.score_doc(doc) for doc in self.nlp.pipe(texts, batch_size=max(1, len(texts)))]
+    
+    def score_doc(self, doc) -> Dict:
+        return {'spacy_score': sum([token.sentiment for token in doc]) / len(doc) if len(doc) > 0 else 0}
+    
+    def value(self, fields: Dict) -> float:
+        return fields['spacy_score']
+    
+    def version(self) -> str:
+        import spacy
+        return f"{spacy.__version__}/{self.nlp.meta['name']}-{self.nlp.meta['version']}/{','.join(self.nlp.pipe_names)}"
+
+def resolve_backends(spec: Union[str, Iterable[str], None] = None) -> Tuple[str, ...]:
+    """
+    Turn a profile name, comma-separated engine list or sequence of engine
+    names into engine names, e.g. 'fast', 'vader,textblob' or ['spacy'].
+    """
+    if spec is None:
+        spec = DEFAULT_BACKENDS
+    if isinstance(spec, str):
+        spec = PROFILES.get(spec, [name.strip() for name in spec.split(',') if name.strip()])
+    names = tuple(dict.fromkeys(spec))
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown or not names:
+        raise ValueError(
+            f"Unknown sentiment backends: {', '.join(unknown) or '(none)'}; "
+            f"choose from {', '.join(BACKENDS)} or a profile: {', '.join(PROFILES)}"
+        )
+    return names
+
+def weighted_mean(items: List[Dict], weights: List[float]) -> Dict:
+    """Weighted average of result fields, field by field, including nested score dicts."""
+    total = sum(weights)
+    combined = {}
+    for field, value in items[0].items():
+        if isinstance(value, dict):
+            combined[field] = weighted_mean([item[field] for item in items], weights)
+        else:
+            combined[field] = sum(item[field] * weight for item, weight in zip(items, weights)) / total
+    return combined
+
+def sentiment_label(score: float) -> str:
+    """Label a score in [-1, 1]: positive above 0.1, negative below -0.1, neutral otherwise."""
+    if score > 0.1:
+        return 'positive'
+    elif score < -0.1:
+        return 'negative'
+    else:
+        return 'neutral'
+
+def result_score(result: Dict) -> float:
+    """
+    Average engine score of an analysis result, over the engines whose fields
+    it contains, so results from any backend selection can be aggregated.
+    """
+    scores = [backend().value(result) for backend in BACKENDS.values()
+              if all(field in result for field in backend.neutral)]
+    return sum(scores) / len(scores) if scores else 0.0
+
+class CompanySentiment:
+    """
+    Running sentiment totals for one company's postings.
+    
+    Adding or removing a posting's analysis updates the count, score sum and
+    label distribution in place, so the summary never rescans the postings.
+    """
+    
     def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+        self.count = 0
+        self.score_sum = 0.0
+        self.distribution = {'positive': 0, 'neutral': 0, 'negative': 0}
+    
+    def add(self, result: Dict) -> None:
+        self._update(result, 1)
+    
+    def remove(self, result: Dict) -> None:
+        self._update(result, -1)
+    
+    def _update(self, result: Dict, sign: int) -> None:
+        label = result.get('overall_sentiment')
+        self.count += sign
+        self.score_sum += sign * result_score(result)
+        self.distribution[label if label in self.distribution else 'neutral'] += sign
+    
+    def summary(self) -> Dict:
+        """The company-level analysis, as returned by SentimentAnalyzer.analyze_company_sentiment."""
+        return {
+            'average_sentiment': sentiment_label(self.score_sum / self.count) if self.count else 'neutral',
+            'total_postings': self.count,
+            'sentiment_distribution': dict(self.distribution)
+        }
+
+class SentimentAnalyzer:
+    def __init__(self, backends: Union[str, Iterable[str], None] = None, prewarm: bool = False,
+                 cache: Optional[SentimentCache] = None, workers: int = 1,
+                 sections: Optional[SectionFilter] = None):
+        """
+        Args:
+            backends: Engines to run: a profile ('full', 'fast'), a comma-separated
+                list or a sequence of names; defaults to $SENTIMENT_BACKENDS or 'full'
+            prewarm (bool): Load the models now instead of on first use
+            cache (Optional[SentimentCache]): Reuse results for descriptions already scored
+                by the same engines and model versions
+            workers (int): With more than one, analyze_many scores on a pool of this
+                many processes, started by prewarm() once the models are loaded
+            sections (Optional[SectionFilter]): Score only each description's non-boilerplate
+                sections, up to its token budget, and combine the section scores
+        """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        self.backend_names = resolve_backends(backends)
+        self.backends = [BACKENDS[name]() for name in self.backend_names]
+        self._loaded = False
+        self.cache = cache
+        self.fingerprint = ''
+        self.workers = workers
+        self.pool = None
+        self.sections = sections
+        if prewarm:
+            self.prewarm()
+
+    @property
+    def sia(self):
+        return get_vader()
+
+    def prewarm(self) -> None:
+        """
+        Load every enabled engine's model now, e.g. before a timed run, then
+        start the worker pool if there is one. Call it before starting other
+        threads so workers are forked from a quiet process.
+        """
+        self._load_models()
+        if self.workers > 1 and self.pool is None:
+            from src.utils.sentiment_pool import SentimentPool
+            self.pool = SentimentPool(self, self.workers)
+
+    def _load_models(self) -> None:
+        if not self._loaded:
+            for backend in self.backends:
+                backend.load()
+            self.fingerprint = ';'.join(f"{backend.name}={backend.version()}" for backend in self.backends)
+            if self.sections is not None:
+                self.fingerprint += f";sections={self.sections.signature()}"
+            if self.cache is not None:
+                self.cache.invalidate(self._cache_group, self.fingerprint)
+            self._loaded = True
+
+    @property
+    def _cache_group(self) -> str:
+        return ','.join(self.backend_names) + ('+sections' if self.sections is not None else '')
+
+    def _cached(self, description) -> Tuple[Optional[bytes], Optional[Dict]]:
+        """Cache key and stored result for a description; (None, None) when it can't be cached."""
+        if self.cache is None or not isinstance(description, str):
+            return None, None
+        key = SentimentCache.key(description, self.fingerprint)
+        return key, self.cache.get(key)
+
+    def _store(self, key: Optional[bytes], result: Dict) -> Dict:
+        if key is not None:
+            self.cache.put(key, self._cache_group, self.fingerprint, result)
+        return result
 
     def analyze_job_description(self, description: str) -> Dict:
         """
-        Analyze the sentiment of a job description using multiple methods.
+        Analyze the sentiment of a job description with each enabled engine.
         
         Args:
             description (str): The job description text to analyze
             
         Returns:
-            Dict: Dictionary containing sentiment scores from different methods
+            Dict: Dictionary containing sentiment scores from the enabled engines
         """
-        try:
-            # TextBlob analysis
-            blob = TextBlob(description)
-            textblob_sentiment = blob.sentiment.polarity
-            
-            # NLTK VADER analysis
-            vader_scores = self.sia.polarity_scores(description)
-            
-            # spaCy analysis
-            doc = nlp(description)
-            spacy_sentiment = sum([token.sentiment for token in doc]) / len(doc) if len(doc) > 0 else 0
+        # Load outside the try block so missing models surface instead of reading as neutral
+        self.prewarm()
+        if self.sections is not None:
+            return next(self.analyze_many([description]))
+        key, cached = self._cached(description)
+        if cached is not None:
+            return cached
+        fields = self._score_text(description)
+        return self._neutral_result() if fields is None else self._store(key, self._build_result(fields))
+
+    def analyze_many(self, descriptions: Iterable[str], batch_size: int = 256,
+                     n_process: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Analyze many job descriptions, a batch at a time.
+        
+        Each engine scores a whole batch in one call (VADER vectorized over the
+        batch, spaCy through nlp.pipe) instead of one model call per document.
+        Each result is identical to analyze_job_description's. Cached
+        descriptions are answered from the cache and skip every engine.
+        
+        Args:
+            descriptions (Iterable[str]): Job descriptions, consumed lazily
+            batch_size (int): Descriptions scored together
+            n_process (Optional[int]): Deprecated and ignored; parallel scoring is set
+                with the analyzer's workers
             
-            return {
-                'textblob_score': textblob_sentiment,
-                'vader_scores': vader_scores,
-                'spacy_score': spacy_sentiment,
-                'overall_sentiment': self._calculate_overall_sentiment(
-                    textblob_sentiment,
-                    vader_scores['compound'],
-                    spacy_sentiment
-                )
-            }
+        Returns:
+            Iterator[Dict]: One result per description, in input order
+        """
+        if n_process is not None:
+            warnings.warn("analyze_many's n_process is ignored; pass workers to SentimentAnalyzer instead",
+                          DeprecationWarning, stacklevel=2)
+        return self._analyze_many(descriptions, batch_size)
+
+    def _analyze_many(self, descriptions: Iterable[str], batch_size: int) -> Iterator[Dict]:
+        self.prewarm()
+        if self.pool is not None:
+            yield from self.pool.analyze_many(descriptions)
+            return
+        
+        items = iter(descriptions)
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return
+            entries = [self._cached(description) for description in batch]
+            scored = iter(self._score_descriptions([description for description, (_, cached) in zip(batch, entries)
+                                                    if cached is None]))
+            for key, cached in entries:
+                if cached is not None:
+                    yield cached
+                    continue
+                fields = next(scored)
+                yield self._neutral_result() if fields is None else self._store(key, self._build_result(fields))
+
+    def _score_descriptions(self, descriptions: List[str]) -> List[Optional[Dict]]:
+        """
+        Every engine's fields for each description, or None where scoring failed.
+        
+        With a section filter, all kept sections of the batch are scored
+        together and each description gets the average of its sections'
+        fields, weighted by their length in words.
+        """
+        if self.sections is None:
+            return self._score_texts(descriptions)
+        
+        parts = []
+        for description in descriptions:
+            if isinstance(description, str):
+                # An all-boilerplate description scores as empty text
+                parts.append(self.sections.sections(description) or [''])
+            else:
+                self.logger.error(f"Error analyzing sentiment: expected a string, got {type(description).__name__}")
+                parts.append([])
+        scored = iter(self._score_texts([section for sections in parts for section in sections]))
+        
+        results = []
+        for sections in parts:
+            section_fields = [next(scored) for _ in sections]
+            if not sections or any(fields is None for fields in section_fields):
+                results.append(None)
+            elif len(sections) == 1:
+                results.append(section_fields[0])
+            else:
+                weights = [len(section.split()) or 1 for section in sections]
+                results.append(weighted_mean(section_fields, weights))
+        return results
+
+    def _score_texts(self, texts: List[str]) -> List[Optional[Dict]]:
+        fields = [{} for _ in texts]
+        try:
+            for backend in self.backends:
+                for item, backend_fields in zip(fields, backend.score_many(texts)):
+                    item.update(backend_fields)
+            return fields
+        except Exception:
+            # Rescore one at a time so only the failing texts fall back to neutral
+            return [self._score_text(text) for text in texts]
+
+    def _score_text(self, text: str) -> Optional[Dict]:
+        try:
+            fields = {}
+            for backend in self.backends:
+                fields.update(backend.score(text))
+            return fields
         except Exception as e:
             self.logger.error(f"Error analyzing sentiment: {str(e)}")
-            return {
-                'textblob_score': 0,
-                'vader_scores': {'neg': 0, 'neu': 0, 'pos': 0, 'compound': 0},
-                'spacy_score': 0,
-                'overall_sentiment': 'neutral'
-            }
+            return None
+
+    def close(self) -> None:
+        """Stop the worker pool, if any, logging each worker's throughput."""
+        if self.pool is not None:
+            self.pool.log_stats()
+            self.pool.close()
+            self.pool = None
+
+    def _scores(self, result: Dict) -> Dict[str, float]:
+        return {backend.name: backend.value(result) for backend in self.backends}
+
+    def _build_result(self, fields: Dict) -> Dict:
+        result = dict(fields)
+        result['overall_sentiment'] = self._calculate_overall_sentiment(self._scores(fields))
+        return result
+
+    def _neutral_result(self) -> Dict:
+        result = {}
+        for backend in self.backends:
+            result.update(copy.deepcopy(backend.neutral))
+        result['overall_sentiment'] = 'neutral'
+        return result
 
     def analyze_company_sentiment(self, job_postings: List[Dict]) -> Dict:
         """
         Analyze sentiment across all job postings for a company.
         
+        Postings that already carry a 'sentiment_analysis' are aggregated as
+        they are; only the rest are analyzed.
+        
         Args:
             job_postings (List[Dict]): List of job postings for a company
             
         Returns:
             Dict: Dictionary containing company-level sentiment analysis
         """
-        if not job_postings:
-            return {
-                'average_sentiment': 'neutral',
-                'total_postings': 0,
-                'sentiment_distribution': {'positive': 0, 'neutral': 0, 'negative': 0}
-            }
-
-        total_sentiment = 0
-        sentiment_distribution = {'positive': 0, 'neutral': 0, 'negative': 0}
-        
+        company = CompanySentiment()
+        pending = []
         for posting in job_postings:
-            description = posting.get('description', '')
-            sentiment = self.analyze_job_description(description)
-            
-            # Update sentiment distribution
-            if sentiment['overall_sentiment'] == 'positive':
-                sentiment_distribution['positive'] += 1
-            elif sentiment['overall_sentiment'] == 'negative':
-                sentiment_distribution['negative'] += 1
+            if posting.get('sentiment_analysis'):
+                company.add(posting['sentiment_analysis'])
             else:
-                sentiment_distribution['neutral'] += 1
-            
-            # Calculate average sentiment
-            total_sentiment += (
-                sentiment['textblob_score'] +
-                sentiment['vader_scores']['compound'] +
-                sentiment['spacy_score']
-            ) / 3
-
-        average_sentiment = total_sentiment / len(job_postings)
+                pending.append(posting.get('description', ''))
         
-        return {
-            'average_sentiment': self._get_sentiment_label(average_sentiment),
-            'total_postings': len(job_postings),
-            'sentiment_distribution': sentiment_distribution
-        }
+        if pending:
+            for sentiment in self.analyze_many(pending):
+                company.add(sentiment)
+        
+        return company.summary()
 
-    def _calculate_overall_sentiment(self, textblob_score: float, vader_score: float, spacy_score: float) -> str:
+    def _calculate_overall_sentiment(self, scores: Dict[str, float]) -> str:
         """
-        Calculate overall sentiment based on multiple analysis methods.
+        Calculate overall sentiment based on the enabled analysis methods.
         
         Args:
-            textblob_score (float): TextBlob sentiment score
-            vader_score (float): VADER sentiment score
-            spacy_score (float): spaCy sentiment score
+            scores (Dict[str, float]): Score from each enabled engine, by engine name
             
         Returns:
             str: Overall sentiment label ('positive', 'negative', or 'neutral')
         """
-        average_score = (textblob_score + vader_score + spacy_score) / 3
-        return self._get_sentiment_label(average_score)
+        return self._get_sentiment_label(self._average(scores))
+
+    def _average(self, scores: Dict[str, float]) -> float:
+        return sum(scores.values()) / len(scores)
 
     def _get_sentiment_label(self, score: float) -> str:
         """
@@ -131,9 +538,4 @@ class SentimentAnalyzer:
         Returns:
             str: Sentiment label
         """
-        if score > 0.1:
-            return 'positive'
-        elif score < -0.1:
-            return 'negative'
-        else:
-            return 'neutral' 
\ No newline at end of file
+        return sentiment_label(score)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from src.utils.helpers import clean_text
+
+logger = logging.getLogger(__name__)
+
+def normalize_description(description: str) -> str:
+    """Canonical form of a description for cache keys: NFC, whitespace runs collapsed."""
+    return clean_text(unicodedata.normalize('NFC', description))
+
+class SentimentCache:
+    """
+    Memoized sentiment results keyed by content hash.
+
+    A key is the blake2b hash of the normalized description plus the
+    analyzer's fingerprint (its backends and their library/model versions),
+    so the same text scored by a different engine set or model never collides.
+    An in-process LRU sits in front of a SQLite store; disk writes are batched
+    and the store is trimmed least-recently-used first once it grows past
+    max_entries.
+    """
+
+    def __init__(self, path: str = "data/sentiment_cache.sqlite", memory_entries: int = 10000,
+                 max_entries: int = 1_000_000, batch_size: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._memory: OrderedDict = OrderedDict()
+        self._pending: Dict[bytes, Tuple[str, str, str]] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key BLOB PRIMARY KEY,
+                backends TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used);
+            CREATE INDEX IF NOT EXISTS idx_results_backends ON results (backends, fingerprint);
+            """
+        )
+        self._conn.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(description: str, fingerprint: str) -> bytes:
+        text = normalize_description(description)
+        return hashlib.blake2b(f"{fingerprint}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def invalidate(self, backends: str, fingerprint: str) -> int:
+        """
+        Drop results for this backend set that were computed under any other
+        fingerprint, i.e. with different model or library versions.
+
+        Returns:
+            int: Number of stale results removed
+        """
+        with self._lock:
+            self._flush()
+            removed = self._conn.execute(
+                "DELETE FROM results WHERE backends = ? AND fingerprint != ?", (backends, fingerprint)
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info(f"Sentiment cache: dropped {removed} results from older {backends} model versions")
+        return removed
+
+    def get(self, key: bytes) -> Optional[Dict]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(data)
+
+            pending = self._pending.get(key)
+            row = (pending[2],) if pending else self._conn.execute(
+                "SELECT result FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            if not pending:
+                # Touch in place; eviction only needs a rough recency
+                self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0])
+
+    def put(self, key: bytes, backends: str, fingerprint: str, result: Dict) -> None:
+        data = json.dumps(result)
+        with self._lock:
+            self._remember(key, data)
+            self._pending[key] = (backends, fingerprint, data)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def _remember(self, key: bytes, data: str) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush(self) -> None:
+        if not self._pending:
+            self._conn.commit()
+            return
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results (key, backends, fingerprint, result, last_used) VALUES (?, ?, ?, ?, ?)",
+            [(key, backends, fingerprint, data, now) for key, (backends, fingerprint, data) in self._pending.items()]
+        )
+        self._pending.clear()
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Trim to 90% so eviction doesn't run on every flush
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+        )
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'memory_entries': len(self._memory),
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f"Sentiment cache: {stats['hit_rate']:.0%} hit rate ({stats['memory_hits']} memory hits, "
+            f"{stats['disk_hits']} disk hits, {stats['misses']} misses)"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
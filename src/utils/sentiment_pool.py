@@ -0,0 +1,133 @@
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.utils.sections import SectionFilter
+from src.utils.sentiment_analyzer import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# The analyzer each worker process scores with, built by _init_worker
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where it isn't available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def _init_worker(backends: Tuple[str, ...], sections: Optional[SectionFilter]) -> None:
+    global _worker_analyzer
+    # Under fork the models are already in memory, inherited from the parent
+    _worker_analyzer = SentimentAnalyzer(backends, prewarm=True, sections=sections)
+
+def _analyze_chunk(descriptions: List[str]) -> Tuple[List[Dict], int, float, Optional[float]]:
+    start = time.perf_counter()
+    results = list(_worker_analyzer.analyze_many(descriptions, batch_size=len(descriptions) or 1))
+    return results, os.getpid(), time.perf_counter() - start, peak_rss_mb()
+
+def _ready() -> int:
+    return os.getpid()
+
+class SentimentPool:
+    """
+    Score descriptions on a pool of worker processes.
+
+    The parent loads every model before the workers start, so with the fork
+    start method (the default on Linux) workers share the model memory
+    copy-on-write instead of each loading its own. Descriptions are sent in
+    chunks, a bounded number of chunks are in flight at once, and results
+    come back in input order. Cache lookups and writes stay in the parent, so
+    only uncached descriptions are sent to workers.
+
+    Args:
+        analyzer (SentimentAnalyzer): Analyzer whose engines and cache are used
+        workers (int): Worker processes
+        chunk_size (int): Descriptions per task sent to a worker
+    """
+
+    def __init__(self, analyzer: SentimentAnalyzer, workers: int, chunk_size: int = 64):
+        self.analyzer = analyzer
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.worker_stats: Dict[int, Dict] = {}
+
+        analyzer._load_models()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(analyzer.backend_names, analyzer.sections))
+        # Start every worker now, before the caller starts any threads of its own
+        for future in [self._executor.submit(_ready) for _ in range(workers)]:
+            future.result()
+        logger.info(f"Sentiment pool: {workers} workers ready ({context.get_start_method()} start)")
+
+    def analyze_many(self, descriptions: Iterable[str]) -> Iterator[Dict]:
+        """Analyze descriptions on the workers, yielding one result per description in input order."""
+        descriptions = iter(descriptions)
+        in_flight: deque = deque()
+        max_in_flight = self.workers * 2
+
+        def submit() -> bool:
+            chunk = list(islice(descriptions, self.chunk_size))
+            if not chunk:
+                return False
+            entries = [self.analyzer._cached(description) for description in chunk]
+            misses = [description for description, (_, cached) in zip(chunk, entries) if cached is None]
+            future = self._executor.submit(_analyze_chunk, misses) if misses else None
+            in_flight.append((entries, future))
+            return True
+
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                exhausted = not submit()
+            if not in_flight:
+                return
+            entries, future = in_flight.popleft()
+            results = iter(())
+            if future is not None:
+                scored, pid, seconds, rss = future.result()
+                self._record(pid, len(scored), seconds, rss)
+                results = iter(scored)
+            for key, cached in entries:
+                yield cached if cached is not None else self.analyzer._store(key, next(results))
+
+    def _record(self, pid: int, documents: int, seconds: float, rss: Optional[float]) -> None:
+        stats = self.worker_stats.setdefault(pid, {'documents': 0, 'seconds': 0.0, 'peak_rss_mb': None})
+        stats['documents'] += documents
+        stats['seconds'] += seconds
+        stats['peak_rss_mb'] = rss
+
+    def stats(self) -> Dict[int, Dict]:
+        """Per worker pid: documents scored, busy seconds, docs/sec and peak RSS in MB."""
+        return {
+            pid: {**stats, 'seconds': round(stats['seconds'], 3),
+                  'docs_per_second': round(stats['documents'] / stats['seconds'], 1) if stats['seconds'] else 0.0}
+            for pid, stats in self.worker_stats.items()
+        }
+
+    def log_stats(self) -> None:
+        for pid, stats in sorted(self.stats().items()):
+            logger.info(
+                f"Sentiment worker {pid}: {stats['documents']} descriptions in {stats['seconds']:.1f}s "
+                f"({stats['docs_per_second']:.1f}/s), peak RSS {stats['peak_rss_mb']} MB"
+            )
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'SentimentPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
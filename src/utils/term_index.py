@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from src.utils.helpers import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+# Label under which counts over every posting are kept
+ALL_POSTINGS = ''
+
+# Words, keeping the symbols of names like c++, c# and node-js
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#'-]*[a-z0-9+#]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers herself him himself his how i if in into is it its itself just let me more most my myself no nor not now of
+off on once only or other our ours ourselves out over own same she should so some such than that the their theirs
+them themselves then there these they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves etc e.g i.e per via within without
+we'll we're we've you'll you're you've it's that's there's
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words of a text, without stopwords."""
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def term_frequencies(texts: Iterable[str]) -> Counter:
+    """Term counts over texts, tokenized one at a time so no combined text is built."""
+    counts: Counter = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    return counts
+
+def posting_key(job: Dict) -> int:
+    """64-bit key for a posting: its canonical URL, or its company, title and description."""
+    url = job.get('url')
+    identity = canonicalize_url(url) if url else \
+        f"{job.get('company', '')}\0{job.get('title', '')}\0{job.get('description', '')}"
+    digest = hashlib.blake2b(identity.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def posting_label(job: Dict) -> Optional[str]:
+    analysis = job.get('sentiment_analysis')
+    return analysis.get('overall_sentiment') if isinstance(analysis, dict) else None
+
+class TermFrequencyIndex:
+    """
+    Persistent term counts over job descriptions, overall and per sentiment label.
+
+    Postings are added as they arrive; each is counted once overall, and once
+    under its sentiment label when it first has one, however often it is seen
+    again. Counts are accumulated in memory and merged into SQLite in
+    batches, so memory is bounded by the vocabulary rather than the text. Word
+    clouds over any history then read the top few hundred terms of one label
+    instead of re-tokenizing every description.
+    """
+
+    def __init__(self, path: str = "data/term_index.sqlite", batch_size: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # Label -> term counts not yet written
+        self._pending_terms: Dict[str, Counter] = {}
+        self._pending_postings: set = set()
+        # (key, label) of postings counted under their label, not yet written
+        self._pending_labels: set = set()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS postings (key INTEGER PRIMARY KEY)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS labelled_postings (key INTEGER NOT NULL, label TEXT NOT NULL, "
+            "PRIMARY KEY (key, label)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS terms (label TEXT NOT NULL, term TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (label, term)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def _known(self, keys: List[int]) -> set:
+        known = {key for key in keys if key in self._pending_postings}
+        remaining = [key for key in keys if key not in known]
+        for start in range(0, len(remaining), _LOOKUP_CHUNK):
+            chunk = remaining[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(f"SELECT key FROM postings WHERE key IN ({placeholders})", chunk)
+            known.update(key for key, in rows)
+        return known
+
+    def _known_labels(self, keys: List[int]) -> set:
+        """(key, label) pairs already counted among these postings."""
+        key_set = set(keys)
+        known = {(key, label) for key, label in self._pending_labels if key in key_set}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(self._conn.execute(
+                f"SELECT key, label FROM labelled_postings WHERE key IN ({placeholders})", chunk
+            ))
+        return known
+
+    def add(self, job: Dict) -> bool:
+        """Count a posting's description terms; returns False if it was already counted, under its label too."""
+        return self.update([job]) == 1
+
+    def update(self, jobs: Iterable[Dict]) -> int:
+        """
+        Count the description terms of postings not indexed yet, and of known
+        postings under a sentiment label they are seen with for the first time.
+
+        Returns:
+            int: Postings that added counts
+        """
+        jobs = iter(jobs)
+        added = 0
+        while True:
+            chunk = list(islice(jobs, _LOOKUP_CHUNK))
+            if not chunk:
+                return added
+            added += self._update(chunk)
+
+    def _update(self, jobs: List[Dict]) -> int:
+        keys = [posting_key(job) for job in jobs]
+        added = 0
+        with self._lock:
+            known = self._known(keys)
+            known_labels = self._known_labels(keys)
+            for job, key in zip(jobs, keys):
+                label = posting_label(job)
+                counted = [] if key in known else [ALL_POSTINGS]
+                if label and (key, label) not in known_labels:
+                    counted.append(label)
+                if not counted:
+                    continue
+                tokens = tokenize(job.get('description'))
+                for counted_label in counted:
+                    self._pending_terms.setdefault(counted_label, Counter()).update(tokens)
+                if key not in known:
+                    known.add(key)
+                    self._pending_postings.add(key)
+                if label:
+                    known_labels.add((key, label))
+                    self._pending_labels.add((key, label))
+                added += 1
+                if len(self._pending_postings) + len(self._pending_labels) >= self.batch_size:
+                    self._flush()
+        return added
+
+    def _flush(self) -> None:
+        if not self._pending_postings and not self._pending_labels:
+            return
+        self._conn.executemany(
+            "INSERT INTO terms (label, term, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (label, term) DO UPDATE SET count = count + excluded.count",
+            ((label, term, count) for label, counts in self._pending_terms.items() for term, count in counts.items())
+        )
+        self._conn.executemany("INSERT OR IGNORE INTO postings (key) VALUES (?)",
+                               ((key,) for key in self._pending_postings))
+        self._conn.executemany("INSERT OR IGNORE INTO labelled_postings (key, label) VALUES (?, ?)",
+                               self._pending_labels)
+        self._conn.commit()
+        self._pending_terms.clear()
+        self._pending_postings.clear()
+        self._pending_labels.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def frequencies(self, label: Optional[str] = None, limit: int = 200) -> Dict[str, int]:
+        """
+        The most frequent terms and their counts.
+
+        Args:
+            label (Optional[str]): Sentiment label ('positive', 'negative' or 'neutral'); None for all postings
+            limit (int): Terms returned
+        """
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(
+                "SELECT term, count FROM terms WHERE label = ? ORDER BY count DESC LIMIT ?",
+                (label or ALL_POSTINGS, limit)
+            )
+            return dict(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
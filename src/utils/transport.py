@@ -0,0 +1,145 @@
+import logging
+import threading
+from typing import Dict, Mapping, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fake_useragent import UserAgent
+from src.utils.rate_limiter import DEFAULT_LIMITS, SITE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401 - enables urllib3/aiohttp brotli decoding
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    # Never advertise an encoding we can't decode
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Transient server errors worth retrying at the connection level; 403/429 are
+# left to the rate limiter so backoff stays host-wide.
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+_user_agent: Optional[UserAgent] = None
+_user_agent_lock = threading.Lock()
+
+def get_user_agent() -> UserAgent:
+    """Return the shared UserAgent, loading its browser data only once."""
+    global _user_agent
+    with _user_agent_lock:
+        if _user_agent is None:
+            _user_agent = UserAgent()
+        return _user_agent
+
+def random_user_agent() -> str:
+    return get_user_agent().random
+
+def default_pool_sizes() -> Dict[str, int]:
+    """Size each site's connection pool to the most requests the rate limiter lets it run at once."""
+    return {host: limits.get('max_concurrency', DEFAULT_LIMITS['max_concurrency'])
+            for host, limits in SITE_LIMITS.items()}
+
+class Transport:
+    """
+    Keep-alive HTTP transport with pooled connections, retries and reuse statistics.
+
+    The statistics also cover requests sent by the concurrent fetcher, which
+    reports them through record_async.
+    """
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]] = (5, 30), max_retries: int = 2,
+                 backoff_factor: float = 0.5, pool_maxsize: int = DEFAULT_LIMITS['max_concurrency'],
+                 host_pool_sizes: Optional[Mapping[str, int]] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        # Host -> requests and connections of concurrent crawls, which pool connections per crawl
+        self._async_stats: Dict[str, Dict[str, int]] = {}
+        self._async_lock = threading.Lock()
+
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        default_adapter = self._build_adapter(pool_maxsize)
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        self._adapters['*'] = default_adapter
+
+        pool_sizes = default_pool_sizes() if host_pool_sizes is None else host_pool_sizes
+        for host, size in pool_sizes.items():
+            adapter = self._build_adapter(size)
+            self.session.mount(f'https://{host}', adapter)
+            self.session.mount(f'http://{host}', adapter)
+            self._adapters[host] = adapter
+
+    def _build_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        return HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Union[float, Tuple[float, float], None] = None, **kwargs) -> requests.Response:
+        """Send a GET over the pooled session."""
+        return self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+
+    def record_async(self, host: str, requests: int, connections: int) -> None:
+        """Add requests sent and connections opened by a concurrent crawl to the statistics."""
+        with self._async_lock:
+            host_stats = self._async_stats.setdefault(host, {'requests': 0, 'connections': 0})
+            host_stats['requests'] += requests
+            host_stats['connections'] += connections
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Connection reuse statistics per host, over both pooled sessions.
+
+        Returns:
+            Dict[str, Dict]: Requests sent, connections opened and the share of
+            requests that reused an existing connection
+        """
+        stats: Dict[str, Dict] = {}
+        for adapter in self._adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None or not pool.num_requests:
+                    continue
+                host_stats = stats.setdefault(pool.host, {'requests': 0, 'connections': 0})
+                host_stats['requests'] += pool.num_requests
+                host_stats['connections'] += pool.num_connections
+        with self._async_lock:
+            for host, async_stats in self._async_stats.items():
+                host_stats = stats.setdefault(host, {'requests': 0, 'connections': 0})
+                host_stats['requests'] += async_stats['requests']
+                host_stats['connections'] += async_stats['connections']
+
+        for host_stats in stats.values():
+            reused = host_stats['requests'] - host_stats['connections']
+            host_stats['reuse_ratio'] = round(max(0, reused) / host_stats['requests'], 3)
+        return stats
+
+    def log_stats(self) -> None:
+        for host, stats in self.stats().items():
+            logger.info(
+                f"Transport {host}: {stats['requests']} requests over {stats['connections']} connections "
+                f"({stats['reuse_ratio']:.0%} reused)"
+            )
+
+    def close(self) -> None:
+        self.session.close()
+
+_shared_transport: Optional[Transport] = None
+_shared_transport_lock = threading.Lock()
+
+def get_transport() -> Transport:
+    """Return the process-wide transport so all scrapers share one set of connection pools."""
+    global _shared_transport
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = Transport()
+        return _shared_transport
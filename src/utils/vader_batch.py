@@ -0,0 +1,300 @@
+"""
+Bulk VADER scoring with NumPy.
+
+nltk's SentimentIntensityAnalyzer.polarity_scores walks each text in Python:
+it builds a punctuation/word product dictionary per text, looks every token's
+position up with list.index, and applies the booster, negation, idiom and
+"but" rules one token at a time. BatchVader tokenizes a batch once, maps each
+distinct token to its lexicon features through a vocabulary cache shared
+across batches, and applies the same rules to every token of the batch at once
+with NumPy, reducing to per-text scores with np.bincount.
+
+The rules are nltk 3.8's, including its quirks: a repeated token is scored in
+the context of its first occurrence, "never"/"so"/"this" are matched
+case-sensitively, and idioms are matched on the original tokens. The float
+operations run in the same order as nltk's, so results agree with
+polarity_scores; the parity test allows up to PARITY_TOLERANCE on every score,
+one unit in the last rounded digit of neg/neu/pos.
+"""
+import math
+import string
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+# Largest difference from nltk's polarity_scores allowed on any of neg/neu/pos/compound
+PARITY_TOLERANCE = 1e-3
+
+PUNCTUATION = set(string.punctuation)
+PUNCTUATION_CHARS = string.punctuation
+REMOVE_PUNCTUATION = str.maketrans('', '', string.punctuation)
+
+# Lowercase words the rules look for, as tags in the vocabulary features
+TAGS = {'kind': 1, 'of': 2, 'least': 3, 'at': 4, 'very': 5, 'but': 6}
+KIND, OF, LEAST, AT, VERY, BUT = range(1, 7)
+
+# Idiom lookups in the order nltk tries them, as token offsets from the scored word
+LEADING_SEQUENCES = [(-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)]
+TRAILING_SEQUENCES = [(0, 1), (0, 1, 2)]
+
+class Vocabulary(dict):
+    """
+    Exact token -> id, assigning ids to new tokens on lookup, with each id's
+    VADER features kept in columns: in lexicon, valence, booster scalar,
+    negation, ALL CAPS and rule tag.
+    """
+
+    def __init__(self, lexicon: Dict[str, float], constants):
+        super().__init__()
+        self.lexicon = lexicon
+        self.constants = constants
+        self.columns: Tuple[List, ...] = ([], [], [], [], [], [])
+        self._arrays: Optional[Tuple[np.ndarray, ...]] = None
+
+    def __missing__(self, token: str) -> int:
+        lower = token.lower()
+        features = (
+            lower in self.lexicon,
+            self.lexicon.get(lower, 0.0),
+            self.constants.BOOSTER_DICT.get(lower, 0.0),
+            lower in self.constants.NEGATE or "n't" in lower,
+            token.isupper(),
+            TAGS.get(lower, 0),
+        )
+        for column, value in zip(self.columns, features):
+            column.append(value)
+        token_id = self[token] = len(self)
+        self._arrays = None
+        return token_id
+
+    def arrays(self) -> Tuple[np.ndarray, ...]:
+        if self._arrays is None:
+            self._arrays = tuple(np.array(column) for column in self.columns)
+        return self._arrays
+
+class StrippedTokens(dict):
+    """Token -> the token without its leading or trailing punctuation run, or None if nltk keeps it whole."""
+
+    def __init__(self, punctuation_runs: Set[str]):
+        super().__init__()
+        self.punctuation_runs = punctuation_runs
+
+    def __missing__(self, token: str) -> Optional[str]:
+        stripped = token.lstrip(PUNCTUATION_CHARS)
+        if stripped == token:
+            stripped = token.rstrip(PUNCTUATION_CHARS)
+            run = token[len(stripped):]
+        else:
+            run = token[:len(token) - len(stripped)]
+        # Words never contain punctuation, so only an outer run can be dropped
+        result = stripped if run in self.punctuation_runs and stripped and not PUNCTUATION & set(stripped) else None
+        self[token] = result
+        return result
+
+class BatchVader:
+    """
+    Vectorized VADER scorer over the lexicon and constants of an nltk
+    SentimentIntensityAnalyzer.
+
+    Args:
+        sia: A loaded nltk SentimentIntensityAnalyzer
+        max_vocabulary (int): Distinct tokens remembered across batches before
+            the vocabulary is rebuilt from scratch
+    """
+
+    def __init__(self, sia, max_vocabulary: int = 500_000):
+        self.lexicon = sia.lexicon
+        self.constants = sia.constants
+        self.max_vocabulary = max_vocabulary
+        self.punctuation_runs = set(self.constants.PUNC_LIST)
+        self.idioms = [(tuple(phrase.split()), value) for phrase, value in self.constants.SPECIAL_CASE_IDIOMS.items()]
+        self.booster_bigrams = [tuple(phrase.split()) for phrase in self.constants.BOOSTER_DICT if ' ' in phrase]
+        self.vocabulary = Vocabulary(self.lexicon, self.constants)
+        self.stripped = StrippedTokens(self.punctuation_runs)
+
+    def tokenize(self, text: str) -> List[str]:
+        """nltk's SentiText.words_and_emoticons, without building its per-text product dictionary."""
+        tokens = [token for token in text.split() if len(token) > 1]
+        words = None
+        for index, token in enumerate(tokens):
+            if token[0] in PUNCTUATION or token[-1] in PUNCTUATION:
+                # A leading or trailing punctuation run from nltk's PUNC_LIST is
+                # dropped when what's left is a word of the text
+                stripped = self.stripped[token]
+                if stripped is not None:
+                    if words is None:
+                        words = {word for word in text.translate(REMOVE_PUNCTUATION).split() if len(word) > 1}
+                    if stripped in words:
+                        tokens[index] = stripped
+        return tokens
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        return self.polarity_scores_many([text])[0]
+
+    def polarity_scores_many(self, texts: Iterable[str]) -> List[Dict[str, float]]:
+        """Score a batch of texts; each result is shaped like nltk's polarity_scores."""
+        texts = [text if isinstance(text, str) else str(text.encode('utf-8')) for text in texts]
+        if not texts:
+            return []
+        if len(self.vocabulary) > self.max_vocabulary:
+            self.vocabulary = Vocabulary(self.lexicon, self.constants)
+            self.stripped = StrippedTokens(self.punctuation_runs)
+
+        # Flatten the batch into one array of token ids
+        tokenized = [self.tokenize(text) for text in texts]
+        lengths = np.array([len(tokens) for tokens in tokenized])
+        ids = np.fromiter(map(self.vocabulary.__getitem__, chain.from_iterable(tokenized)),
+                          dtype=np.int64, count=int(lengths.sum()))
+
+        scores = self._score_tokens(ids, lengths)
+        return [self._score_text(text, *doc_scores) for text, doc_scores in zip(texts, scores)]
+
+    def _score_tokens(self, ids: np.ndarray, lengths: np.ndarray):
+        n_docs = len(lengths)
+        size = len(ids)
+        if not size:
+            return [(0.0, 0.0, 0.0, 0, 0) for _ in range(n_docs)]
+
+        vocabulary = self.vocabulary
+        in_lexicon_v, valence_v, booster_v, negation_v, upper_v, tag_v = vocabulary.arrays()
+        in_lexicon = in_lexicon_v[ids]
+        booster = booster_v[ids]
+        negation = negation_v[ids]
+        upper = upper_v[ids]
+        tag = tag_v[ids]
+
+        # Owning text, position within it and that text's length, per token
+        docs = np.repeat(np.arange(n_docs), lengths)
+        starts = np.cumsum(lengths) - lengths
+        index = np.arange(size)
+        pos = index - starts[docs]
+        length = lengths[docs]
+
+        neighbours = {}
+        for offset in range(-3, 3):
+            valid = (pos + offset >= 0) & (pos + offset < length)
+            neighbours[offset] = (valid, np.clip(index + offset, 0, size - 1))
+
+        def at(offset: int, values: np.ndarray, fill) -> np.ndarray:
+            """values at each token's neighbour `offset` places away, `fill` outside its text."""
+            valid, neighbour = neighbours[offset]
+            return np.where(valid, values[neighbour], fill)
+
+        def exact(offset: int, word: str) -> np.ndarray:
+            word_id = vocabulary.get(word, -1)
+            return at(offset, ids, -2) == word_id
+
+        # Some but not all tokens of the text are in ALL CAPS
+        caps = np.bincount(docs, weights=upper, minlength=n_docs)
+        cap_diff = ((lengths - caps > 0) & (caps > 0))[docs]
+
+        # Tokens skipped outright: boosters, and "kind" followed by "of"
+        skip = (booster != 0) | ((tag == KIND) & (at(1, tag, 0) == OF))
+        scored = in_lexicon & ~skip
+
+        v = valence_v[ids].astype(float)
+        v = np.where(upper & cap_diff, np.where(v > 0, v + self.constants.C_INCR, v - self.constants.C_INCR), v)
+
+        so_this = {shift: exact(shift, 'so') | exact(shift, 'this') for shift in (-1, -2)}
+        never = {shift: exact(shift, 'never') for shift in (-2, -3)}
+        for start in range(3):
+            shift = -(start + 1)
+            step = scored & (pos > start) & ~at(shift, in_lexicon, True)
+
+            # Booster or dampener `start + 1` words back, fading with distance
+            s = at(shift, booster, 0.0)
+            s = np.where(v < 0, -s, s)
+            s = np.where((s != 0) & at(shift, upper, False) & cap_diff,
+                         np.where(v > 0, s + self.constants.C_INCR, s - self.constants.C_INCR), s)
+            if start == 1:
+                s = np.where(s != 0, s * 0.95, s)
+            elif start == 2:
+                s = np.where(s != 0, s * 0.9, s)
+            v = np.where(step, v + s, v)
+
+            negated = at(shift, negation, False)
+            if start == 0:
+                v = np.where(step & negated, v * self.constants.N_SCALAR, v)
+            elif start == 1:
+                emphasis = never[-2] & so_this[-1]
+                v = np.where(step & emphasis, v * 1.5, np.where(step & negated, v * self.constants.N_SCALAR, v))
+            else:
+                emphasis = (never[-3] & so_this[-2]) | so_this[-1]
+                v = np.where(step & emphasis, v * 1.25, np.where(step & negated, v * self.constants.N_SCALAR, v))
+                v = np.where(step, self._idioms(v, exact), v)
+
+        # "least" negates, unless it follows "at" or "very"
+        least = (pos > 0) & ~at(-1, in_lexicon, True) & (at(-1, tag, 0) == LEAST)
+        least &= (pos == 1) | ~np.isin(at(-2, tag, 0), (AT, VERY))
+        v = np.where(scored & least, v * self.constants.N_SCALAR, v)
+
+        # Every occurrence takes the valence computed at the token's first
+        # occurrence in its text (nltk looks positions up with list.index)
+        _, first, inverse = np.unique(docs * len(vocabulary) + ids, return_index=True, return_inverse=True)
+        sentiments = np.where(scored, v, 0.0)[first[inverse]]
+
+        # "but" halves what comes before it and boosts what comes after
+        buts = np.where(tag == BUT, pos, np.iinfo(np.int64).max)
+        first_but = np.full(n_docs, np.iinfo(np.int64).max)
+        np.minimum.at(first_but, docs, buts)
+        but_at = first_but[docs]
+        has_but = but_at != np.iinfo(np.int64).max
+        sentiments = np.where(has_but & (pos < but_at), sentiments * 0.5,
+                              np.where(has_but & (pos > but_at), sentiments * 1.5, sentiments))
+
+        total = np.bincount(docs, weights=sentiments, minlength=n_docs)
+        positive = np.bincount(docs, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_docs)
+        negative = np.bincount(docs, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_docs)
+        neutral = np.bincount(docs, weights=sentiments == 0, minlength=n_docs)
+        return zip(total.tolist(), positive.tolist(), negative.tolist(), neutral.astype(int).tolist(), lengths.tolist())
+
+    def _idioms(self, v: np.ndarray, exact) -> np.ndarray:
+        """nltk's _idioms_check: special-case idioms replace the valence, booster bigrams dampen it."""
+        def matches(offsets: Tuple[int, ...], words: Tuple[str, ...]) -> np.ndarray:
+            match = exact(offsets[0], words[0])
+            for offset, word in zip(offsets[1:], words[1:]):
+                match &= exact(offset, word)
+            return match
+
+        # The first leading sequence that is an idiom wins, so apply them last to first
+        for offsets in reversed(LEADING_SEQUENCES):
+            for words, value in self.idioms:
+                if len(words) == len(offsets):
+                    v = np.where(matches(offsets, words), value, v)
+        for offsets in TRAILING_SEQUENCES:
+            for words, value in self.idioms:
+                if len(words) == len(offsets):
+                    v = np.where(matches(offsets, words), value, v)
+        bigram = np.zeros(len(v), dtype=bool)
+        for words in self.booster_bigrams:
+            bigram |= matches((-3, -2), words) | matches((-2, -1), words)
+        return np.where(bigram, v + self.constants.B_DECR, v)
+
+    def _score_text(self, text: str, total: float, positive: float, negative: float, neutral: int,
+                    length: int) -> Dict[str, float]:
+        """nltk's score_valence, from the text's sentiment sums."""
+        if not length:
+            return {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}
+
+        exclamations = min(text.count('!'), 4) * 0.292
+        questions = text.count('?')
+        questions = (questions * 0.18 if questions <= 3 else 0.96) if questions > 1 else 0
+        emphasis = exclamations + questions
+
+        if total > 0:
+            total += emphasis
+        elif total < 0:
+            total -= emphasis
+        compound = total / math.sqrt((total * total) + 15)
+
+        if positive > math.fabs(negative):
+            positive += emphasis
+        elif positive < math.fabs(negative):
+            negative -= emphasis
+        denominator = positive + math.fabs(negative) + neutral
+        return {
+            'neg': round(math.fabs(negative / denominator), 3),
+            'neu': round(math.fabs(neutral / denominator), 3),
+            'pos': round(math.fabs(positive / denominator), 3),
+            'compound': round(compound, 4),
+        }
@@ -1,10 +1,22 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Dict
 import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
+from src.utils.heavy_hitters import JobSketches
+from src.utils.helpers import lazy_import
+from src.utils.render_cache import RenderCache, render_key
+from src.utils.salary import parse_salaries
+from src.utils.term_index import TermFrequencyIndex, term_frequencies
+
+# The plotting stack dominates import time, so load it on first use
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+wordcloud = lazy_import('wordcloud')
 
 # Configure logging
 logging.basicConfig(
@@ -13,115 +25,344 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Columns with few distinct values, stored as categoricals so counting them is cheap
+CATEGORICAL_COLUMNS = ('company', 'location', 'job_type')
+TEXT_COLUMNS = ('description', 'salary')
+
+# Job fields the overview plots need once descriptions are counted by a term index
+PLOT_FIELDS = CATEGORICAL_COLUMNS + ('salary',)
+
+PLOT_DPI = 300
+
+# Terms drawn in a word cloud
+WORD_CLOUD_WORDS = 200
+
+# Bar charts of counted fields: title and axis label
+COUNT_PLOTS = {
+    'jobs_by_company': ('Top 10 Companies by Number of Job Postings', 'Company'),
+    'jobs_by_location': ('Top 10 Locations by Number of Job Postings', 'Location'),
+}
+
+# Plots drawn from job sketches and the field each ranks
+SKETCH_PLOTS = {'jobs_by_company': 'company', 'jobs_by_location': 'location', 'job_types': 'job_type'}
+
+def job_frame(jobs: List[Dict]):
+    """
+    Build one typed columnar frame from job dicts, holding only the columns the
+    overview plots use.
+
+    Args:
+        jobs (List[Dict]): Job postings
+
+    Returns:
+        pd.DataFrame: Categorical company/location/job_type columns, text description/salary
+        columns, and the parsed salary columns (see parse_salaries)
+    """
+    columns = {column: pd.Categorical([job.get(column) for job in jobs]) for column in CATEGORICAL_COLUMNS}
+    columns.update({column: [job.get(column) or '' for job in jobs] for column in TEXT_COLUMNS})
+    frame = pd.DataFrame(columns)
+    return frame.join(parse_salaries(frame['salary']))
+
+def plot_fields(job: Dict) -> Dict:
+    """The PLOT_FIELDS of a job, to collect from a stream for generate_all_visualizations."""
+    return {field: job.get(field) for field in PLOT_FIELDS}
+
+def top_counts(frame, column: str, n: Optional[int] = 10):
+    """The n most frequent values of a column, with their counts."""
+    counts = frame[column].value_counts()
+    counts = counts[counts > 0]
+    return counts.head(n) if n else counts
+
+def salary_values(frame) -> Tuple[List[float], Optional[str]]:
+    """
+    Annual salary midpoints in the most common currency, with that currency.
+    Salaries whose currency isn't stated are counted in it too.
+    """
+    parsed = frame.dropna(subset=['salary_mid'])
+    currencies = parsed['salary_currency'].value_counts()
+    currency = currencies.index[0] if len(currencies) else None
+    if currency is not None:
+        parsed = parsed[parsed['salary_currency'].isna() | (parsed['salary_currency'] == currency)]
+    return parsed['salary_mid'].tolist(), currency
+
+def save_figure(fig, filepath: Path) -> None:
+    fig.savefig(filepath, bbox_inches='tight', dpi=PLOT_DPI)
+    plt.close(fig)
+    logger.info(f"Saved visualization to {filepath}")
+
+def render_bar(counts, title: str, xlabel: str, ylabel: str, filepath: Path) -> None:
+    fig = plt.figure(figsize=(12, 6))
+    sns.barplot(x=counts.values, y=counts.index)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    save_figure(fig, filepath)
+
+def render_pie(counts, title: str, filepath: Path) -> None:
+    fig = plt.figure(figsize=(10, 10))
+    plt.pie(counts.values, labels=counts.index, autopct='%1.1f%%')
+    plt.title(title)
+    save_figure(fig, filepath)
+
+def render_word_cloud(frequencies: Dict[str, int], title: str, size: Tuple[int, int], filepath: Path) -> None:
+    cloud = wordcloud.WordCloud(
+        width=size[0],
+        height=size[1],
+        background_color='white',
+        max_words=WORD_CLOUD_WORDS
+    ).generate_from_frequencies(frequencies)
+
+    fig = plt.figure(figsize=(size[0] / 80, size[1] / 80))
+    plt.imshow(cloud, interpolation='bilinear')
+    plt.axis('off')
+    plt.title(title)
+    save_figure(fig, filepath)
+
+def render_histogram(values: List[float], title: str, xlabel: str, filepath: Path) -> None:
+    fig = plt.figure(figsize=(12, 6))
+    sns.histplot(values, bins=20)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel('Count')
+    save_figure(fig, filepath)
+
+def _init_renderer() -> None:
+    # Workers only write files, so never open a display
+    plt.switch_backend('agg')
+
+def _render(render: Callable, args: Tuple) -> float:
+    start = time.perf_counter()
+    render(*args)
+    return time.perf_counter() - start
+
 class JobVisualizer:
-    def __init__(self, output_dir: str = "data/visualizations"):
+    def __init__(self, output_dir: str = "data/visualizations", workers: Optional[int] = None,
+                 use_cache: bool = True, keep_renders: int = 3, term_index: Optional[TermFrequencyIndex] = None):
+        """
+        Args:
+            output_dir (str): Directory the plots are saved to
+            workers (Optional[int]): Processes rendering plots in parallel; defaults to one per
+                CPU, and 1 renders in this process
+            use_cache (bool): Reuse the last render of an overview plot whose data hasn't changed
+            keep_renders (int): Renders kept per overview plot when caching
+            term_index (Optional[TermFrequencyIndex]): Draw word clouds from this index's counts,
+                covering every posting indexed so far, instead of counting the jobs passed in
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.render_cache = RenderCache(str(self.output_dir), keep=keep_renders) if use_cache else None
+        self.term_index = term_index
     
+    def _plot_path(self, filename: str, key: str = '') -> Path:
+        suffix = f"_{key[:8]}" if key else ''
+        return self.output_dir / f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.png"
+
     def _save_plot(self, fig, filename: str, save_path: str = None) -> None:
         """Save a matplotlib figure to a file."""
-        filepath = self.output_dir / f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        fig.savefig(filepath, bbox_inches='tight', dpi=300)
+        filepath = self._plot_path(filename)
+        fig.savefig(filepath, bbox_inches='tight', dpi=PLOT_DPI)
         plt.close(fig)
         logger.info(f"Saved visualization to {filepath}")
-        if save_path:
+        if save_path is not None:
             save_path.append(filepath)
     
+    def _counts_plot(self, name: str, counts, error: int = 0) -> Optional[Tuple[Callable, Tuple]]:
+        """Chart of one counted field; error is the largest overcount of estimated counts."""
+        if counts.empty:
+            return None
+        if name == 'job_types':
+            return render_pie, (counts, 'Distribution of Job Types' + (' (estimated)' if error else ''))
+        title, ylabel = COUNT_PLOTS[name]
+        xlabel = f'Number of Jobs (estimated, at most {error} over)' if error else 'Number of Jobs'
+        return render_bar, (counts, title, xlabel, ylabel)
+
+    def _company_plot(self, frame) -> Optional[Tuple[Callable, Tuple]]:
+        return self._counts_plot('jobs_by_company', top_counts(frame, 'company'))
+
+    def _location_plot(self, frame) -> Optional[Tuple[Callable, Tuple]]:
+        return self._counts_plot('jobs_by_location', top_counts(frame, 'location'))
+
+    def _job_type_plot(self, frame) -> Optional[Tuple[Callable, Tuple]]:
+        return self._counts_plot('job_types', top_counts(frame, 'job_type', n=None))
+
+    def _word_frequencies(self, descriptions: Iterable[str], label: Optional[str] = None) -> Dict[str, int]:
+        if self.term_index is not None:
+            return self.term_index.frequencies(label, limit=WORD_CLOUD_WORDS)
+        return dict(term_frequencies(descriptions).most_common(WORD_CLOUD_WORDS))
+
+    def _word_cloud_plot(self, frame) -> Optional[Tuple[Callable, Tuple]]:
+        frequencies = self._word_frequencies(frame['description'])
+        if not frequencies:
+            return None
+        return render_word_cloud, (frequencies, 'Word Cloud of Job Descriptions', (1200, 800))
+
+    def _salary_plot(self, frame) -> Optional[Tuple[Callable, Tuple]]:
+        salaries, currency = salary_values(frame)
+        if not salaries:
+            return None
+        xlabel = f"Annual salary, midpoint of range ({currency})" if currency else 'Annual salary, midpoint of range'
+        return render_histogram, (salaries, 'Distribution of Salary Ranges', xlabel)
+
+    def _plots(self) -> Dict[str, Callable]:
+        """
+        Overview plots by name, each building its render function and
+        arguments, all but the output path, from the frame.
+        """
+        return {
+            'jobs_by_company': self._company_plot,
+            'jobs_by_location': self._location_plot,
+            'job_types': self._job_type_plot,
+            'word_cloud': self._word_cloud_plot,
+            'salary_ranges': self._salary_plot,
+        }
+
+    def _plot(self, name: str, jobs: List[Dict]) -> None:
+        task = self._plots()[name](job_frame(jobs))
+        if task is not None:
+            result = self._render_plots({name: task})[name]
+            if isinstance(result, Exception):
+                raise result
+
+    def _render_plots(self, tasks: Dict[str, Tuple[Callable, Tuple]]) -> Dict[str, Union[float, Exception]]:
+        """
+        Render each plot whose input isn't in the render cache, in parallel
+        when there are several.
+
+        Returns:
+            Dict: Seconds spent rendering per plot (0 when the cached render was
+            reused), or the exception the plot raised
+        """
+        results: Dict[str, Union[float, Exception]] = {}
+        pending = {}
+        for name, (render, args) in tasks.items():
+            key = render_key(render, args, {'dpi': PLOT_DPI})
+            if self.render_cache is not None:
+                cached = self.render_cache.lookup(name, key)
+                if cached is not None:
+                    logger.info(f"{name} is unchanged, reusing {cached}")
+                    results[name] = 0.0
+                    continue
+            filepath = self._plot_path(name, key)
+            pending[name] = (key, filepath, (render, args + (filepath,)))
+
+        workers = min(self.workers, len(pending))
+        if workers > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_renderer) as executor:
+                futures = {name: executor.submit(_render, *task) for name, (_, _, task) in pending.items()}
+                results.update({name: future.exception() or future.result() for name, future in futures.items()})
+        else:
+            for name, (_, _, task) in pending.items():
+                try:
+                    results[name] = _render(*task)
+                except Exception as e:
+                    results[name] = e
+
+        if self.render_cache is not None:
+            for name, (key, filepath, _) in pending.items():
+                if not isinstance(results[name], Exception):
+                    self.render_cache.record(name, key, filepath, results[name])
+            self.render_cache.save()
+        return results
+
     def plot_jobs_by_company(self, jobs: List[Dict]) -> None:
         """Create a bar plot of jobs by company."""
-        df = pd.DataFrame(jobs)
-        company_counts = df['company'].value_counts().head(10)
-        
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x=company_counts.values, y=company_counts.index)
-        plt.title('Top 10 Companies by Number of Job Postings')
-        plt.xlabel('Number of Jobs')
-        plt.ylabel('Company')
-        
-        self._save_plot(plt.gcf(), 'jobs_by_company')
+        self._plot('jobs_by_company', jobs)
     
     def plot_jobs_by_location(self, jobs: List[Dict]) -> None:
         """Create a bar plot of jobs by location."""
-        df = pd.DataFrame(jobs)
-        location_counts = df['location'].value_counts().head(10)
-        
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x=location_counts.values, y=location_counts.index)
-        plt.title('Top 10 Locations by Number of Job Postings')
-        plt.xlabel('Number of Jobs')
-        plt.ylabel('Location')
-        
-        self._save_plot(plt.gcf(), 'jobs_by_location')
+        self._plot('jobs_by_location', jobs)
     
     def plot_job_types(self, jobs: List[Dict]) -> None:
         """Create a pie chart of job types."""
-        df = pd.DataFrame(jobs)
-        job_types = df['job_type'].value_counts()
-        
-        plt.figure(figsize=(10, 10))
-        plt.pie(job_types.values, labels=job_types.index, autopct='%1.1f%%')
-        plt.title('Distribution of Job Types')
-        
-        self._save_plot(plt.gcf(), 'job_types')
+        self._plot('job_types', jobs)
     
     def create_word_cloud(self, jobs: List[Dict]) -> None:
         """Create a word cloud from job descriptions."""
-        # Combine all job descriptions
-        text = ' '.join(job.get('description', '') for job in jobs)
-        
-        # Generate word cloud
-        wordcloud = WordCloud(
-            width=1200,
-            height=800,
-            background_color='white',
-            max_words=200
-        ).generate(text)
-        
-        # Plot word cloud
-        plt.figure(figsize=(15, 10))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title('Word Cloud of Job Descriptions')
-        
-        self._save_plot(plt.gcf(), 'word_cloud')
+        self._plot('word_cloud', jobs)
     
     def plot_salary_ranges(self, jobs: List[Dict]) -> None:
         """Create a histogram of salary ranges."""
-        # Extract salary information (this is a simplified example)
-        salaries = []
-        for job in jobs:
-            salary = job.get('salary', '')
-            if salary:
-                # Extract numeric value (this is a simplified example)
-                try:
-                    salary_value = float(''.join(filter(str.isdigit, salary)))
-                    salaries.append(salary_value)
-                except ValueError:
-                    continue
-        
-        if salaries:
-            plt.figure(figsize=(12, 6))
-            sns.histplot(salaries, bins=20)
-            plt.title('Distribution of Salary Ranges')
-            plt.xlabel('Salary')
-            plt.ylabel('Count')
-            
-            self._save_plot(plt.gcf(), 'salary_ranges')
+        self._plot('salary_ranges', jobs)
     
-    def generate_all_visualizations(self, jobs: List[Dict]) -> None:
-        """Generate all visualizations for the job data."""
+    def generate_all_visualizations(self, jobs: List[Dict]) -> Dict[str, float]:
+        """
+        Generate all visualizations for the job data.
+
+        The jobs are converted to one columnar frame and every plot's data is
+        aggregated from it. Plots whose data changed since their last render
+        are then rendered in parallel on a headless backend; the others reuse
+        the cached render. A plot that fails is logged and the others still
+        render.
+
+        Returns:
+            Dict[str, float]: Seconds spent rendering per plot (0 when its cached render was
+                reused), plus 'frame' for building the frame
+        """
         logger.info("Generating visualizations...")
+        timings = {}
         
-        try:
-            self.plot_jobs_by_company(jobs)
-            self.plot_jobs_by_location(jobs)
-            self.plot_job_types(jobs)
-            self.create_word_cloud(jobs)
-            self.plot_salary_ranges(jobs)
-            
+        start = time.perf_counter()
+        frame = job_frame(jobs)
+        timings['frame'] = time.perf_counter() - start
+
+        tasks = {}
+        for name, build in self._plots().items():
+            try:
+                task = build(frame)
+            except Exception as e:
+                logger.error(f"Error preparing {name} visualization: {str(e)}")
+                continue
+            if task is not None:
+                tasks[name] = task
+
+        return self._report(self._render_plots(tasks), timings)
+
+    def _report(self, rendered: Dict[str, Union[float, Exception]], timings: Dict[str, float]) -> Dict[str, float]:
+        """Log render results and add the successful ones to timings."""
+        failed = 0
+        for name, seconds in rendered.items():
+            if isinstance(seconds, Exception):
+                failed += 1
+                logger.error(f"Error generating {name} visualization: {str(seconds)}")
+            else:
+                timings[name] = seconds
+        logger.info("Visualization timings: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+        if self.render_cache is not None:
+            stats = self.render_cache.stats()
+            logger.info(f"Render cache: {stats['hits']} reused, {stats['misses']} rendered, "
+                        f"{stats['saved_seconds']:.1f}s of rendering saved")
+        if not failed:
             logger.info("All visualizations generated successfully")
-        except Exception as e:
-            logger.error(f"Error generating visualizations: {str(e)}")
+        return timings
+
+    def plot_from_sketches(self, sketches: JobSketches, k: int = 10) -> Dict[str, float]:
+        """
+        Plot the company, location and job type charts from job sketches.
+
+        The counts are read from the sketches' fixed-size summaries instead of
+        a list of jobs, so any amount of history can be plotted. When an
+        estimated count may be overcounted, the axis label or title says so.
+
+        Args:
+            sketches (JobSketches): Sketches built from scraper output or stored history
+            k (int): Values shown per chart
+
+        Returns:
+            Dict[str, float]: Seconds spent rendering per plot, as generate_all_visualizations
+        """
+        tasks = {}
+        for name, field in SKETCH_PLOTS.items():
+            if field not in sketches.sketches:
+                continue
+            top = sketches.top(field, k)
+            counts = pd.Series({entry['item']: entry['count'] for entry in top}, dtype='int64')
+            task = self._counts_plot(name, counts, max((entry['error'] for entry in top), default=0))
+            if task is not None:
+                tasks[name] = task
+        return self._report(self._render_plots(tasks), {})
 
     def plot_sentiment_distribution(self, job_postings: List[Dict], save_path: str = None) -> None:
         """
@@ -171,26 +412,21 @@ class JobVisualizer:
             sentiment (str): Sentiment to filter ('positive', 'negative', or 'neutral')
             save_path (str, optional): Path to save the plot
         """
-        # Filter job descriptions by sentiment
-        filtered_descriptions = [
-            job['description'] for job in job_postings 
+        # Job descriptions with this sentiment, counted as they are read
+        filtered_descriptions = (
+            job['description'] for job in job_postings
             if job['sentiment_analysis']['overall_sentiment'] == sentiment
-        ]
+        )
+        frequencies = self._word_frequencies(filtered_descriptions, label=sentiment)
         
-        if not filtered_descriptions:
-            self.logger.warning(f"No job descriptions found with {sentiment} sentiment")
+        if not frequencies:
+            logger.warning(f"No job descriptions found with {sentiment} sentiment")
             return
         
-        # Generate word cloud
-        text = ' '.join(filtered_descriptions)
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-        
-        plt.figure(figsize=(10, 6))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title(f'Word Cloud for {sentiment.capitalize()} Job Descriptions')
-        
-        self._save_plot(plt, f'wordcloud_{sentiment}', save_path)
+        filepath = self._plot_path(f'wordcloud_{sentiment}')
+        render_word_cloud(frequencies, f'Word Cloud for {sentiment.capitalize()} Job Descriptions', (800, 400), filepath)
+        if save_path is not None:
+            save_path.append(filepath)
 
     def plot_sentiment_scores(self, job_postings: List[Dict], save_path: str = None) -> None:
         """
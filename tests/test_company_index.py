@@ -0,0 +1,84 @@
+from src.scrapers.job_scraper import JobScraper
+from src.utils.company_index import CompanySentimentIndex, normalize_company
+from src.utils.sentiment_analyzer import SentimentAnalyzer
+
+def analysis(compound: float, label: str) -> dict:
+    return {'vader_scores': {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': compound}, 'overall_sentiment': label}
+
+def job(company: str, url: str, compound: float, label: str) -> dict:
+    return {'company': company, 'url': url, 'description': '', 'sentiment_analysis': analysis(compound, label)}
+
+def test_normalize_company():
+    """Test that case, punctuation and legal suffixes don't split a company."""
+    assert normalize_company('Tech Corp.') == normalize_company('  tech  corp ') == 'tech'
+    assert normalize_company('Acme, Inc') == 'acme'
+    assert normalize_company('Company') == 'company'
+
+def test_index_aggregates_incrementally():
+    """Test that per-company totals update as postings arrive and re-indexing replaces them."""
+    index = CompanySentimentIndex()
+    index.update([
+        job('Tech Corp', 'https://example.com/job/1', 0.8, 'positive'),
+        job('Tech Corp.', 'https://example.com/job/2', 0.0, 'neutral'),
+        job('Other LLC', 'https://example.com/job/3', -0.6, 'negative'),
+    ])
+
+    assert index.get('tech corp') == {
+        'average_sentiment': 'positive',
+        'total_postings': 2,
+        'sentiment_distribution': {'positive': 1, 'neutral': 1, 'negative': 0},
+    }
+    assert index.get('Missing Co') is None
+
+    # The same posting seen again, with tracking parameters, replaces its earlier analysis
+    index.add(job('Tech Corp', 'https://example.com/job/1?utm_source=mail', -0.8, 'negative'))
+    assert len(index) == 3
+    assert index.get('Tech Corp') == {
+        'average_sentiment': 'negative',
+        'total_postings': 2,
+        'sentiment_distribution': {'positive': 0, 'neutral': 1, 'negative': 1},
+    }
+    assert index.companies() == ['Tech Corp', 'Other LLC']
+
+def test_index_matches_analyze_company_sentiment():
+    """Test that the index and analyze_company_sentiment agree on precomputed results."""
+    jobs = [job('Tech Corp', f'https://example.com/job/{i}', score, label)
+            for i, (score, label) in enumerate([(0.5, 'positive'), (-0.2, 'negative'), (0.05, 'neutral')])]
+    index = CompanySentimentIndex()
+    index.update(jobs)
+
+    assert SentimentAnalyzer('fast').analyze_company_sentiment(jobs) == index.get('Tech Corp')
+
+def test_company_lookup_crawls_once(monkeypatch):
+    """Test that company queries after the first are answered without crawling."""
+    scraper = JobScraper('https://example.com', sentiment_backends='fast')
+    crawls = []
+
+    def listings(start_url, max_pages=5, resume=False):
+        crawls.append(start_url)
+        yield {'company': 'Tech Corp', 'url': 'https://example.com/job/1',
+               'description': 'We offer a great team and excellent benefits.'}
+        yield {'company': 'Other Corp', 'url': 'https://example.com/job/2',
+               'description': 'Long hours and a stressful, terrible deadline.'}
+
+    monkeypatch.setattr(scraper, 'iter_job_listings', listings)
+
+    assert scraper.get_company_sentiment_analysis('Tech Corp')['average_sentiment'] == 'positive'
+    assert scraper.get_company_sentiment_analysis('other corp')['average_sentiment'] == 'negative'
+    assert scraper.get_company_sentiment_analysis('Nobody Inc')['total_postings'] == 0
+    assert len(crawls) == 1
+
+def test_empty_search_is_crawled_once(monkeypatch):
+    """Test that a search with no postings isn't crawled again on every company query."""
+    scraper = JobScraper('https://example.com', sentiment_backends='fast')
+    crawls = []
+
+    def listings(start_url, max_pages=5, resume=False):
+        crawls.append(start_url)
+        return iter(())
+
+    monkeypatch.setattr(scraper, 'iter_job_listings', listings)
+
+    assert scraper.get_company_sentiment_analysis('Tech Corp')['total_postings'] == 0
+    assert scraper.get_company_sentiment_analysis('Other Corp')['total_postings'] == 0
+    assert len(crawls) == 1
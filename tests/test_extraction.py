@@ -0,0 +1,44 @@
+from pathlib import Path
+import pytest
+from src.scrapers.job_scraper import IndeedScraper, LinkedInScraper
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'html'
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding='utf-8')
+
+def without_scraped_date(job: dict) -> dict:
+    return {key: value for key, value in job.items() if key != 'scraped_date'}
+
+@pytest.mark.parametrize('scraper_class, fixture', [
+    (IndeedScraper, 'indeed_search.html'),
+    (LinkedInScraper, 'linkedin_search.html'),
+])
+def test_listing_engines_agree(scraper_class, fixture):
+    """Test that the lxml fast path extracts the same cards and next page as BeautifulSoup."""
+    html = read_fixture(fixture)
+    fast_jobs, fast_next = scraper_class(extraction_engine='lxml')._parse_listing_page(html)
+    soup_jobs, soup_next = scraper_class(extraction_engine='bs4')._parse_listing_page(html)
+
+    assert fast_jobs
+    assert fast_jobs == soup_jobs
+    assert fast_next == soup_next
+
+@pytest.mark.parametrize('scraper_class, fixture', [
+    (IndeedScraper, 'indeed_job.html'),
+    (LinkedInScraper, 'linkedin_job.html'),
+])
+def test_detail_engines_agree(scraper_class, fixture):
+    """Test that the lxml fast path extracts the same job details as BeautifulSoup."""
+    html = read_fixture(fixture)
+    url = 'https://example.com/job/1'
+    fast = scraper_class(extraction_engine='lxml')._parse_detail_page(html, url)
+    soup = scraper_class(extraction_engine='bs4')._parse_detail_page(html, url)
+
+    assert fast['title'] and fast['description']
+    assert without_scraped_date(fast) == without_scraped_date(soup)
+
+def test_unknown_engine_rejected():
+    """Test that an unsupported extraction engine is rejected up front."""
+    with pytest.raises(ValueError):
+        IndeedScraper(extraction_engine='regex')
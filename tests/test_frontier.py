@@ -0,0 +1,82 @@
+import pytest
+from src.utils.frontier import CrawlFrontier
+
+START_URL = 'https://www.indeed.com/jobs?q=python&l=Remote'
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'frontier.sqlite')
+
+def make_jobs(page: int, count: int = 3):
+    return [{'title': f'Job {page}-{i}', 'url': f'https://example.com/job/{page}-{i}'} for i in range(count)]
+
+def test_fresh_crawl_starts_at_start_url(path):
+    """Test that a crawl with no checkpoint starts from scratch."""
+    frontier = CrawlFrontier(path)
+    assert frontier.start(START_URL, START_URL, resume=True) == ([], [], START_URL, 0)
+    frontier.close()
+
+def test_resume_after_crash(path):
+    """Test that an interrupted crawl resumes with completed records and pending detail pages."""
+    frontier = CrawlFrontier(path, batch_size=1)
+    frontier.start(START_URL, START_URL)
+
+    page_1 = make_jobs(1)
+    frontier.checkpoint_page(page_1, page_1, 'https://www.indeed.com/jobs?start=10')
+    for job in page_1:
+        job['description'] = 'done'
+        frontier.complete(job)
+
+    page_2 = make_jobs(2)
+    frontier.checkpoint_page(page_2, page_2[1:], 'https://www.indeed.com/jobs?start=20')
+    page_2[1]['description'] = 'done'
+    frontier.complete(page_2[1])
+    # Simulate a crash: the connection goes away without finish()
+    frontier._conn.close()
+
+    resumed = CrawlFrontier(path)
+    jobs, pending, next_url, pages_scraped = resumed.start(START_URL, START_URL, resume=True)
+
+    assert [job['title'] for job in jobs] == [job['title'] for job in page_1 + page_2]
+    assert [job['url'] for job in pending] == [page_2[2]['url']]
+    assert jobs[0]['description'] == 'done'
+    assert next_url == 'https://www.indeed.com/jobs?start=20'
+    assert pages_scraped == 2
+    resumed.close()
+
+def test_completions_are_batched(path):
+    """Test that detail completions only reach disk once a batch fills or the page checkpoints."""
+    frontier = CrawlFrontier(path, batch_size=10)
+    frontier.start(START_URL, START_URL)
+    jobs = make_jobs(1)
+    frontier.checkpoint_page(jobs, jobs, None)
+    frontier.complete(jobs[0])
+
+    on_disk = frontier._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'done'").fetchone()[0]
+    assert on_disk == 0
+
+    frontier.finish()
+    on_disk = frontier._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'done'").fetchone()[0]
+    assert on_disk == 1
+    frontier.close()
+
+def test_finished_crawl_is_not_resumed(path):
+    """Test that --resume after a completed crawl starts over."""
+    frontier = CrawlFrontier(path)
+    frontier.start(START_URL, START_URL)
+    jobs = make_jobs(1)
+    frontier.checkpoint_page(jobs, [], None)
+    frontier.finish()
+    frontier.close()
+
+    again = CrawlFrontier(path)
+    assert again.start(START_URL, START_URL, resume=True) == ([], [], START_URL, 0)
+    again.close()
+
+def test_each_site_checkpoints_to_its_own_file(tmp_path, monkeypatch):
+    """Test that scrapers for different sites, e.g. batch lanes, never share a frontier database."""
+    from src.main import build_scraper
+    monkeypatch.chdir(tmp_path)
+    indeed, linkedin = build_scraper('indeed', {}), build_scraper('linkedin', {})
+    assert indeed.frontier.path != linkedin.frontier.path
+    assert indeed.frontier.path.name == 'frontier_indeed.sqlite'
@@ -0,0 +1,84 @@
+import json
+import random
+from collections import Counter
+from src.main import main
+from src.utils.heavy_hitters import JobSketches, SpaceSaving
+from src.utils.visualization import JobVisualizer
+
+def zipf_stream(items: int, length: int, seed: int = 0):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, items + 1)]
+    return rng.choices([f'item{rank}' for rank in range(items)], weights=weights, k=length)
+
+def assert_bounds(summary: SpaceSaving, truth: Counter):
+    for entry in summary.top(len(summary)):
+        assert entry['lower'] <= truth[entry['item']] <= entry['count']
+    assert all(count <= summary.min_count() for item, count in truth.items() if item not in summary._counts)
+
+def test_exact_below_capacity():
+    """Test that counts are exact and guaranteed while every item fits."""
+    summary = SpaceSaving(capacity=10)
+    summary.update(['a', 'b', 'a', 'c', 'a', 'b'])
+    assert [(entry['item'], entry['count'], entry['error']) for entry in summary.top(3)] == \
+        [('a', 3, 0), ('b', 2, 0), ('c', 1, 0)]
+    assert all(entry['guaranteed'] for entry in summary.top(2))
+    assert summary.count('z') == (0, 0)
+
+def test_bounds_hold_on_skewed_stream():
+    """Test that estimates bracket the true counts and the heaviest items are found."""
+    stream = zipf_stream(5000, 50000)
+    truth = Counter(stream)
+    summary = SpaceSaving(capacity=200)
+    summary.update(stream)
+
+    assert len(summary) == 200 and summary.total == len(stream)
+    assert_bounds(summary, truth)
+    top = summary.top(5)
+    assert [entry['item'] for entry in top] == [item for item, _ in truth.most_common(5)]
+    assert top[0]['guaranteed']
+
+def test_merge_matches_bounds_of_union():
+    """Test that merged shard summaries keep the guarantees over the combined stream."""
+    stream = zipf_stream(3000, 30000, seed=1)
+    shards = [SpaceSaving(capacity=150) for _ in range(3)]
+    for index, item in enumerate(stream):
+        shards[index % 3].add(item)
+
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+    assert merged.total == len(stream) and len(merged) == 150
+    assert_bounds(merged, Counter(stream))
+
+def test_job_sketches_save_load_and_merge(tmp_path):
+    """Test that sketches from separate runs round-trip to disk and merge."""
+    first, second = JobSketches(capacity=5), JobSketches(capacity=5)
+    assert first.update([{'company': 'Tech Corp', 'location': 'Remote', 'job_type': 'Full-time'},
+                         {'company': 'Tech Corp', 'location': ' ', 'job_type': None}]) == 2
+    second.add({'company': 'Other Corp', 'location': 'Remote'})
+    first.save(str(tmp_path / 'first.json'))
+
+    merged = JobSketches.merge_all([JobSketches.load(str(tmp_path / 'first.json')), second])
+    assert [(entry['item'], entry['count']) for entry in merged.top('company')] == [('Tech Corp', 2), ('Other Corp', 1)]
+    assert merged.top('location') == [{'item': 'Remote', 'count': 2, 'error': 0, 'lower': 2, 'guaranteed': True}]
+
+def test_plot_from_sketches(tmp_path):
+    """Test that the count charts render from sketches alone."""
+    sketches = JobSketches(capacity=2)
+    sketches.update({'company': company, 'location': 'Remote', 'job_type': 'Full-time'} for company in 'aabcab')
+    timings = JobVisualizer(str(tmp_path), workers=1).plot_from_sketches(sketches)
+    assert set(timings) == {'jobs_by_company', 'jobs_by_location', 'job_types'}
+    assert (tmp_path / 'jobs_by_company_latest.png').exists()
+
+def test_sketch_command(tmp_path, capsys):
+    """Test that the sketch subcommand reads saved jobs and merges earlier sketches."""
+    jobs = tmp_path / 'jobs.jsonl'
+    jobs.write_text(''.join(json.dumps({'company': company, 'location': 'Remote'}) + '\n' for company in 'aab'))
+    earlier = JobSketches()
+    earlier.add({'company': 'b', 'location': 'Berlin'})
+    earlier.save(str(tmp_path / 'earlier.json'))
+    output = tmp_path / 'sketches.json'
+
+    main(['sketch', str(jobs), '--merge', str(tmp_path / 'earlier.json'), '--output', str(output)])
+
+    saved = JobSketches.load(str(output))
+    assert [(entry['item'], entry['count']) for entry in saved.top('company')] == [('a', 2), ('b', 2)]
+    assert 'Top location values:' in capsys.readouterr().out
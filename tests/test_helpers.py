@@ -0,0 +1,38 @@
+import csv
+from src.utils.helpers import CSVSink, JSONLSink, read_jsonl
+
+JOBS = [
+    {'title': 'Python Developer', 'company': 'Acme', 'url': 'https://example.com/job/1'},
+    {'title': 'Data Engineer', 'company': 'Globex', 'url': 'https://example.com/job/2', 'seen_before': True},
+]
+
+def test_jsonl_sink_flushes_each_record(tmp_path):
+    """Test that each record is readable from disk as soon as it is written."""
+    path = str(tmp_path / 'jobs.jsonl')
+    with JSONLSink(path) as sink:
+        sink.write(JOBS[0])
+        assert list(read_jsonl(path)) == JOBS[:1]
+        sink.write(JOBS[1])
+    assert list(read_jsonl(path)) == JOBS
+
+def test_csv_sink_uses_fixed_columns(tmp_path):
+    """Test that CSV rows follow the given columns, leaving missing fields empty."""
+    path = tmp_path / 'jobs.csv'
+    with CSVSink(str(path), fieldnames=['title', 'company', 'url', 'seen_before']) as sink:
+        for job in JOBS:
+            sink.write(job)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['title'] for row in rows] == ['Python Developer', 'Data Engineer']
+    assert [row['seen_before'] for row in rows] == ['', 'True']
+
+def test_sinks_append(tmp_path):
+    """Test that reopening a sink appends rather than truncating, with one CSV header."""
+    path = str(tmp_path / 'jobs.csv')
+    for job in JOBS:
+        with CSVSink(path) as sink:
+            sink.write(job)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        assert len(list(csv.DictReader(f))) == 2
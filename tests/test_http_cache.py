@@ -0,0 +1,106 @@
+import sqlite3
+import pytest
+from src.utils.http_cache import ResponseCache
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttls={'listing': 60, 'detail': 3600}, max_bytes=1000)
+    yield cache
+    cache.close()
+
+def test_miss_then_hit(cache):
+    """Test that a stored response is served as a hit with its body intact."""
+    url = 'https://www.indeed.com/viewjob?jk=1'
+    assert cache.lookup(url) is None
+
+    cache.store(url, {'Content-Type': 'text/html; charset=utf-8', 'ETag': '"abc"'}, 'café'.encode('utf-8'))
+    entry = cache.lookup(url)
+
+    assert cache.is_fresh(entry, 'detail')
+    assert entry.to_response().text == 'café'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_urls_are_normalized(cache):
+    """Test that query order, host case and fragments don't split cache entries."""
+    cache.store('https://WWW.indeed.com/jobs?q=python&l=Remote#top', {}, b'listing')
+    assert cache.lookup('https://www.indeed.com/jobs?l=Remote&q=python') is not None
+
+def test_ttl_depends_on_url_class(cache):
+    """Test that listing pages go stale sooner than detail pages."""
+    url = 'https://www.indeed.com/jobs?q=python'
+    cache.store(url, {}, b'listing')
+    entry = cache.get(url)
+    entry.stored_at -= 120
+
+    assert not cache.is_fresh(entry, 'listing')
+    assert cache.is_fresh(entry, 'detail')
+
+def test_revalidation(cache):
+    """Test conditional headers and TTL refresh on 304 Not Modified."""
+    url = 'https://www.indeed.com/viewjob?jk=2'
+    cache.store(url, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, b'body')
+    entry = cache.get(url)
+
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+
+    entry.stored_at -= 7200
+    assert not cache.is_fresh(entry, 'detail')
+    entry = cache.mark_revalidated(entry, {'ETag': '"v1"'})
+    assert cache.is_fresh(cache.get(url), 'detail')
+    assert cache.stats()['revalidated'] == 1
+
+def test_lru_eviction(cache):
+    """Test that least recently used entries are evicted past max_bytes."""
+    for i in range(4):
+        cache.store(f'https://example.com/{i}', {}, b'x' * 300)
+        if i == 2:
+            cache.get('https://example.com/0')
+
+    assert cache.get('https://example.com/0') is not None
+    assert cache.get('https://example.com/1') is None
+    assert cache.get('https://example.com/3') is not None
+    assert cache.stats()['size_bytes'] <= 1000
+
+def test_access_times_are_written_in_batches(tmp_path):
+    """Test that reads only record access times in memory until a batch fills or the cache is flushed."""
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ResponseCache(path, access_batch=3)
+    for i in range(3):
+        cache.store(f'https://example.com/{i}', {}, b'x')
+    reader = sqlite3.connect(path)
+
+    def accessed():
+        return dict(reader.execute("SELECT url, accessed_at FROM responses"))
+
+    before = accessed()
+    cache.get('https://example.com/0')
+    cache.get('https://example.com/1')
+    assert accessed() == before
+
+    cache.get('https://example.com/2')
+    assert all(accessed()[url] > before[url] for url in before)
+
+    cache.get('https://example.com/0')
+    cache.flush()
+    assert accessed()['https://example.com/0'] > accessed()['https://example.com/1']
+    cache.close()
+
+def test_no_store_is_respected(cache):
+    """Test that responses marked no-store are never cached."""
+    cache.store('https://example.com/private', {'Cache-Control': 'private, no-store'}, b'secret')
+    assert cache.get('https://example.com/private') is None
+
+def test_persists_across_instances(tmp_path):
+    """Test that entries survive reopening the cache file."""
+    path = str(tmp_path / 'cache.sqlite')
+    first = ResponseCache(path)
+    first.store('https://example.com/job', {}, b'saved')
+    first.close()
+
+    second = ResponseCache(path)
+    assert second.get('https://example.com/job').body == b'saved'
+    second.close()
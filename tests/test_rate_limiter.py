@@ -0,0 +1,106 @@
+import pytest
+from src.utils.rate_limiter import HostLimiter, RateLimiter, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_token_bucket_paces_requests(clock):
+    """Test that requests beyond the burst wait for tokens to refill."""
+    limiter = HostLimiter('example.com', {'rate': 1.0, 'burst': 1, 'concurrency': 4}, clock=clock)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert limiter.try_acquire() == 0
+
+def test_concurrency_limit(clock):
+    """Test that the number of requests in flight is capped."""
+    limiter = HostLimiter('example.com', {'rate': 100.0, 'burst': 10, 'concurrency': 1}, clock=clock)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() > 0
+
+    limiter.release(200)
+    assert limiter.try_acquire() == 0
+
+def test_additive_increase_on_success(clock):
+    """Test that healthy responses raise the rate and concurrency up to their ceilings."""
+    limiter = HostLimiter('example.com', {'rate': 1.0, 'max_rate': 1.1, 'rate_increase': 0.05,
+                                          'concurrency': 1, 'max_concurrency': 2}, clock=clock)
+
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release(200)
+        clock.now += 10
+
+    assert limiter.rate == pytest.approx(1.1)
+    assert int(limiter.concurrency) == 2
+
+def test_multiplicative_decrease_on_throttle(clock):
+    """Test that a 429 halves the rate and pauses the whole host."""
+    limiter = HostLimiter('example.com', {'rate': 2.0, 'concurrency': 4, 'backoff': 5.0}, clock=clock)
+
+    limiter.try_acquire()
+    limiter.release(429)
+
+    assert limiter.rate == pytest.approx(1.0)
+    assert int(limiter.concurrency) == 2
+    assert limiter.try_acquire() == pytest.approx(5.0)
+
+def test_retry_after_extends_pause(clock):
+    """Test that Retry-After overrides a shorter backoff."""
+    limiter = HostLimiter('example.com', {'backoff': 5.0}, clock=clock)
+
+    limiter.try_acquire()
+    limiter.release_response(503, {'Retry-After': '30'})
+
+    assert limiter.try_acquire() == pytest.approx(30.0)
+
+def test_backoff_doubles_and_resets(clock):
+    """Test that repeated throttles back off exponentially until a success resets it."""
+    limiter = HostLimiter('example.com', {'backoff': 5.0, 'rate': 100.0}, clock=clock)
+
+    limiter.release(403)
+    clock.now += 100
+    limiter.release(403)
+    assert limiter.blocked_until - clock.now == pytest.approx(10.0)
+
+    limiter.release(200)
+    limiter.release(403)
+    assert limiter.blocked_until - clock.now == pytest.approx(10.0)
+    clock.now += 100
+    limiter.release(200)
+    limiter.release(403)
+    assert limiter.blocked_until - clock.now == pytest.approx(5.0)
+
+def test_limiters_are_per_host_and_configurable(clock):
+    """Test that each host gets its own limiter with site-specific limits."""
+    rate_limiter = RateLimiter({'www.linkedin.com': {'rate': 0.3}}, clock=clock)
+
+    linkedin = rate_limiter.for_url('https://www.linkedin.com/jobs/view/1')
+    assert rate_limiter.for_url('https://www.linkedin.com/jobs/view/2') is linkedin
+    assert linkedin.rate == pytest.approx(0.3)
+    assert rate_limiter.for_url('https://www.indeed.com/viewjob').rate == pytest.approx(1.0)
+
+    rate_limiter.configure_host('www.linkedin.com', rate=0.1)
+    assert rate_limiter.for_url('https://www.linkedin.com/jobs').rate == pytest.approx(0.1)
+    assert set(rate_limiter.stats()) == {'www.linkedin.com', 'www.indeed.com'}
+
+def test_parse_retry_after():
+    """Test parsing of delta-seconds and HTTP-date Retry-After values."""
+    from datetime import datetime, timezone
+
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('Mon, 01 Jan 2024 12:01:00 GMT', now=now) == 60.0
+    assert parse_retry_after('not a date') is None
+    assert parse_retry_after(None) is None
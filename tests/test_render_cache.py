@@ -0,0 +1,53 @@
+import json
+import pandas as pd
+from src.utils.render_cache import RenderCache, render_key
+
+def render_bar(counts, title):
+    pass
+
+def render_pie(counts, title):
+    pass
+
+def test_render_key_tracks_data_and_parameters():
+    """Test that the key changes with the data, labels, render function and parameters only."""
+    counts = pd.Series([3, 1], index=['Tech Corp', 'Other Corp'])
+    key = render_key(render_bar, (counts, 'Top'), {'dpi': 300})
+
+    assert key == render_key(render_bar, (counts.copy(), 'Top'), {'dpi': 300})
+    assert key != render_key(render_bar, (pd.Series([3, 2], index=counts.index), 'Top'), {'dpi': 300})
+    assert key != render_key(render_bar, (pd.Series([3, 1], index=['Tech Corp', 'Third Co']), 'Top'), {'dpi': 300})
+    assert key != render_key(render_pie, (counts, 'Top'), {'dpi': 300})
+    assert key != render_key(render_bar, (counts, 'Top'), {'dpi': 150})
+
+def test_lookup_and_record(tmp_path):
+    """Test that a recorded render is found by its key and counted as a hit."""
+    cache = RenderCache(str(tmp_path))
+    assert cache.lookup('jobs_by_company', 'a') is None
+
+    (tmp_path / 'jobs_by_company_1.png').write_bytes(b'png')
+    cache.record('jobs_by_company', 'a', tmp_path / 'jobs_by_company_1.png', 2.5)
+    cache.save()
+
+    reloaded = RenderCache(str(tmp_path))
+    assert reloaded.lookup('jobs_by_company', 'a') == tmp_path / 'jobs_by_company_1.png'
+    assert reloaded.stats() == {'hits': 1, 'misses': 0, 'saved_seconds': 2.5}
+    assert (tmp_path / 'jobs_by_company_latest.png').read_bytes() == b'png'
+
+def test_prune_keeps_recent_and_current(tmp_path):
+    """Test that old renders are removed by count and age, but never the current one."""
+    cache = RenderCache(str(tmp_path), keep=2)
+    for key in 'abc':
+        (tmp_path / f'plot_{key}.png').write_bytes(key.encode())
+        cache.record('plot', key, tmp_path / f'plot_{key}.png', 1.0)
+
+    assert [render['key'] for render in cache.manifest['plots']['plot']['renders']] == ['c', 'b']
+    assert not (tmp_path / 'plot_a.png').exists()
+
+    # Going back to an older render makes it current, so it survives pruning by age
+    assert cache.lookup('plot', 'b') is not None
+    cache.max_age_days = 0
+    cache.prune('plot')
+    assert [render['key'] for render in cache.manifest['plots']['plot']['renders']] == ['b']
+    assert sorted(path.name for path in tmp_path.glob('plot_?.png')) == ['plot_b.png']
+    cache.save()
+    assert json.loads((tmp_path / 'manifest.json').read_text())['plots']['plot']['latest'] == 'plot_b.png'
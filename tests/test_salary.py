@@ -0,0 +1,66 @@
+import json
+import pytest
+from src.utils.notifications import JobNotifier
+from src.utils.salary import SALARY_COLUMNS, add_salaries, parse_salaries, parse_salary
+
+@pytest.mark.parametrize('text, expected', [
+    ('$120,000 - $150,000', (120000, 150000, 135000, 'USD', 'year')),
+    ('$120,000 - $150,000 a year', (120000, 150000, 135000, 'USD', 'year')),
+    ('50-60K', (50000, 60000, 55000, None, 'year')),
+    ('$50,000-60k', (50000, 60000, 55000, 'USD', 'year')),
+    ('£45K to £55K per annum', (45000, 55000, 50000, 'GBP', 'year')),
+    ('EUR 1.2M', (1200000, 1200000, 1200000, 'EUR', 'year')),
+    ('$25 - $35 an hour', (52000, 72800, 62400, 'USD', 'hour')),
+    ('$500 a day', (130000, 130000, 130000, 'USD', 'day')),
+    ('$1,500 weekly', (78000, 78000, 78000, 'USD', 'week')),
+    ('$6,500 per month', (78000, 78000, 78000, 'USD', 'month')),
+    ('Up to $80,000.00 a year', (80000, 80000, 80000, 'USD', 'year')),
+    ('Competitive', (None, None, None, None, None)),
+    ('', (None, None, None, None, None)),
+    (None, (None, None, None, None, None)),
+])
+def test_parse_salary(text, expected):
+    """Test ranges, suffixes, currencies and annualization of hourly to monthly pay."""
+    assert tuple(parse_salary(text)[column] for column in SALARY_COLUMNS) == expected
+
+def test_parse_salaries_keeps_alignment():
+    """Test that the column result lines up with the input, repeated values included."""
+    salaries = ['$100K', None, '$100K', '$20 an hour']
+    parsed = parse_salaries(salaries)
+    assert list(parsed.columns) == list(SALARY_COLUMNS)
+    assert parsed['salary_mid'].tolist()[::2] == [100000, 100000]
+    assert parsed['salary_mid'].isna().tolist() == [False, True, False, False]
+    assert parsed['salary_max'].iloc[3] == 41600
+
+def test_add_salaries_streams_each_job():
+    """Test that jobs from a stream get plain numeric salary fields, each as soon as it arrives."""
+    jobs = [{'salary': '$90K - $110K'}, {'salary': ''}, {'salary': '$40/hr'}]
+
+    def stream():
+        yield from jobs
+        raise AssertionError('read past the jobs consumed')
+
+    annotated = [job for _, job in zip(jobs, add_salaries(stream()))]
+    assert annotated[0]['salary_mid'] == 100000.0 and type(annotated[0]['salary_mid']) is float
+    assert annotated[1]['salary_min'] is None
+    assert annotated[2]['salary_period'] == 'hour'
+    json.dumps(annotated)
+
+def test_notifier_filters_on_minimum_salary(tmp_path, monkeypatch):
+    """Test that matching jobs below the minimum annual salary are not notified."""
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'notifications.json'
+    config.write_text(json.dumps({'email': {'enabled': False}, 'keywords': ['python'],
+                                  'min_salary': 100000, 'include_unknown_salary': False}))
+    jobs = [
+        {'title': 'Python Developer', 'salary': '$80K - $120K', 'url': 'a'},
+        {'title': 'Python Developer', 'salary': '$30 an hour', 'url': 'b'},
+        {'title': 'Python Developer', 'salary': '', 'url': 'c'},
+    ]
+    assert [job['url'] for job in JobNotifier(str(config)).check_new_jobs(jobs)] == ['a']
+
+    # Already annotated jobs are judged by their salary_max, not re-parsed
+    annotated = [{'title': 'Python Developer', 'salary': '$500K', 'salary_max': 90000.0, 'url': 'd'},
+                 {'title': 'Python Developer', 'salary': '', 'salary_max': None, 'url': 'e'},
+                 {'title': 'Python Developer', 'salary': '$150K', 'url': 'f'}]
+    assert [job['url'] for job in JobNotifier(str(config)).check_new_jobs(annotated)] == ['f']
@@ -0,0 +1,205 @@
+import time
+from pathlib import Path
+import pytest
+import requests
+from src.main import filename_part
+from src.scrapers.async_engine import AsyncFetcher
+from src.scrapers.batch import BatchScheduler
+from src.scrapers.example_scraper import ExampleScraper
+from src.scrapers.job_scraper import IndeedScraper, LinkedInScraper
+from src.utils.rate_limiter import RateLimiter
+from src.utils.replay import Recorder, ReplayServer, ResponseArchive
+from src.utils.transport import Transport
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'html'
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+INDEED_SEARCH = 'https://www.indeed.com/jobs?q=python&l=Remote'
+LINKEDIN_SEARCH = 'https://www.linkedin.com/jobs/search/?keywords=python&location=Remote'
+
+# Generous limits for the local stand-ins, with backoff short enough for tests
+FAST_LIMITS = {'rate': 1000.0, 'max_rate': 1000.0, 'burst': 50, 'concurrency': 4, 'max_concurrency': 4,
+               'backoff': 0.05, 'max_backoff': 0.2}
+
+def fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+@pytest.fixture
+def archive(tmp_path):
+    """Two results pages per site, with every job card's detail page recorded."""
+    archive = ResponseArchive(str(tmp_path / 'responses.jsonl'))
+    for start in ('', '&start=10'):
+        archive.add(INDEED_SEARCH + start, 200, HTML, fixture('indeed_search.html'))
+    for i in range(15):
+        archive.add(f'https://www.indeed.com/rc/clk?jk={i:016x}&from=serp&vjs=3', 200, HTML,
+                    fixture('indeed_job.html'))
+    for start in ('', '&start=25'):
+        archive.add(LINKEDIN_SEARCH + start, 200, HTML, fixture('linkedin_search.html'))
+    for i in range(25):
+        archive.add(f'https://www.linkedin.com/jobs/view/{3800000000 + i}/?refId=abc&trackingId=xyz{i}'
+                    f'&trk=public_jobs_jserp-result_search-card', 200, HTML, fixture('linkedin_job.html'))
+    archive.add('https://example.com/', 200, HTML,
+                b'<html><body><a href="/jobs">Jobs</a><a href="https://example.com/about">About</a></body></html>')
+    return archive
+
+def replay_scraper(scraper_class, server: ReplayServer, site_url: str, **kwargs):
+    scraper = scraper_class(base_url=server.url_for(site_url), **kwargs)
+    scraper.rate_limiter = RateLimiter()
+    server.configure_rate_limiter(scraper.rate_limiter, **FAST_LIMITS)
+    return scraper
+
+def test_archive_round_trip(archive):
+    """Test that a saved archive reloads with its bodies and origins intact."""
+    archive.add('https://www.indeed.com/logo.png', 200, {'Content-Type': 'image/png'}, b'\x89PNG\xff')
+    archive.save()
+
+    reloaded = ResponseArchive(str(archive.path))
+    assert len(reloaded) == len(archive)
+    assert ResponseArchive.body(reloaded.get('https://www.indeed.com/logo.png')) == b'\x89PNG\xff'
+    assert ResponseArchive.body(reloaded.get(INDEED_SEARCH)) == fixture('indeed_search.html')
+    assert reloaded.origins()['www.linkedin.com'] == 'https://www.linkedin.com'
+
+def test_recorder_captures_replayed_responses(archive, tmp_path):
+    """Test that responses seen by a session are recorded and can be served again."""
+    copy = ResponseArchive(str(tmp_path / 'copy.jsonl'))
+    recorder = Recorder(copy)
+    session = requests.Session()
+    recorder.attach(session)
+    with ReplayServer(archive) as server:
+        session.get(server.url_for('https://example.com/'))
+    recorder.detach(session)
+
+    assert recorder.recorded == 1
+    assert len(copy) == 1
+
+def test_replay_server_start_failure_is_raised(archive, monkeypatch):
+    """Test that an error while starting the server is raised by start() instead of hanging it."""
+    async def fail(self):
+        raise OSError('address in use')
+
+    monkeypatch.setattr(ReplayServer, '_start_sites', fail)
+    with pytest.raises(OSError, match='address in use'):
+        ReplayServer(archive).start()
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_indeed_scrape_offline(archive, concurrency):
+    """Test a full Indeed crawl, listing pages and details, against the replay server."""
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com', concurrency=concurrency)
+        jobs = scraper.scrape_job_listings(server.url_for(INDEED_SEARCH), max_pages=2)
+
+    assert len(jobs) == 30
+    assert all(job['description'] for job in jobs)
+    assert server.stats()['missing'] == 0
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_linkedin_scrape_offline(archive, concurrency):
+    """Test that absolute LinkedIn job links are rewritten to the local stand-in."""
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(LinkedInScraper, server, 'https://www.linkedin.com', concurrency=concurrency)
+        jobs = scraper.scrape_job_listings(server.url_for(LINKEDIN_SEARCH), max_pages=2)
+
+    assert len(jobs) == 50
+    assert all(job['url'].startswith(server.bases['www.linkedin.com']) for job in jobs)
+    assert all(job['description'] for job in jobs)
+
+def test_pipelined_crawl_waits_for_slow_consumer(archive):
+    """Test that a concurrent crawl stops fetching while its jobs are not being consumed."""
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com', concurrency=2)
+        jobs = scraper.iter_job_listings(server.url_for(INDEED_SEARCH), max_pages=2)
+        first = next(jobs)
+        time.sleep(0.5)
+        assert server.stats()['requests'] < 20
+        assert len([first, *jobs]) == 30
+
+        # Closing early cancels the crawl instead of leaving it blocked on a full hand-off
+        jobs = scraper.iter_job_listings(server.url_for(INDEED_SEARCH), max_pages=2)
+        next(jobs)
+        time.sleep(0.2)
+        jobs.close()
+
+class FailingCache:
+    """Cache stand-in whose writes fail."""
+
+    def lookup(self, url, url_class):
+        return None
+
+    def store(self, url, headers, body):
+        raise OSError('disk full')
+
+def test_async_fetch_releases_host_slot_on_failure(archive):
+    """Test that a request ending in an unexpected error still frees its host's slot."""
+    with ReplayServer(archive) as server:
+        limiter = RateLimiter()
+        server.configure_rate_limiter(limiter, **FAST_LIMITS)
+        fetcher = AsyncFetcher(dict, concurrency=2, rate_limiter=limiter, cache=FailingCache())
+        with pytest.raises(OSError):
+            fetcher.fetch_many([server.url_for(INDEED_SEARCH)])
+
+    assert all(host['in_flight'] == 0 for host in limiter.stats().values())
+
+def test_concurrent_crawl_reports_connection_reuse(archive):
+    """Test that requests sent by the concurrent fetcher appear in the transport's reuse statistics."""
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com', concurrency=4)
+        scraper.transport = Transport()
+        scraper.scrape_job_listings(server.url_for(INDEED_SEARCH), max_pages=1)
+
+    (stats,) = scraper.transport.stats().values()
+    assert stats['requests'] == 16
+    assert stats['connections'] <= 5 and stats['reuse_ratio'] > 0.5
+
+def test_scraper_recovers_from_403_burst(archive):
+    """Test that bursts of 403s are backed off and retried without losing jobs."""
+    with ReplayServer(archive, throttle_every=10, throttle_burst=1, retry_after=0) as server:
+        scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com')
+        jobs = scraper.scrape_job_listings(server.url_for(INDEED_SEARCH), max_pages=1)
+        limiter_stats = scraper.rate_limiter.stats()[server.bases['www.indeed.com'][len('http://'):]]
+
+    assert len(jobs) == 15
+    assert all(job['description'] for job in jobs)
+    assert server.stats()['throttled'] > 0
+    assert limiter_stats['throttled'] == server.stats()['throttled']
+    assert limiter_stats['latency_p50'] is not None
+
+def test_example_scraper_offline(archive):
+    """Test that ExampleScraper extracts every link from a replayed page."""
+    with ReplayServer(archive) as server:
+        scraper = ExampleScraper(server.url_for('https://example.com/'))
+        results = scraper.scrape_page(server.url_for('https://example.com/'))
+
+    assert [result['text'] for result in results] == ['Jobs', 'About']
+    assert results[1]['url'] == server.url_for('https://example.com/about')
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_iter_job_listings_streams_jobs(archive, concurrency):
+    """Test that jobs are yielded before the crawl ends and closing early stops it."""
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com', concurrency=concurrency)
+        stream = scraper.iter_job_listings(server.url_for(INDEED_SEARCH), max_pages=2)
+        first = next(stream)
+        served_at_first = server.stats()['served']
+        stream.close()
+
+    assert first['description']
+    assert served_at_first < 32
+
+def test_batch_lane_analyzes_with_one_warm_scraper(archive):
+    """Test that batch searches on one site share a scraper and are annotated with sentiment."""
+    built = []
+    with ReplayServer(archive) as server:
+        def factory(site):
+            scraper = replay_scraper(IndeedScraper, server, 'https://www.indeed.com', sentiment_backends='vader')
+            built.append(scraper)
+            return scraper
+
+        scheduler = BatchScheduler(factory, lambda site, query, location: server.url_for(INDEED_SEARCH), analyze=True)
+        searches = [{'site': 'indeed', 'query': 'python', 'location': location, 'max_pages': 1}
+                    for location in ('Remote', 'New York, NY')]
+        results = scheduler.run(searches)
+
+    assert len(built) == 1
+    assert [len(result['jobs']) for result in results] == [15, 15]
+    assert all('sentiment_analysis' in job for result in results for job in result['jobs'])
+    assert filename_part('New York, NY') == 'New-York-NY' and filename_part('c++/') == 'c++'
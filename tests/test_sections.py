@@ -0,0 +1,68 @@
+import json
+import pytest
+from src.main import main
+from src.utils.sections import SectionFilter, fingerprint, split_sections
+from src.utils.sentiment_analyzer import SentimentAnalyzer
+
+EEO = ('We are an equal opportunity employer. All qualified applicants will receive consideration '
+       'for employment without regard to race, color, religion, sex or national origin.')
+
+def test_split_sections_separates_run_together_items():
+    """Test that sentences and list items joined by text extraction are split apart."""
+    text = 'We build services. You will own them!Responsibility 0: build.Responsibility 1: operate. e.g. python'
+    assert split_sections(text) == ['We build services.', 'You will own them!', 'Responsibility 0: build.',
+                                    'Responsibility 1: operate.', 'e.g.', 'python']
+
+def test_fingerprint_ignores_case_numbers_and_punctuation():
+    """Test that trivially different copies of a section share a fingerprint."""
+    assert fingerprint('Apply by 2024-01-31!') == fingerprint('apply  by 2025-06-30.')
+    assert fingerprint('Apply now') != fingerprint('Apply later')
+
+def test_filter_drops_boilerplate_and_caps_budget():
+    """Test that known boilerplate is dropped and the token budget truncates the rest."""
+    section_filter = SectionFilter({fingerprint(sentence) for sentence in split_sections(EEO)}, max_tokens=6)
+    description = f'Great team and benefits. {EEO} Flexible hours and remote work available.'
+
+    assert section_filter.sections(description) == ['Great team and benefits.', 'Flexible hours']
+    assert SectionFilter(max_tokens=None).sections(description) == split_sections(description)
+
+def test_learn_from_corpus_frequency(tmp_path):
+    """Test that sections common across the corpus are learned and survive a save and load."""
+    corpus = [f'Role {i} builds product {"abcdefghij"[i]}. {EEO}' for i in range(10)]
+    corpus += ['A one-off posting. Nothing shared.']
+    section_filter = SectionFilter.learn(corpus, min_share=0.5, min_documents=3, max_tokens=100)
+
+    assert section_filter.fingerprints == {fingerprint(sentence) for sentence in split_sections(EEO)}
+    section_filter.save(str(tmp_path / 'boilerplate.json'))
+    reloaded = SectionFilter.load(str(tmp_path / 'boilerplate.json'), max_tokens=50)
+    assert reloaded.fingerprints == section_filter.fingerprints
+    assert reloaded.max_tokens == 50
+
+def test_analyzer_scores_without_boilerplate():
+    """Test that boilerplate no longer sways the score and long descriptions are combined by section."""
+    section_filter = SectionFilter({fingerprint(sentence) for sentence in split_sections(EEO)}, max_tokens=None)
+    analyzer = SentimentAnalyzer('fast', sections=section_filter)
+    plain = SentimentAnalyzer('fast')
+
+    description = f'Long hours and a stressful, terrible deadline. {EEO}'
+    assert analyzer.analyze_job_description(description) == plain.analyze_job_description(
+        'Long hours and a stressful, terrible deadline.'
+    )
+
+    mixed = 'We offer a great team and excellent benefits. Long hours and a stressful deadline.'
+    result = analyzer.analyze_job_description(mixed)
+    parts = [plain.analyze_job_description(section)['vader_scores']['compound'] for section in split_sections(mixed)]
+    assert result['vader_scores']['compound'] == pytest.approx((parts[0] * 8 + parts[1] * 6) / 14)
+    assert list(analyzer.analyze_many([mixed, None])) == [result, analyzer._neutral_result()]
+
+def test_learn_boilerplate_command(tmp_path):
+    """Test that the boilerplate subcommand learns from saved JSONL jobs."""
+    jobs = tmp_path / 'jobs.jsonl'
+    jobs.write_text(''.join(json.dumps({'description': f'Role {name}. {EEO}'}) + '\n' for name in 'abcdef'))
+    output = tmp_path / 'boilerplate.json'
+
+    main(['boilerplate', str(jobs), '--output', str(output), '--token-budget', '200'])
+
+    saved = json.loads(output.read_text())
+    assert saved['max_tokens'] == 200
+    assert len(saved['fingerprints']) == len(split_sections(EEO))
@@ -0,0 +1,52 @@
+import time
+import pytest
+from src.utils.helpers import canonicalize_url
+from src.utils.seen_index import SeenIndex
+
+@pytest.fixture
+def index(tmp_path):
+    index = SeenIndex(str(tmp_path / 'seen.sqlite'), batch_size=2)
+    yield index
+    index.close()
+
+def test_canonicalize_strips_tracking_parameters():
+    """Test that tracking parameters and cosmetic differences don't change the canonical URL."""
+    assert canonicalize_url(
+        'https://www.linkedin.com/jobs/view/3800000001/?refId=abc&trackingId=xyz&trk=public_jobs'
+    ) == 'https://www.linkedin.com/jobs/view/3800000001'
+    assert canonicalize_url(
+        'https://WWW.indeed.com/rc/clk?vjs=3&jk=0123abcd&from=serp&utm_source=mail'
+    ) == 'https://www.indeed.com/rc/clk?jk=0123abcd'
+
+def test_unseen_urls_are_due(index):
+    """Test that URLs never fetched are due and fetched ones are skipped."""
+    urls = ['https://example.com/job/1', 'https://example.com/job/2']
+    assert index.due(urls) == set(urls)
+
+    index.mark_fetched('https://example.com/job/1?utm_campaign=hourly')
+    assert index.due(urls) == {'https://example.com/job/2'}
+    assert index.skipped == 1
+
+def test_refresh_after_age(tmp_path):
+    """Test that known URLs become due again once older than refresh_after."""
+    index = SeenIndex(str(tmp_path / 'seen.sqlite'), refresh_after=3600)
+    index.mark_fetched('https://example.com/job/old', fetched_at=time.time() - 7200)
+    index.mark_fetched('https://example.com/job/new')
+
+    assert index.due(['https://example.com/job/old', 'https://example.com/job/new']) == {
+        'https://example.com/job/old'
+    }
+    index.close()
+
+def test_persists_across_runs(tmp_path):
+    """Test that the index survives reopening, including writes still batched in memory."""
+    path = str(tmp_path / 'seen.sqlite')
+    first = SeenIndex(path, batch_size=100)
+    for i in range(3):
+        first.mark_fetched(f'https://example.com/job/{i}')
+    first.close()
+
+    second = SeenIndex(path)
+    assert len(second) == 3
+    assert second.due([f'https://example.com/job/{i}' for i in range(4)]) == {'https://example.com/job/3'}
+    second.close()
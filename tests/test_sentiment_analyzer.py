@@ -84,4 +84,76 @@ def test_company_sentiment_empty_list(sentiment_analyzer):
     result = sentiment_analyzer.analyze_company_sentiment([])
     assert result['average_sentiment'] == 'neutral'
     assert result['total_postings'] == 0
-    assert result['sentiment_distribution'] == {'positive': 0, 'neutral': 0, 'negative': 0} 
\ No newline at end of file
+    assert result['sentiment_distribution'] == {'positive': 0, 'neutral': 0, 'negative': 0} 
+
+def test_missing_nltk_resource_is_not_downloaded(monkeypatch):
+    """Test that a missing NLTK resource raises instead of triggering a download."""
+    from src.utils import sentiment_analyzer
+    monkeypatch.setattr(sentiment_analyzer, 'NLTK_RESOURCES', {'missing_corpus': 'corpora/missing_corpus'})
+    monkeypatch.setattr(sentiment_analyzer, '_models', {})
+    with pytest.raises(LookupError, match='missing_corpus'):
+        SentimentAnalyzer().sia
+
+def test_analyze_many_matches_single_calls(sentiment_analyzer):
+    """Test that batched analysis gives exactly the per-description results, in order."""
+    descriptions = [
+        'Join our amazing team with great benefits!',
+        'Long hours under constant pressure.',
+        '',
+        None,
+        'Standard position with regular hours.',
+    ] * 5
+
+    expected = [sentiment_analyzer.analyze_job_description(d) for d in descriptions]
+    assert list(sentiment_analyzer.analyze_many(descriptions, batch_size=4)) == expected
+    with pytest.warns(DeprecationWarning):
+        assert list(sentiment_analyzer.analyze_many(descriptions, batch_size=4, n_process=2)) == expected
+
+def test_resolve_backends():
+    """Test that profiles, comma-separated lists and sequences select engines."""
+    from src.utils.sentiment_analyzer import resolve_backends
+    assert resolve_backends('full') == ('textblob', 'vader', 'spacy')
+    assert resolve_backends('fast') == ('vader',)
+    assert resolve_backends('vader, textblob') == ('vader', 'textblob')
+    assert resolve_backends(['spacy']) == ('spacy',)
+    with pytest.raises(ValueError):
+        resolve_backends('vader,sentiwordnet')
+
+def test_fast_profile_uses_only_vader():
+    """Test that the fast profile reports VADER alone and labels by its compound score."""
+    analyzer = SentimentAnalyzer('fast')
+    result = analyzer.analyze_job_description('Join our amazing team with great benefits!')
+
+    assert set(result) == {'vader_scores', 'overall_sentiment'}
+    assert result['overall_sentiment'] == analyzer._get_sentiment_label(result['vader_scores']['compound'])
+    assert list(analyzer.analyze_many(['Join our amazing team with great benefits!'])) == [result]
+
+def test_overall_sentiment_averages_enabled_engines():
+    """Test that the overall label averages only the engines that ran."""
+    analyzer = SentimentAnalyzer('vader,textblob')
+    assert analyzer._calculate_overall_sentiment({'vader': 0.5, 'textblob': -0.1}) == 'positive'
+    assert analyzer._calculate_overall_sentiment({'vader': 0.1, 'textblob': -0.2}) == 'neutral'
+
+@pytest.mark.parametrize('backends', ['fast', 'full'])
+def test_worker_pool_matches_serial(backends):
+    """Test that pooled analysis returns the serial results in input order, with per-worker stats."""
+    descriptions = [
+        'Join our amazing team with great benefits!',
+        'Long hours, low pay and a stressful environment.',
+        'Standard position with regular hours.',
+        '',
+    ] * 10
+    expected = list(SentimentAnalyzer(backends).analyze_many(descriptions))
+
+    analyzer = SentimentAnalyzer(backends, workers=2)
+    analyzer.prewarm()
+    analyzer.pool.chunk_size = 3
+    try:
+        assert list(analyzer.analyze_many(descriptions)) == expected
+        stats = analyzer.pool.stats()
+    finally:
+        analyzer.close()
+
+    assert sum(worker['documents'] for worker in stats.values()) == len(descriptions)
+    assert all(worker['peak_rss_mb'] for worker in stats.values())
+    assert analyzer.pool is None
@@ -0,0 +1,65 @@
+import pytest
+from src.utils.sentiment_analyzer import SentimentAnalyzer
+from src.utils.sentiment_cache import SentimentCache
+
+RESULT = {'vader_scores': {'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.6}, 'overall_sentiment': 'positive'}
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SentimentCache(str(tmp_path / 'sentiment.sqlite'), memory_entries=2, batch_size=2)
+    yield cache
+    cache.close()
+
+def test_key_ignores_whitespace_but_not_fingerprint():
+    """Test that keys match across whitespace differences and differ across model versions."""
+    assert SentimentCache.key('Great  team,\n great pay', 'vader=3.8') == SentimentCache.key('Great team, great pay', 'vader=3.8')
+    assert SentimentCache.key('Great team', 'vader=3.8') != SentimentCache.key('Great team', 'vader=3.9')
+
+def test_memory_and_disk_hits(tmp_path):
+    """Test that results are served from memory, then from disk once evicted from the LRU."""
+    cache = SentimentCache(str(tmp_path / 'sentiment.sqlite'), memory_entries=2, batch_size=2)
+    keys = [SentimentCache.key(f'description {i}', 'vader=3.8') for i in range(3)]
+    for key in keys:
+        cache.put(key, 'vader', 'vader=3.8', RESULT)
+
+    assert cache.get(keys[2]) == RESULT
+    assert cache.get(keys[0]) == RESULT  # Pushed out of the 2-entry LRU
+    assert cache.get(SentimentCache.key('unseen', 'vader=3.8')) is None
+    assert cache.stats() == {'memory_hits': 1, 'disk_hits': 1, 'misses': 1, 'hit_rate': 0.667, 'memory_entries': 2}
+
+    cache.close()
+    reopened = SentimentCache(str(tmp_path / 'sentiment.sqlite'))
+    assert reopened.get(keys[1]) == RESULT
+    reopened.close()
+
+def test_invalidate_drops_other_versions(cache):
+    """Test that results from older model versions of the same backends are removed."""
+    cache.put(b'old', 'vader', 'vader=3.7', RESULT)
+    cache.put(b'new', 'vader', 'vader=3.8', RESULT)
+    cache.put(b'other', 'textblob', 'textblob=0.17', RESULT)
+
+    assert cache.invalidate('vader', 'vader=3.8') == 1
+    assert len(cache) == 2
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    """Test that the store is trimmed least-recently-used first past max_entries."""
+    cache = SentimentCache(str(tmp_path / 'sentiment.sqlite'), max_entries=10, batch_size=1)
+    for i in range(20):
+        cache.put(bytes([i]), 'vader', 'vader=3.8', RESULT)
+    assert len(cache) <= 10
+    cache._memory.clear()
+    assert cache.get(bytes([19])) == RESULT
+    cache.close()
+
+def test_analyzer_reuses_cached_results(cache):
+    """Test that the analyzer answers repeated descriptions from the cache with identical results."""
+    analyzer = SentimentAnalyzer('fast', cache=cache)
+    descriptions = ['We offer a great team and excellent benefits.', 'Long hours and a stressful deadline.']
+
+    first = list(analyzer.analyze_many(descriptions))
+    second = list(analyzer.analyze_many(descriptions + [descriptions[0]]))
+
+    assert second == first + [first[0]]
+    assert analyzer.analyze_job_description(descriptions[1]) == first[1]
+    assert cache.misses == 2
+    assert cache.stats()['hit_rate'] == pytest.approx(4 / 6, abs=0.001)
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only load when their feature is used
+HEAVY_MODULES = ('spacy', 'nltk', 'textblob', 'pandas', 'matplotlib', 'seaborn')
+
+# Generous ceiling for CI machines; a plain import stays far below it, while
+# eagerly loading spaCy or the plotting stack blows through it
+IMPORT_BUDGET_SECONDS = 1.5
+
+def import_times(statement: str) -> Dict[str, float]:
+    """Run `statement` under python -X importtime; map each module imported to its cumulative seconds."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+@pytest.mark.parametrize('module', ['src.main', 'src.scrapers.job_scraper', 'src.utils.sentiment_analyzer'])
+def test_no_heavy_imports_at_startup(module):
+    """Test that importing the CLI and scrapers doesn't pull in NLP or plotting libraries."""
+    times = import_times(f'import {module}')
+    loaded = sorted({name.split('.')[0] for name in times} & set(HEAVY_MODULES))
+    assert loaded == []
+
+def test_import_time_budget():
+    """Test that importing the CLI stays within the startup budget."""
+    times = import_times('import src.main')
+    assert times['src.main'] < IMPORT_BUDGET_SECONDS
+
+def test_analyzer_construction_loads_nothing():
+    """Test that constructing an analyzer defers model loading to first use."""
+    times = import_times(
+        'from src.utils.sentiment_analyzer import SentimentAnalyzer, _models; '
+        'SentimentAnalyzer(); assert not _models'
+    )
+    assert 'spacy' not in times
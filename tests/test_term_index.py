@@ -0,0 +1,64 @@
+from src.utils.term_index import TermFrequencyIndex, term_frequencies, tokenize
+from src.utils.visualization import JobVisualizer
+
+def job(url, description, sentiment=None):
+    posting = {'url': url, 'description': description}
+    if sentiment:
+        posting['sentiment_analysis'] = {'overall_sentiment': sentiment}
+    return posting
+
+def test_tokenize_drops_stopwords_and_keeps_symbols():
+    """Test that tokens are lowercased, stopwords dropped and C++/C# kept whole."""
+    assert tokenize('We need C++ and C# skills, and the Python!') == ['need', 'c++', 'c#', 'skills', 'python']
+    assert tokenize(None) == []
+    assert term_frequencies(['python python', 'python sql']) == {'python': 3, 'sql': 1}
+
+def test_counts_overall_and_per_label(tmp_path):
+    """Test that counts accumulate per label and overall, and survive a reopen."""
+    index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'), batch_size=2)
+    index.update([
+        job('https://example.com/1', 'Great team, great benefits', 'positive'),
+        job('https://example.com/2', 'Stressful team deadlines', 'negative'),
+        job('https://example.com/3', 'Python team'),
+    ])
+    index.close()
+
+    index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'))
+    assert index.frequencies(limit=2) == {'team': 3, 'great': 2}
+    assert index.frequencies('positive') == {'great': 2, 'team': 1, 'benefits': 1}
+    assert index.frequencies('neutral') == {}
+    assert len(index) == 3
+
+def test_postings_are_counted_once(tmp_path):
+    """Test that a posting seen again, under an equivalent URL, isn't counted twice."""
+    index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'))
+    assert index.add(job('https://example.com/1?utm_source=feed', 'python python'))
+    assert not index.add(job('https://example.com/1', 'python python'))
+    index.flush()
+    assert not index.add(job('https://example.com/1', 'python python'))
+    assert index.frequencies() == {'python': 2}
+
+def test_label_is_counted_when_it_first_appears(tmp_path):
+    """Test that a posting indexed without sentiment is counted under its label when seen with one."""
+    index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'))
+    assert index.add(job('https://example.com/1', 'python'))
+    index.flush()
+    assert index.add(job('https://example.com/1', 'python', 'positive'))
+    assert not index.add(job('https://example.com/1', 'python', 'positive'))
+    assert index.frequencies() == {'python': 1}
+    assert index.frequencies('positive') == {'python': 1}
+    assert len(index) == 1
+
+def test_word_clouds_render_from_the_index(tmp_path):
+    """Test that word clouds are drawn from indexed counts, not the jobs passed in."""
+    index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'))
+    index.add(job('https://example.com/1', 'Great team, great benefits', 'positive'))
+    visualizer = JobVisualizer(str(tmp_path), workers=1, term_index=index)
+
+    timings = visualizer.generate_all_visualizations([{'description': 'unindexed words'}])
+    assert 'word_cloud' in timings
+    assert visualizer.render_cache.manifest['plots']['word_cloud']['current']
+
+    saved = []
+    visualizer.plot_sentiment_wordcloud([], 'positive', save_path=saved)
+    assert saved[0].exists()
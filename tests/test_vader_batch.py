@@ -0,0 +1,60 @@
+import random
+import re
+from pathlib import Path
+import pytest
+from src.utils.sentiment_analyzer import get_vader
+from src.utils.vader_batch import PARITY_TOLERANCE, BatchVader
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'html'
+
+# Words that exercise every rule: negations, boosters and dampeners, "never so",
+# "at least", "kind of", "but", idioms, ALL CAPS and punctuation around words
+RULE_WORDS = [
+    'not', "isn't", "don't", 'never', 'Never', 'so', 'this', 'but', 'But', 'very', 'extremely', 'EXTREMELY',
+    'barely', 'sort', 'kind', 'of', 'just', 'enough', 'least', 'at', 'the', 'shit', 'bomb', 'bad', 'ass',
+    'yeah', 'right', 'hand', 'to', 'mouth', 'kiss', 'death', 'great', 'GREAT', 'great!', '!great', 'good,',
+    '"nice"', '(good)', 'sorta', 'kind-of', 'uh-uh', '!!', '?', 'a', 'I', 'team', 'hours', 'benefits',
+]
+
+def corpus(size: int = 1500):
+    sia = get_vader()
+    rng = random.Random(7)
+    words = list(sia.lexicon)[:2000] + RULE_WORDS * 40
+    texts = []
+    for _ in range(size):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+        texts.append(text + rng.choice(['', '', '!', '!!!!!', '??', '????', ' :)']))
+    for path in FIXTURES.glob('*.html'):
+        texts.append(re.sub(r'<[^>]+>', ' ', path.read_text(encoding='utf-8')))
+    return texts + ['', 'a', 'The food here is the shit', 'never so good', 'at least good', 'kind of good',
+                    'not the least bit good but bad', 'good good GOOD bad']
+
+def test_batch_vader_matches_nltk():
+    """Test that batched scores match nltk's polarity_scores within the documented tolerance."""
+    sia = get_vader()
+    batch = BatchVader(sia)
+    texts = corpus()
+
+    expected = [sia.polarity_scores(text) for text in texts]
+    actual = []
+    for start in range(0, len(texts), 256):
+        actual.extend(batch.polarity_scores_many(texts[start:start + 256]))
+
+    worst = max(abs(e[field] - a[field]) for e, a in zip(expected, actual) for field in e)
+    assert worst <= PARITY_TOLERANCE
+    assert [set(a) for a in actual] == [set(e) for e in expected]
+
+def test_batch_vader_vocabulary_is_reused_and_bounded():
+    """Test that tokens are remembered across batches and the vocabulary is rebuilt past its limit."""
+    batch = BatchVader(get_vader(), max_vocabulary=5)
+    batch.polarity_scores_many(['good team', 'great team'])
+    assert set(batch.vocabulary) == {'good', 'team', 'great'}
+
+    batch.polarity_scores_many(['one two three'])
+    batch.polarity_scores_many(['bad hours'])
+    assert set(batch.vocabulary) == {'bad', 'hours'}
+
+def test_batch_vader_rejects_non_text():
+    """Test that invalid input fails like nltk's analyzer does."""
+    with pytest.raises(AttributeError):
+        BatchVader(get_vader()).polarity_scores(None)
@@ -0,0 +1,62 @@
+import json
+import pytest
+from src.utils.term_index import TermFrequencyIndex
+from src.utils.visualization import JobVisualizer, job_frame, plot_fields, top_counts
+
+JOBS = [
+    {'company': 'Tech Corp', 'location': 'Remote', 'job_type': 'Full-time',
+     'description': 'Senior Python developer', 'salary': '$120,000'},
+    {'company': 'Tech Corp', 'location': 'New York', 'job_type': 'Contract',
+     'description': 'Python contractor', 'salary': ''},
+    {'company': 'Other Corp', 'location': 'Remote', 'job_type': 'Full-time', 'description': None},
+]
+
+def test_job_frame_is_typed():
+    """Test that the frame holds categorical columns for the counted fields."""
+    frame = job_frame(JOBS)
+    assert all(str(frame[column].dtype) == 'category' for column in ('company', 'location', 'job_type'))
+    assert list(frame['description']) == ['Senior Python developer', 'Python contractor', '']
+    assert top_counts(frame, 'company').to_dict() == {'Tech Corp': 2, 'Other Corp': 1}
+    assert top_counts(job_frame([]), 'company').empty
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_generate_all_visualizations_reports_timings(tmp_path, workers):
+    """Test that every plot with data is rendered and timed, serially or in parallel."""
+    timings = JobVisualizer(str(tmp_path), workers=workers).generate_all_visualizations(JOBS)
+
+    rendered = {'jobs_by_company', 'jobs_by_location', 'job_types', 'salary_ranges'}
+    assert rendered <= set(timings) and 'frame' in timings
+    assert {path.name.rsplit('_', 3)[0] for path in tmp_path.glob('*_????????.png')} >= rendered
+
+def test_unchanged_plots_reuse_cached_render(tmp_path):
+    """Test that a plot is only re-rendered when its aggregated data changes."""
+    visualizer = JobVisualizer(str(tmp_path), workers=1)
+    visualizer.generate_all_visualizations(JOBS)
+    first = json.loads((tmp_path / 'manifest.json').read_text())['plots']
+
+    # Salaries unchanged; one more Remote job at a new company
+    changed = JOBS + [{'company': 'Third Co', 'location': 'Remote', 'job_type': 'Part-time'}]
+    rerun = JobVisualizer(str(tmp_path), workers=1)
+    timings = rerun.generate_all_visualizations(JOBS)
+    assert timings['jobs_by_company'] == 0.0 and rerun.render_cache.stats()['hits'] == 5
+
+    rerun.generate_all_visualizations(changed)
+    plots = json.loads((tmp_path / 'manifest.json').read_text())['plots']
+    assert plots['salary_ranges']['current'] == first['salary_ranges']['current']
+    assert plots['salary_ranges']['hits'] == 2
+    assert plots['salary_ranges']['saved_seconds'] > 0
+    assert plots['jobs_by_location']['current'] != first['jobs_by_location']['current']
+    assert len(plots['jobs_by_location']['renders']) == 2
+    latest = tmp_path / 'jobs_by_location_latest.png'
+    assert latest.resolve() == (tmp_path / plots['jobs_by_location']['latest']).resolve()
+
+def test_plots_from_streamed_fields_and_term_index(tmp_path):
+    """Test that the plots render from the few fields kept while streaming, with descriptions in a term index."""
+    term_index = TermFrequencyIndex(str(tmp_path / 'terms.sqlite'))
+    term_index.update(dict(job, url=str(i)) for i, job in enumerate(JOBS))
+    rows = [plot_fields(job) for job in JOBS]
+    assert 'description' not in rows[0]
+
+    timings = JobVisualizer(str(tmp_path), workers=1, term_index=term_index).generate_all_visualizations(rows)
+    assert {'jobs_by_company', 'word_cloud', 'salary_ranges'} <= set(timings)
+    term_index.close()